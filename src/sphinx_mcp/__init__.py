@@ -1,5 +1,3 @@
-from dotenv import load_dotenv
-
 from sphinx_mcp.common import (
     setup,
     __version__,
@@ -9,5 +7,3 @@ __all__ = [
     "setup",
     "__version__",
 ]  # noqa: F401
-
-load_dotenv()
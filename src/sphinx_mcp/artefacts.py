@@ -0,0 +1,123 @@
+from __future__ import annotations
+import hashlib
+import json
+import zlib
+from dataclasses import dataclass
+from typing import Any
+
+# Fields of the stored MCP artefacts that hold nested JSON values, mapped to the
+# attributes of `MCPArtefact` in which they are kept pre-serialized.
+JSON_FIELDS = {
+    "inputSchema": "input_schema",
+    "outputSchema": "output_schema",
+    "arguments": "arguments",
+    "annotations": "annotations",
+    "_meta": "meta",
+    # The contents read from a resource, see `sphinx_mcp.contents`.
+    "contents": "contents",
+}
+
+# Serialized JSON values of at least this many bytes are zlib compressed. A compressed
+# value is told apart by its first byte, 'x' (0x78), with which no JSON text can start.
+COMPRESS_THRESHOLD = 256
+
+
+def _dump_json(value: Any) -> bytes | None:
+    """
+    Serialize a nested JSON value to compact, possibly compressed, bytes, keeping `None` as is.
+    """
+    if value is None:
+        return None
+    serialized = json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode(
+        "utf-8"
+    )
+    if len(serialized) >= COMPRESS_THRESHOLD:
+        return zlib.compress(serialized)
+    return serialized
+
+
+def artefact_digest(artefact: dict) -> str:
+    """
+    Compute a stable hash of the content of an MCP artefact stored as a JSON-serializable dictionary.
+    """
+    return hashlib.sha256(
+        json.dumps(artefact, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+
+def artefacts_digest(artefacts: list[MCPArtefact]) -> str:
+    """
+    Compute a stable hash of the content of a list of MCP artefacts of one kind.
+    """
+    digest = hashlib.sha256()
+    for artefact in artefacts:
+        digest.update(artefact.digest.encode("ascii"))
+    return digest.hexdigest()
+
+
+@dataclass(slots=True, frozen=True)
+class MCPArtefact:
+    """
+    A compact record of an MCP tool, prompt, resource or resource template.
+
+    Nested JSON values, such as schemas, are kept as compact JSON bytes and are only parsed when a directive needs them.
+    """
+
+    name: str
+    # The hash of the content of the artefact, see `artefact_digest`.
+    digest: str
+    title: str | None = None
+    description: str | None = None
+    # The URI of a resource or the URI template of a resource template.
+    uri: str | None = None
+    mime_type: str | None = None
+    input_schema: bytes | None = None
+    output_schema: bytes | None = None
+    arguments: bytes | None = None
+    annotations: bytes | None = None
+    meta: bytes | None = None
+    contents: bytes | None = None
+
+    @classmethod
+    def from_stored(cls, artefact: dict) -> MCPArtefact:
+        """
+        Create a record from an MCP artefact stored as a JSON-serializable dictionary.
+        """
+        return cls(
+            name=artefact["name"],
+            digest=artefact_digest(artefact),
+            title=artefact.get("title"),
+            description=artefact.get("description"),
+            uri=artefact.get("uri", artefact.get("uriTemplate")),
+            mime_type=artefact.get("mimeType"),
+            **{
+                attribute: _dump_json(artefact.get(field))
+                for field, attribute in JSON_FIELDS.items()
+            },
+        )
+
+    def json_bytes(self, attribute: str) -> bytes | None:
+        """
+        Get the serialized JSON value kept in the given attribute, decompressing it if needed.
+        """
+        value = getattr(self, attribute)
+        if value is not None and value[:1] == b"x":
+            return zlib.decompress(value)
+        return value
+
+    def json_size(self) -> int:
+        """
+        Get the number of bytes taken by the serialized, possibly compressed, JSON values kept in the record.
+        """
+        return sum(
+            len(value)
+            for attribute in JSON_FIELDS.values()
+            if (value := getattr(self, attribute)) is not None
+        )
+
+    def load(self, attribute: str) -> Any:
+        """
+        Parse the nested JSON value kept in the given attribute.
+        """
+        value = self.json_bytes(attribute)
+        return None if value is None else json.loads(value)
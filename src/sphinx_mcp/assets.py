@@ -0,0 +1,161 @@
+from __future__ import annotations
+import hashlib
+import html
+import json
+import os
+import shutil
+from pathlib import Path
+
+from docutils import nodes
+from sphinx.application import Sphinx
+from sphinx.config import Config
+from sphinx.transforms.post_transforms import SphinxPostTransform
+from sphinx.util.logging import getLogger
+
+from sphinx_mcp.cache import CACHE_DIRNAME
+from sphinx_mcp.contents import CONTENTS_DIRNAME
+from sphinx_mcp.utils import format_size
+
+logger = getLogger(__name__)
+
+# The class of the literal blocks showing pretty-printed JSON values of MCP artefacts.
+JSON_BLOCK_CLASS = "mcpdocs-json"
+
+# The class of the placeholders of JSON values written to separate files, see `static/mcpdocs.js`.
+EXTERNAL_JSON_CLASS = "mcpdocs-external-json"
+
+# The class of the references to resource contents written to files, see `ResourceContentTransform`.
+RESOURCE_CONTENT_CLASS = "mcpdocs-resource-content"
+
+# The builders whose output links to separate files: large JSON values, loaded when expanded, and
+# resource contents.
+HTML_BUILDERS = ("html", "dirhtml", "singlehtml")
+
+# The directory, relative to the output directory, holding the external JSON files.
+EXTERNAL_JSON_DIRNAME = "_static/mcpdocs"
+
+# The directory, relative to the output directory, holding the resource contents written to files.
+RESOURCE_CONTENTS_DIRNAME = "_static/mcpdocs/contents"
+
+STATIC_DIR = Path(__file__).parent / "static"
+
+
+def write_external_json(outdir: Path, text: str) -> str:
+    """
+    Write a pretty-printed JSON value, compacted, to a file named after its content, unless it already exists.
+
+    Returns the path of the file relative to the output directory.
+    """
+    compact = json.dumps(
+        json.loads(text), separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+    relative_path = (
+        f"{EXTERNAL_JSON_DIRNAME}/{hashlib.sha256(compact).hexdigest()[:16]}.json"
+    )
+    path = outdir / relative_path
+    if not path.is_file():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        temp_path.write_bytes(compact)
+        os.replace(temp_path, path)
+    return relative_path
+
+
+class ExternalJSONTransform(SphinxPostTransform):
+    """
+    Replace the JSON literal blocks larger than `mcp_html_external_json_threshold` bytes with placeholders
+    that load the JSON value from a separate file when expanded, in HTML output only.
+    """
+
+    default_priority = 400
+    builders = HTML_BUILDERS
+
+    def run(self, **kwargs) -> None:
+        threshold = self.config.mcp_html_external_json_threshold
+        if threshold <= 0:
+            return
+        outdir = Path(self.app.outdir)
+        for block in list(self.document.findall(nodes.literal_block)):
+            if JSON_BLOCK_CLASS not in block["classes"]:
+                continue
+            text = block.astext()
+            size = len(text.encode("utf-8"))
+            if size <= threshold:
+                continue
+            source = page_relative_path(
+                self.app.builder, self.env.docname, write_external_json(outdir, text)
+            )
+            block.replace_self(
+                nodes.raw(
+                    "",
+                    f'<details class="{EXTERNAL_JSON_CLASS}" data-src="{html.escape(source)}">'
+                    f"<summary>Show JSON ({format_size(size)})</summary>"
+                    '<div class="highlight"><pre>Loading…</pre></div></details>',
+                    format="html",
+                )
+            )
+
+
+def page_relative_path(builder, docname: str, path: str) -> str:
+    """
+    Get the path of a file of the output directory relative to the page of a document.
+    """
+    page_dir = Path(builder.get_outfilename(docname)).parent
+    return Path(os.path.relpath(Path(builder.outdir) / path, page_dir)).as_posix()
+
+
+class ResourceContentTransform(SphinxPostTransform):
+    """
+    Link to the resource contents written to files, copying them to the output directory, in HTML output,
+    and only name them in other output.
+    """
+
+    default_priority = 400
+
+    def run(self, **kwargs) -> None:
+        store_dir = Path(self.app.doctreedir) / CACHE_DIRNAME / CONTENTS_DIRNAME
+        for reference in list(self.document.findall(nodes.reference)):
+            if RESOURCE_CONTENT_CLASS not in reference["classes"]:
+                continue
+            filename = reference["mcpdocs_file"]
+            source = store_dir / filename
+            if self.app.builder.name not in HTML_BUILDERS or not source.is_file():
+                if self.app.builder.name in HTML_BUILDERS:
+                    logger.warning(
+                        f"The resource content file {source} is missing, set SPHINX_MCP_REFRESH=1 to read it again.",
+                        location=reference,
+                    )
+                reference.replace_self(nodes.inline("", "", *reference.children))
+                continue
+            relative_path = f"{RESOURCE_CONTENTS_DIRNAME}/{filename}"
+            target = Path(self.app.outdir) / relative_path
+            if not target.is_file():
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(source, target)
+            reference["refuri"] = page_relative_path(
+                self.app.builder, self.env.docname, relative_path
+            )
+
+
+def add_static_dir(app: Sphinx, config: Config) -> None:
+    """
+    Handler for the 'config-inited' event to copy the static files of the extension to the output of HTML builds,
+    if they are used.
+
+    This is done before the configuration is compared to that of the previous build, so that the added path is
+    not taken as a change to the configuration.
+    """
+    if config.mcp_html_external_json_threshold > 0 or config.mcp_search_index:
+        if str(STATIC_DIR) not in config.html_static_path:
+            config.html_static_path.append(str(STATIC_DIR))
+
+
+def add_external_json_assets(app: Sphinx) -> None:
+    """
+    Add the script loading external JSON files to HTML builds, if large JSON values are written to them.
+    """
+    if (
+        app.builder.name in HTML_BUILDERS
+        and app.config.mcp_html_external_json_threshold > 0
+    ):
+        app.add_js_file("mcpdocs.js", defer="defer")
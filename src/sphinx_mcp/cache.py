@@ -0,0 +1,132 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+from sphinx.util.logging import getLogger
+
+logger = getLogger(__name__)
+
+# The directory, relative to the Sphinx doctree directory, holding cached metadata.
+CACHE_DIRNAME = "mcp_cache"
+
+# Bump this whenever the layout of the cached files changes.
+CACHE_FORMAT_VERSION = 1
+
+# Setting this environment variable to a non-empty value forces a refresh of the cache.
+REFRESH_ENV_VAR = "SPHINX_MCP_REFRESH"
+
+# The models of `mcp.types` against which the stored artefacts of each kind are validated.
+# They are looked up by name, as importing `mcp.types` is slow.
+ARTEFACT_MODELS = {
+    "tools": "Tool",
+    "prompts": "Prompt",
+    "resources": "Resource",
+    "resource_templates": "ResourceTemplate",
+}
+
+
+def server_config_digest(server_config: dict) -> str:
+    """
+    Compute a stable hash of the configuration entry of an MCP server.
+    """
+    return hashlib.sha256(
+        json.dumps(server_config, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def dump_artefact(artefact) -> dict:
+    """
+    Convert an MCP artefact to the JSON-serializable dictionary in which it is stored.
+    """
+    return artefact.model_dump(mode="json", by_alias=True, exclude_none=True)
+
+
+def validate_artefacts(data: dict) -> dict:
+    """
+    Validate stored MCP artefacts of a server against the MCP schema.
+
+    Raises a `ValueError` if any artefact is invalid.
+    """
+    import mcp.types
+
+    for kind, model_name in ARTEFACT_MODELS.items():
+        model = getattr(mcp.types, model_name)
+        for artefact in data.get(kind, []):
+            model.model_validate(artefact)
+    return {kind: data.get(kind, []) for kind in ARTEFACT_MODELS}
+
+
+def check_artefacts(data: dict) -> dict:
+    """
+    Check the structure of stored MCP artefacts of a server without validating them against the MCP schema.
+
+    This is enough for metadata that was validated when it was written, and avoids importing `mcp.types`.
+    Raises a `ValueError` if any artefact is not a dictionary with a name.
+    """
+    for kind in ARTEFACT_MODELS:
+        artefacts = data.get(kind, [])
+        if not isinstance(artefacts, list):
+            raise ValueError(f"{kind} must be a list, not {type(artefacts).__name__}.")
+        for artefact in artefacts:
+            if not isinstance(artefact, dict) or not isinstance(
+                artefact.get("name"), str
+            ):
+                raise ValueError(f"Every item of {kind} must be an object with a name.")
+    return {kind: data.get(kind, []) for kind in ARTEFACT_MODELS}
+
+
+def refresh_requested(app_config_refresh: bool) -> bool:
+    """
+    Check whether a refresh of the cache is forced by the configuration or the environment.
+    """
+    return app_config_refresh or bool(os.environ.get(REFRESH_ENV_VAR, "").strip())
+
+
+def load_cached_metadata(
+    cache_dir: Path, server_config: dict, ttl: float
+) -> dict | None:
+    """
+    Load the cached metadata of an MCP server if it exists and is younger than `ttl` seconds.
+
+    Returns `None` if there is no usable cache entry.
+    """
+    cache_file = cache_dir / f"{server_config_digest(server_config)}.json"
+    if ttl <= 0 or not cache_file.is_file():
+        return None
+    try:
+        with cache_file.open("r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("version") != CACHE_FORMAT_VERSION:
+            return None
+        if time.time() - cached["fetched_at"] > ttl:
+            return None
+        return check_artefacts(cached["artefacts"])
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Ignoring unreadable MCP metadata cache {cache_file}: {e}")
+        return None
+
+
+def save_cached_metadata(
+    cache_dir: Path, server_name: str, server_config: dict, artefacts: dict
+) -> None:
+    """
+    Save the metadata of an MCP server to the cache.
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    cache_file = cache_dir / f"{server_config_digest(server_config)}.json"
+    temp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+    with temp_file.open("w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "version": CACHE_FORMAT_VERSION,
+                "server": server_name,
+                "fetched_at": time.time(),
+                "artefacts": artefacts,
+            },
+            f,
+            separators=(",", ":"),
+        )
+    os.replace(temp_file, cache_file)
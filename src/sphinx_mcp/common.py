@@ -1,17 +1,48 @@
 from __future__ import annotations
 import asyncio
+import math
+import time
 
 from importlib import metadata
+from pathlib import Path
 
 # This is necessary to write RST files with docutils
 # from docutils.core import publish_programmatically
 
 from sphinx.application import Sphinx
+from sphinx.config import ENUM, Config
+from sphinx.environment import BuildEnvironment
 from sphinx.util.typing import ExtensionMetadata
 from sphinx.util.logging import getLogger
 
-from fastmcp import Client
-
+from sphinx_mcp.artefacts import MCPArtefact
+from sphinx_mcp.assets import (
+    HTML_BUILDERS,
+    ExternalJSONTransform,
+    ResourceContentTransform,
+    add_external_json_assets,
+    add_static_dir,
+)
+from sphinx_mcp.cache import (
+    CACHE_DIRNAME,
+    load_cached_metadata,
+    refresh_requested,
+    save_cached_metadata,
+)
+from sphinx_mcp.contents import CONTENTS_DIRNAME, ContentOptions, prune_content_store
+from sphinx_mcp.daemon import fetch_all_metadata_from_daemon
+from sphinx_mcp.fetch import ARTEFACT_KINDS, KEY_MCP_SERVERS, fetch_all_metadata
+from sphinx_mcp.pages import generate_pages
+from sphinx_mcp.render import clear_render_cache
+from sphinx_mcp.sessions import run_with_process_sessions
+from sphinx_mcp.report import build_report, log_report_summary, write_report
+from sphinx_mcp.search import (
+    SearchWidgetTransform,
+    add_search_script,
+    write_search_index,
+)
+from sphinx_mcp.snapshot import read_snapshot
+from sphinx_mcp.state import MCPState
 from sphinx_mcp.mcpdocs import MCPDocsDomain
 
 try:
@@ -24,75 +55,375 @@ __version__ = metadata.version("sphinx-mcp")
 logger = getLogger(__name__)
 
 
+def config_inited_handler(app: Sphinx, config: Config) -> None:
+    """
+    Handler for the 'config-inited' event to load environment variables from a dotenv file, if configured.
+    """
+    if not config.mcp_load_dotenv:
+        return
+    from dotenv import find_dotenv, load_dotenv
+
+    if config.mcp_load_dotenv is True:
+        dotenv_path = find_dotenv(usecwd=True)
+        if not dotenv_path:
+            logger.warning("No dotenv file found to load environment variables from.")
+            return
+    else:
+        dotenv_path = Path(app.confdir) / config.mcp_load_dotenv
+        if not dotenv_path.is_file():
+            raise RuntimeError(f"The dotenv file {dotenv_path} does not exist.")
+    logger.info(f"Loading environment variables from {dotenv_path}.")
+    load_dotenv(dotenv_path)
+
+
 def builder_inited_handler(app: Sphinx) -> None:
     """
     Handler for the 'builder-inited' event to initialize MCP client and fetch metadata.
     """
-    # Set defaults for MCP metadata
-    app.env.mcp_tools = {}
-    app.env.mcp_prompts = {}
-    app.env.mcp_resources = {}
-    app.env.mcp_resource_templates = {}
-
-    async def fetch_mcp_metadata():
-        """
-        Asynchronous function to fetch MCP metadata using the configured client.
-        """
-        key_mcp_servers = "mcpServers"
-        if isinstance(app.config.mcp_config, dict):
-            if key_mcp_servers not in app.config.mcp_config:
-                raise RuntimeError("No 'mcpServers' key found in MCP configuration.")
-        for server_name, server_config in app.config.mcp_config.get(
-            key_mcp_servers
-        ).items():
-            logger.info(
-                f"Connecting to MCP server {server_name} with config: {server_config}."
+    clear_render_cache()
+    # The state is kept across builds, except for the artefacts which are loaded again below.
+    if not hasattr(app.env, "mcp"):
+        app.env.mcp = MCPState()
+    app.env.mcp.clear_artefacts()
+    start = time.perf_counter()
+
+    if app.config.mcp_snapshot:
+        server_metadata = load_snapshot_metadata(app)
+    elif (
+        hasattr(app.config, "mcp_config")
+        and isinstance(app.config.mcp_config, dict)
+        and KEY_MCP_SERVERS in app.config.mcp_config
+    ):
+        server_metadata = load_server_metadata(
+            app, app.config.mcp_config[KEY_MCP_SERVERS]
+        )
+    else:
+        raise RuntimeError("No valid MCP configuration found.")
+    prune_content_store(
+        Path(app.doctreedir) / CACHE_DIRNAME / CONTENTS_DIRNAME, server_metadata
+    )
+
+    # The environment keeps compact records rather than the stored dictionaries.
+    server_stats = app.env.mcp.load_stats.setdefault("servers", {})
+    for server_name, artefacts in server_metadata.items():
+        kind_stats = server_stats[server_name].setdefault("kinds", {})
+        for kind in ARTEFACT_KINDS:
+            records = [
+                MCPArtefact.from_stored(artefact) for artefact in artefacts[kind]
+            ]
+            app.env.mcp.set_artefacts(
+                kind, server_name, records, index_artefacts(server_name, kind, records)
             )
-            client = Client(transport={key_mcp_servers: {server_name: server_config}})
-            async with client:
-                logger.info("Fetching tools.")
-                app.env.mcp_tools[server_name] = await client.list_tools()
-                logger.info(
-                    f"Retrieved {len(app.env.mcp_tools[server_name])} tool{'s' if len(app.env.mcp_tools[server_name]) > 1 else ''}."
-                )
-                logger.info("Fetching prompts.")
-                app.env.mcp_prompts[server_name] = await client.list_prompts()
-                logger.info(
-                    f"Retrieved {len(app.env.mcp_prompts[server_name])} prompt{'s' if len(app.env.mcp_prompts[server_name]) > 1 else ''}."
-                )
-                logger.info("Fetching resources.")
-                app.env.mcp_resources[server_name] = await client.list_resources()
-                logger.info(
-                    f"Retrieved {len(app.env.mcp_resources[server_name])} resource{'s' if len(app.env.mcp_resources[server_name]) > 1 else ''}."
-                )
-                logger.info("Fetching resource templates.")
-                app.env.mcp_resource_templates[
-                    server_name
-                ] = await client.list_resource_templates()
-                logger.info(
-                    f"Retrieved {len(app.env.mcp_resource_templates[server_name])} resource template{'s' if len(app.env.mcp_resource_templates[server_name]) > 1 else ''}."
+            kind_stats.setdefault(kind, {}).update(
+                items=len(records),
+                bytes=sum(record.json_size() for record in records),
+            )
+    app.env.mcp.update_hashes()
+    app.env.mcp.load_stats.update(
+        seconds=time.perf_counter() - start,
+        servers={
+            server_name: server_stats[server_name] for server_name in server_metadata
+        },
+    )
+
+
+def check_server_names(app: Sphinx, server_names) -> None:
+    """
+    Check that the number of MCP servers to document is allowed by the configuration, and that their names
+    can be told apart from the names of their artefacts in `server::name`.
+    """
+    for server_name in server_names:
+        if "::" in server_name:
+            raise RuntimeError(
+                f"The name of MCP server '{server_name}' must not contain '::'."
+            )
+    if len(server_names) == 0:
+        raise RuntimeError("No MCP servers configured.")
+    elif len(server_names) > 1 and app.config.allow_only_one_mcp_server:
+        raise RuntimeError(
+            "Multiple MCP servers configured but 'allow_only_one_mcp_server' is set to True."
+        )
+
+
+def load_server_metadata(app: Sphinx, servers: dict) -> dict:
+    """
+    Load the metadata of the configured MCP servers from the cache, fetching it from the servers
+    whose cached metadata is missing or stale.
+    """
+    check_server_names(app, servers.keys())
+    if app.config.mcp_max_concurrent_servers < 1:
+        raise RuntimeError(
+            "The 'mcp_max_concurrent_servers' configuration must be at least 1."
+        )
+    if app.config.mcp_fetch_retries < 0:
+        raise RuntimeError(
+            "The 'mcp_fetch_retries' configuration must not be negative."
+        )
+    if app.config.mcp_session_idle_timeout <= 0:
+        raise RuntimeError(
+            "The 'mcp_session_idle_timeout' configuration must be positive."
+        )
+    logger.info(
+        f"Initialising MCP client for server{'s' if len(servers) > 1 else ''}: {', '.join(servers.keys())}"
+    )
+    cache_dir = Path(app.doctreedir) / CACHE_DIRNAME
+    # Open sessions tell whether the metadata changed, so the cache is only used to fall back on.
+    refresh = (
+        refresh_requested(app.config.mcp_cache_refresh)
+        or app.config.mcp_server_sessions != "build"
+    )
+    server_stats = app.env.mcp.load_stats.setdefault("servers", {})
+    server_metadata = {}
+    for server_name, server_config in servers.items():
+        cached = (
+            None
+            if refresh
+            else load_cached_metadata(
+                cache_dir, cache_key(app, server_config), app.config.mcp_cache_ttl
+            )
+        )
+        if cached is not None:
+            logger.info(f"Using cached metadata for MCP server {server_name}.")
+            server_metadata[server_name] = cached
+            server_stats[server_name] = {"source": "cache"}
+    servers_to_fetch = {
+        server_name: server_config
+        for server_name, server_config in servers.items()
+        if server_name not in server_metadata
+    }
+    if servers_to_fetch:
+        fallback = app.config.mcp_on_server_error == "fallback"
+        errors = {} if fallback else None
+        fetch_stats = {}
+        fetched = fetch_metadata(app, servers_to_fetch, errors, fetch_stats)
+        for server_name, stats in fetch_stats.items():
+            if server_name in fetched:
+                server_stats[server_name] = {"source": "fetched", **stats}
+            else:
+                server_stats[server_name] = {
+                    "attempts": stats.get("attempts", 0),
+                    "seconds": stats.get("seconds", 0.0),
+                }
+        for server_name, artefacts in fetched.items():
+            save_cached_metadata(
+                cache_dir, server_name, cache_key(app, servers[server_name]), artefacts
+            )
+        server_metadata.update(fetched)
+        if errors:
+            server_metadata.update(load_fallback_metadata(app, servers, errors))
+    return {server_name: server_metadata[server_name] for server_name in servers}
+
+
+def content_options(app: Sphinx) -> ContentOptions | None:
+    """
+    Get the options to read the contents of resources with, or `None` if no contents are to be read.
+    """
+    if not app.config.mcp_resource_contents:
+        return None
+    if app.config.mcp_max_concurrent_reads < 1:
+        raise RuntimeError(
+            "The 'mcp_max_concurrent_reads' configuration must be at least 1."
+        )
+    return ContentOptions(
+        patterns=tuple(app.config.mcp_resource_contents),
+        store_dir=str(Path(app.doctreedir) / CACHE_DIRNAME / CONTENTS_DIRNAME),
+        max_concurrent_reads=app.config.mcp_max_concurrent_reads,
+        max_bytes=app.config.mcp_resource_content_max_bytes,
+        max_inline_bytes=app.config.mcp_resource_content_inline_bytes,
+    )
+
+
+def cache_key(app: Sphinx, server_config: dict) -> dict:
+    """
+    Get the key under which the metadata of an MCP server is cached, which depends on the cap on the number
+    of artefacts fetched and on the resource contents read.
+    """
+    key = {"server": server_config}
+    if app.config.mcp_max_items_per_server:
+        key["max_items"] = app.config.mcp_max_items_per_server
+    contents = content_options(app)
+    if contents is not None:
+        key["contents"] = [
+            contents.patterns,
+            contents.max_bytes,
+            contents.max_inline_bytes,
+        ]
+    # Metadata fetched without any of these options is cached under the configuration of the server alone.
+    return key if len(key) > 1 else server_config
+
+
+def fetch_metadata(
+    app: Sphinx, servers: dict, errors: dict | None, stats: dict
+) -> dict:
+    """
+    Fetch the metadata of the given MCP servers, over sessions kept open across builds if so configured.
+
+    See `sphinx_mcp.fetch.fetch_all_metadata` for the errors and statistics.
+    """
+    options = dict(
+        max_concurrent_servers=app.config.mcp_max_concurrent_servers,
+        max_items=app.config.mcp_max_items_per_server,
+        connect_timeout=app.config.mcp_connect_timeout or None,
+        request_timeout=app.config.mcp_request_timeout or None,
+        server_timeout=app.config.mcp_server_timeout or None,
+        retries=app.config.mcp_fetch_retries,
+        retry_backoff=app.config.mcp_retry_backoff,
+        errors=errors,
+        stats=stats,
+        contents=content_options(app),
+    )
+    if app.config.mcp_server_sessions == "daemon":
+        return fetch_all_metadata_from_daemon(
+            Path(app.confdir),
+            app.config.mcp_session_idle_timeout,
+            servers,
+            **options,
+        )
+    if app.config.mcp_server_sessions == "process":
+        return run_with_process_sessions(
+            lambda pool: fetch_all_metadata(servers, sessions=pool, **options),
+            app.config.mcp_session_idle_timeout,
+        )
+    return asyncio.run(fetch_all_metadata(servers, **options))
+
+
+def load_fallback_metadata(app: Sphinx, servers: dict, errors: dict) -> dict:
+    """
+    Load the last known metadata of the MCP servers that could not be fetched, ignoring the age of the cache.
+
+    The metadata is taken from the cache if possible, and otherwise from the `mcp_fallback_snapshot`
+    snapshot, if configured. Raises a `RuntimeError` if there is nothing to fall back on for a server.
+    """
+    cache_dir = Path(app.doctreedir) / CACHE_DIRNAME
+    server_stats = app.env.mcp.load_stats["servers"]
+    snapshot_metadata = None
+    fallback_metadata = {}
+    for server_name, error in errors.items():
+        cached = load_cached_metadata(
+            cache_dir, cache_key(app, servers[server_name]), math.inf
+        )
+        if cached is not None:
+            logger.warning(f"{error}. Using the last cached metadata instead.")
+            fallback_metadata[server_name] = cached
+            server_stats[server_name]["source"] = "cache fallback"
+            continue
+        if app.config.mcp_fallback_snapshot:
+            snapshot_path = Path(app.confdir) / app.config.mcp_fallback_snapshot
+            if snapshot_metadata is None:
+                snapshot_metadata = read_snapshot(snapshot_path, validate=False)
+            if server_name in snapshot_metadata:
+                logger.warning(
+                    f"{error}. Using the metadata from snapshot {snapshot_path} instead."
                 )
+                fallback_metadata[server_name] = snapshot_metadata[server_name]
+                server_stats[server_name]["source"] = "snapshot fallback"
+                continue
+        raise RuntimeError(
+            f"{error}. No cached or snapshot metadata to fall back on."
+        ) from error
+    return fallback_metadata
 
-        await client.close()
 
+def load_snapshot_metadata(app: Sphinx) -> dict:
+    """
+    Load the metadata of MCP servers from the configured snapshot file instead of connecting to the servers.
+
+    If `mcp_config` is also set, only the servers configured in it are documented.
+    """
+    snapshot_path = Path(app.confdir) / app.config.mcp_snapshot
+    logger.info(f"Loading MCP server metadata from snapshot {snapshot_path}.")
+    # Snapshots are validated when they are written, see `sphinx-mcp snapshot`.
+    server_metadata = read_snapshot(snapshot_path, validate=False)
     if (
-        hasattr(app.config, "mcp_config")
-        and isinstance(app.config.mcp_config, dict)
-        and "mcpServers" in app.config.mcp_config
+        isinstance(app.config.mcp_config, dict)
+        and KEY_MCP_SERVERS in app.config.mcp_config
     ):
-        server_config_keys = app.config.mcp_config["mcpServers"].keys()
-        if len(server_config_keys) == 0:
-            raise RuntimeError("No MCP servers configured.")
-        elif len(server_config_keys) > 1 and app.config.allow_only_one_mcp_server:
+        servers = app.config.mcp_config[KEY_MCP_SERVERS]
+        missing_servers = [
+            server_name for server_name in servers if server_name not in server_metadata
+        ]
+        if missing_servers:
             raise RuntimeError(
-                "Multiple MCP servers configured but 'allow_only_one_mcp_server' is set to True."
+                f"MCP server{'s' if len(missing_servers) > 1 else ''} {', '.join(missing_servers)} not found in snapshot {snapshot_path}."
             )
+        server_metadata = {
+            server_name: server_metadata[server_name] for server_name in servers
+        }
+    check_server_names(app, server_metadata.keys())
+    app.env.mcp.load_stats["servers"] = {
+        server_name: {"source": "snapshot"} for server_name in server_metadata
+    }
+    return server_metadata
+
+
+def index_artefacts(server_name: str, kind: str, artefacts: list) -> dict:
+    """
+    Index the MCP artefacts of one kind of a server by their names.
+    """
+    index = {}
+    for artefact in artefacts:
+        if artefact.name in index:
+            logger.warning(
+                f"MCP server {server_name} has more than one {kind.removesuffix('s').replace('_', ' ')} named '{artefact.name}', only the first can be documented on its own."
+            )
+            continue
+        index[artefact.name] = artefact
+    return index
+
+
+def env_get_outdated_handler(
+    app: Sphinx,
+    env: BuildEnvironment,
+    added: set[str],
+    changed: set[str],
+    removed: set[str],
+) -> list[str]:
+    """
+    Handler for the 'env-get-outdated' event to re-read the documents listing MCP artefacts that changed.
+    """
+    outdated = [
+        docname
+        for docname in env.mcp.outdated_docs()
+        if docname not in added and docname not in changed and docname not in removed
+    ]
+    if outdated:
         logger.info(
-            f"Initialising MCP client for server{'s' if len(server_config_keys) > 1 else ''}: {', '.join(server_config_keys)}"
+            f"{len(outdated)} document{'s' if len(outdated) > 1 else ''} outdated by changes in MCP server metadata."
         )
-        asyncio.run(fetch_mcp_metadata())
-    else:
-        raise RuntimeError("No valid MCP configuration found.")
+    return outdated
+
+
+def env_purge_doc_handler(app: Sphinx, env: BuildEnvironment, docname: str) -> None:
+    """
+    Handler for the 'env-purge-doc' event to forget the MCP artefacts listed by a document.
+    """
+    env.mcp.purge_doc(docname)
+
+
+def env_merge_info_handler(
+    app: Sphinx, env: BuildEnvironment, docnames: set[str], other: BuildEnvironment
+) -> None:
+    """
+    Handler for the 'env-merge-info' event to merge the MCP artefact usage recorded by parallel readers.
+    """
+    env.mcp.merge_usage(docnames, other.mcp)
+
+
+def build_finished_handler(app: Sphinx, exception: Exception | None) -> None:
+    """
+    Handler for the 'build-finished' event to write the search index of the MCP artefacts in HTML output, and
+    summarise the time spent loading and documenting them.
+    """
+    if exception is not None or not hasattr(app.env, "mcp"):
+        return
+    if app.builder.name in HTML_BUILDERS and app.config.mcp_search_index:
+        write_search_index(app)
+    report = build_report(app.env.mcp)
+    log_report_summary(report)
+    if app.config.mcp_report:
+        report_path = Path(app.outdir) / app.config.mcp_report
+        write_report(report_path, report)
+        logger.info(f"Wrote the MCP build report to {report_path}.")
 
 
 def setup(app: Sphinx) -> ExtensionMetadata:
@@ -100,10 +431,11 @@ def setup(app: Sphinx) -> ExtensionMetadata:
     Setup function for the Sphinx extension.
     """
     # Expect the mcp_config to be a dictionary with the necessary configuration to access MCP servers.
+    # Changes in the fetched metadata are tracked per document, see env_get_outdated_handler.
     app.add_config_value(
         name="mcp_config",
         default=None,
-        rebuild="html",
+        rebuild="",
         types=[dict],
         description="Configurations for MCP servers. Should be a dictionary with 'mcpServers' key.",
     )
@@ -111,19 +443,226 @@ def setup(app: Sphinx) -> ExtensionMetadata:
     app.add_config_value(
         name="allow_only_one_mcp_server",
         default=False,
-        rebuild="html",
+        rebuild="",
         types=[dict],
         description="Allow the configuration of only one MCP server in the dictionary with 'mcpServers' key.",
     )
 
+    app.add_config_value(
+        name="mcp_max_concurrent_servers",
+        default=8,
+        rebuild="",
+        types=[int],
+        description="Maximum number of MCP servers to connect to concurrently when fetching metadata.",
+    )
+
+    app.add_config_value(
+        name="mcp_max_items_per_server",
+        default=0,
+        rebuild="",
+        types=[int],
+        description="Maximum number of artefacts of each kind to fetch from an MCP server. Set to 0 for no limit.",
+    )
+
+    app.add_config_value(
+        name="mcp_connect_timeout",
+        default=30,
+        rebuild="",
+        types=[int, float],
+        description="Time, in seconds, allowed to connect to an MCP server and initialise the session. Set to 0 for no limit.",
+    )
+
+    app.add_config_value(
+        name="mcp_request_timeout",
+        default=60,
+        rebuild="",
+        types=[int, float],
+        description="Time, in seconds, allowed for each request to an MCP server. Set to 0 for no limit.",
+    )
+
+    app.add_config_value(
+        name="mcp_server_timeout",
+        default=300,
+        rebuild="",
+        types=[int, float],
+        description="Time, in seconds, allowed for each attempt to fetch all the metadata of an MCP server. Set to 0 for no limit.",
+    )
+
+    app.add_config_value(
+        name="mcp_fetch_retries",
+        default=2,
+        rebuild="",
+        types=[int],
+        description="Number of times to try fetching the metadata of an MCP server again after a failure.",
+    )
+
+    app.add_config_value(
+        name="mcp_retry_backoff",
+        default=1.0,
+        rebuild="",
+        types=[int, float],
+        description="Delay, in seconds, before the first retry. It doubles with every further retry.",
+    )
+
+    app.add_config_value(
+        name="mcp_on_server_error",
+        default="fail",
+        rebuild="",
+        types=ENUM("fail", "fallback"),
+        description="What to do if the metadata of an MCP server cannot be fetched: fail the build, or fall back on the last cached or snapshot metadata with a warning.",
+    )
+
+    app.add_config_value(
+        name="mcp_fallback_snapshot",
+        default=None,
+        rebuild="",
+        types=[str],
+        description="Path, relative to the configuration directory, of an MCP metadata snapshot to fall back on if a server cannot be fetched and has no cached metadata.",
+    )
+
+    app.add_config_value(
+        name="mcp_resource_contents",
+        default=[],
+        rebuild="",
+        types=[list, tuple],
+        description="Patterns, matched against 'server::name' and the URI of each MCP resource, of the resources whose contents are read and documented.",
+    )
+
+    app.add_config_value(
+        name="mcp_max_concurrent_reads",
+        default=4,
+        rebuild="",
+        types=[int],
+        description="Maximum number of resources to read the contents of concurrently from each MCP server.",
+    )
+
+    app.add_config_value(
+        name="mcp_resource_content_max_bytes",
+        default=1024 * 1024,
+        rebuild="",
+        types=[int],
+        description="Size, in bytes, above which the content of a resource is left out.",
+    )
+
+    app.add_config_value(
+        name="mcp_resource_content_inline_bytes",
+        default=4096,
+        rebuild="",
+        types=[int],
+        description="Size, in bytes, up to which a text resource content is shown in the page. Larger and binary contents are linked to as files.",
+    )
+
+    app.add_config_value(
+        name="mcp_server_sessions",
+        default="build",
+        rebuild="",
+        types=ENUM("build", "process", "daemon"),
+        description="How long to keep the sessions with the MCP servers open: for the build only, across the builds of the same Python process, or across builds in a daemon started by the first build.",
+    )
+
+    app.add_config_value(
+        name="mcp_session_idle_timeout",
+        default=600,
+        rebuild="",
+        types=[int, float],
+        description="Time, in seconds, after which an unused session with an MCP server is closed, and the session daemon stops if no build used it.",
+    )
+
+    app.add_config_value(
+        name="mcp_cache_ttl",
+        default=3600,
+        rebuild="",
+        types=[int, float],
+        description="Time, in seconds, for which cached MCP server metadata is reused. Set to 0 to disable the cache.",
+    )
+
+    app.add_config_value(
+        name="mcp_cache_refresh",
+        default=False,
+        rebuild="",
+        types=[bool],
+        description="Ignore any cached MCP server metadata and fetch it again from the servers.",
+    )
+
+    app.add_config_value(
+        name="mcp_snapshot",
+        default=None,
+        rebuild="",
+        types=[str],
+        description="Path, relative to the configuration directory, of an MCP metadata snapshot to load instead of connecting to the MCP servers.",
+    )
+
+    app.add_config_value(
+        name="mcp_load_dotenv",
+        default=False,
+        rebuild="",
+        types=[bool, str],
+        description="Load environment variables from a dotenv file before connecting to the MCP servers. Set to True to look for a '.env' file from the current directory upwards, or to a path relative to the configuration directory.",
+    )
+
+    app.add_config_value(
+        name="mcp_deduplicate_schemas",
+        default=False,
+        rebuild="env",
+        types=[bool],
+        description="Render each distinct input or output schema of the MCP tools, and each distinct definition in their '$defs', once per document in an appendix, and link to it from each tool.",
+    )
+
+    app.add_config_value(
+        name="mcp_html_external_json_threshold",
+        default=0,
+        rebuild="html",
+        types=[int],
+        description="Size, in bytes, above which the JSON values of MCP artefacts are written to separate files in HTML output, and only loaded when expanded. Set to 0 to always show them inline.",
+    )
+
+    app.add_config_value(
+        name="mcp_generate_pages",
+        default=None,
+        rebuild="",
+        types=[str],
+        description="Directory, relative to the source directory, in which to generate a page per MCP artefact, and index pages listing them.",
+    )
+
+    app.add_config_value(
+        name="mcp_search_index",
+        default=True,
+        rebuild="html",
+        types=[bool],
+        description="Write a search index of the MCP artefacts in HTML output, if any document has an 'mcpdocs:search' widget using it.",
+    )
+
+    app.add_config_value(
+        name="mcp_report",
+        default=None,
+        rebuild="",
+        types=[str],
+        description="Name of a JSON file, relative to the output directory, to which to write the timings and sizes of the MCP metadata and directives of each build.",
+    )
+
     app.add_domain(MCPDocsDomain)
+    app.add_post_transform(ExternalJSONTransform)
+    app.add_post_transform(ResourceContentTransform)
+    app.add_post_transform(SearchWidgetTransform)
 
     # app.add_role_to_domain(domain=MCPDocsDomain.name, name="hello", role=HelloRole())
 
+    app.connect("config-inited", config_inited_handler)
+    app.connect("config-inited", add_static_dir)
     app.connect("builder-inited", builder_inited_handler)
+    # The pages are generated from the artefacts loaded by the handler above.
+    app.connect("builder-inited", generate_pages)
+    app.connect("builder-inited", add_external_json_assets)
+    app.connect("env-get-outdated", env_get_outdated_handler)
+    app.connect("env-purge-doc", env_purge_doc_handler)
+    app.connect("env-merge-info", env_merge_info_handler)
+    app.connect("html-page-context", add_search_script)
+    app.connect("build-finished", build_finished_handler)
 
     return {
         "version": __version__,
+        # Bump this whenever the MCP data kept in the build environment changes.
+        "env_version": 4,
         "parallel_read_safe": True,
         "parallel_write_safe": True,
     }
@@ -0,0 +1,181 @@
+from __future__ import annotations
+import asyncio
+import base64
+import hashlib
+import os
+import time
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from sphinx.util.logging import getLogger
+
+if TYPE_CHECKING:
+    from fastmcp import Client
+
+logger = getLogger(__name__)
+
+# The directory, relative to the cache directory, holding the resource contents written to files.
+CONTENTS_DIRNAME = "contents"
+
+# The key of a stored resource under which the contents read from it are kept.
+KEY_CONTENTS = "contents"
+
+
+@dataclass(slots=True, frozen=True)
+class ContentOptions:
+    """
+    Which resources to read the contents of, and how to keep them.
+    """
+
+    # Patterns, in the syntax of `fnmatch`, matched against `server::name` and the URI of each resource.
+    patterns: tuple[str, ...]
+    # The directory in which the contents that are not kept inline are written, named after their hash.
+    store_dir: str
+    # The maximum number of resources read from a server at the same time.
+    max_concurrent_reads: int = 4
+    # Contents larger than this many bytes are left out.
+    max_bytes: int = 1024 * 1024
+    # Text contents up to this many bytes are kept inline, the others are written to files.
+    max_inline_bytes: int = 4096
+
+
+def select_resources(
+    server_name: str, resources: list[dict], patterns: tuple[str, ...]
+) -> list[dict]:
+    """
+    Select the stored resources of a server matching any of the patterns by `server::name` or by URI.
+    """
+    return [
+        resource
+        for resource in resources
+        if any(
+            fnmatchcase(f"{server_name}::{resource['name']}", pattern)
+            or fnmatchcase(resource.get("uri", ""), pattern)
+            for pattern in patterns
+        )
+    ]
+
+
+def content_filename(digest: str, mime_type: str | None) -> str:
+    """
+    Name the file holding a content after its hash, with an extension matching its MIME type.
+    """
+    import mimetypes
+
+    extension = (mime_type and mimetypes.guess_extension(mime_type)) or ".bin"
+    return f"{digest[:32]}{extension}"
+
+
+def store_content(store_dir: Path, data: bytes, mime_type: str | None) -> str:
+    """
+    Write a content to a file of the store named after its hash, unless it already exists, and return the name.
+    """
+    filename = content_filename(hashlib.sha256(data).hexdigest(), mime_type)
+    path = store_dir / filename
+    if not path.is_file():
+        store_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f".{filename}.{os.getpid()}.tmp")
+        temp_path.write_bytes(data)
+        os.replace(temp_path, path)
+    return filename
+
+
+def keep_content(content, options: ContentOptions) -> dict:
+    """
+    Describe a content read from a resource, keeping small texts inline and writing the others to the store.
+    """
+    text = getattr(content, "text", None)
+    data = text.encode("utf-8") if text is not None else base64.b64decode(content.blob)
+    kept = {
+        "uri": str(content.uri),
+        "size": len(data),
+        "sha256": hashlib.sha256(data).hexdigest(),
+    }
+    if content.mimeType:
+        kept["mimeType"] = content.mimeType
+    if len(data) > options.max_bytes:
+        kept["omitted"] = True
+    elif text is not None and len(data) <= options.max_inline_bytes:
+        kept["text"] = text
+    else:
+        kept["file"] = store_content(Path(options.store_dir), data, content.mimeType)
+    return kept
+
+
+async def read_resource_contents(
+    client: Client,
+    server_name: str,
+    resources: list[dict],
+    options: ContentOptions,
+    stats: dict | None = None,
+) -> None:
+    """
+    Read the contents of the stored resources selected by the options and add them to the resources.
+
+    At most `max_concurrent_reads` resources are read at the same time. Each read is described, and its
+    content written to the store if it is not kept inline, as soon as it completes, so that at most that
+    many contents are held in memory. A resource that cannot be read is documented without contents.
+    If a `stats` dictionary is given, the number of resources read, the total size of their contents and
+    the time taken are stored in it.
+    """
+    selected = select_resources(server_name, resources, options.patterns)
+    if not selected:
+        return
+    start = time.perf_counter()
+    semaphore = asyncio.Semaphore(options.max_concurrent_reads)
+    sizes = []
+
+    async def read(resource: dict) -> None:
+        async with semaphore:
+            try:
+                result = await client.session.read_resource(resource["uri"])
+            except Exception as e:
+                resource.pop(KEY_CONTENTS, None)
+                logger.warning(
+                    f"Unable to read resource {resource['uri']} of MCP server {server_name}: {e}"
+                )
+                return
+            resource[KEY_CONTENTS] = [
+                keep_content(content, options) for content in result.contents
+            ]
+            del result
+        for kept in resource[KEY_CONTENTS]:
+            sizes.append(kept["size"])
+            if kept.get("omitted"):
+                logger.warning(
+                    f"Leaving out the content of resource {kept['uri']} of MCP server {server_name}, "
+                    f"which is larger than {options.max_bytes} bytes."
+                )
+
+    logger.info(
+        f"Reading {len(selected)} resource{'s' if len(selected) > 1 else ''} from {server_name}."
+    )
+    await asyncio.gather(*(read(resource) for resource in selected))
+    if stats is not None:
+        stats.update(
+            contents={
+                "items": len(sizes),
+                "bytes": sum(sizes),
+                "seconds": time.perf_counter() - start,
+            }
+        )
+
+
+def prune_content_store(store_dir: Path, server_metadata: dict) -> None:
+    """
+    Remove the files of the store that none of the loaded resources refers to.
+    """
+    if not store_dir.is_dir():
+        return
+    used = {
+        content["file"]
+        for artefacts in server_metadata.values()
+        for resource in artefacts["resources"]
+        for content in resource.get(KEY_CONTENTS, ())
+        if "file" in content
+    }
+    for path in store_dir.iterdir():
+        if path.name not in used and not path.name.startswith("."):
+            path.unlink(missing_ok=True)
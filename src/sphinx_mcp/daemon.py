@@ -0,0 +1,259 @@
+from __future__ import annotations
+import asyncio
+import hashlib
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+from sphinx.util.logging import getLogger
+
+from sphinx_mcp.contents import ContentOptions
+from sphinx_mcp.fetch import fetch_all_metadata
+from sphinx_mcp.sessions import SessionPool
+
+logger = getLogger(__name__)
+
+# Time, in seconds, allowed for a newly started daemon to accept connections.
+DAEMON_START_TIMEOUT = 30
+
+# The largest request accepted by the daemon, in bytes.
+MAX_REQUEST_SIZE = 2**24
+
+
+def daemon_socket_path(confdir: Path) -> Path:
+    """
+    Get the path of the socket of the daemon serving the builds of a Sphinx project from the current directory.
+
+    The socket is in a directory that only the current user can access, since the daemon starts the MCP
+    servers it is asked to.
+    """
+    if sys.platform == "win32":
+        raise RuntimeError("The MCP session daemon is not supported on Windows.")
+    socket_dir = Path(tempfile.gettempdir()) / f"sphinx-mcp-{os.getuid()}"
+    socket_dir.mkdir(mode=0o700, exist_ok=True)
+    status = socket_dir.stat()
+    if status.st_uid != os.getuid() or status.st_mode & 0o077:
+        raise RuntimeError(
+            f"The directory {socket_dir} of the MCP session daemon must only be accessible to its owner."
+        )
+    # Relative commands and working directories of the servers depend on the current directory.
+    key = f"{Path(confdir).resolve()}\0{Path.cwd()}"
+    return socket_dir / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]}.sock"
+
+
+def request_daemon(socket_path: Path, request: dict) -> dict:
+    """
+    Send a request to the daemon listening on a socket and wait for its response.
+
+    Raises an `OSError` if the daemon cannot be reached, and a `RuntimeError` if it fails to handle the request.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(str(socket_path))
+        client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with client.makefile("rb") as f:
+            response = json.loads(f.read())
+    if "error" in response:
+        raise RuntimeError(f"The MCP session daemon failed: {response['error']}")
+    return response
+
+
+def start_daemon(confdir: Path, socket_path: Path, idle_timeout: float) -> None:
+    """
+    Start a daemon for a Sphinx project in the background and wait until it accepts connections.
+
+    The daemon inherits the environment variables and the current directory of this process.
+    """
+    log_path = socket_path.with_suffix(".log")
+    logger.info(f"Starting the MCP session daemon, logging to {log_path}.")
+    with log_path.open("ab") as log:
+        process = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "sphinx_mcp.main",
+                "daemon",
+                str(confdir),
+                "--idle-timeout",
+                str(idle_timeout),
+            ],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+    deadline = time.monotonic() + DAEMON_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(
+                f"The MCP session daemon exited with status {process.returncode}, see {log_path}."
+            )
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                client.connect(str(socket_path))
+            return
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(
+        f"The MCP session daemon did not start within {DAEMON_START_TIMEOUT} seconds, see {log_path}."
+    )
+
+
+def fetch_all_metadata_from_daemon(
+    confdir: Path,
+    idle_timeout: float,
+    servers: dict,
+    max_concurrent_servers: int,
+    max_items: int = 0,
+    connect_timeout: float | None = None,
+    request_timeout: float | None = None,
+    server_timeout: float | None = None,
+    retries: int = 0,
+    retry_backoff: float = 1.0,
+    errors: dict | None = None,
+    stats: dict | None = None,
+    contents: ContentOptions | None = None,
+) -> dict:
+    """
+    Fetch the metadata of all the given MCP servers through the daemon keeping sessions open with them.
+
+    The daemon of the Sphinx project is started if it is not running. The arguments are those of
+    `sphinx_mcp.fetch.fetch_all_metadata`, which the daemon runs.
+    """
+    socket_path = daemon_socket_path(confdir)
+    request = {
+        "command": "fetch",
+        "servers": servers,
+        "max_concurrent_servers": max_concurrent_servers,
+        "max_items": max_items,
+        "connect_timeout": connect_timeout,
+        "request_timeout": request_timeout,
+        "server_timeout": server_timeout,
+        "retries": retries,
+        "retry_backoff": retry_backoff,
+        "contents": None if contents is None else asdict(contents),
+        # Servers run in-process, see `sphinx_mcp.fetch.KEY_SERVER_OBJECT`, are imported by the daemon, which
+        # needs the import paths added by `conf.py`.
+        "sys_path": sys.path,
+    }
+    try:
+        response = request_daemon(socket_path, request)
+    except (ConnectionRefusedError, FileNotFoundError):
+        start_daemon(confdir, socket_path, idle_timeout)
+        response = request_daemon(socket_path, request)
+    if stats is not None:
+        stats.update(response["stats"])
+    for server_name, error in response["errors"].items():
+        if errors is None:
+            raise RuntimeError(error)
+        errors[server_name] = RuntimeError(error)
+    return response["metadata"]
+
+
+def stop_daemon(confdir: Path) -> bool:
+    """
+    Stop the daemon of a Sphinx project, closing its sessions. Returns whether it was running.
+    """
+    try:
+        request_daemon(daemon_socket_path(confdir), {"command": "stop"})
+    except (ConnectionRefusedError, FileNotFoundError):
+        return False
+    return True
+
+
+async def serve_daemon(socket_path: Path, idle_timeout: float) -> None:
+    """
+    Serve requests to fetch MCP server metadata on a socket, keeping the sessions with the servers open.
+
+    The daemon stops when asked to, or once it has not served any request for `idle_timeout` seconds.
+    """
+    pool = SessionPool(idle_timeout)
+    # Builds share the sessions, so they are served one at a time.
+    lock = asyncio.Lock()
+    stopping = asyncio.Event()
+    last_request = time.monotonic()
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        nonlocal last_request
+        try:
+            request = json.loads(await reader.readline())
+            if request["command"] == "stop":
+                stopping.set()
+                response = {}
+            else:
+                async with lock:
+                    sys.path.extend(
+                        path for path in request["sys_path"] if path not in sys.path
+                    )
+                    errors = {}
+                    stats = {}
+                    metadata = await fetch_all_metadata(
+                        request["servers"],
+                        request["max_concurrent_servers"],
+                        request["max_items"],
+                        connect_timeout=request["connect_timeout"],
+                        request_timeout=request["request_timeout"],
+                        server_timeout=request["server_timeout"],
+                        retries=request["retries"],
+                        retry_backoff=request["retry_backoff"],
+                        errors=errors,
+                        stats=stats,
+                        sessions=pool,
+                        contents=None
+                        if request["contents"] is None
+                        else ContentOptions(**request["contents"]),
+                    )
+                    last_request = time.monotonic()
+                response = {
+                    "metadata": metadata,
+                    "errors": {name: str(error) for name, error in errors.items()},
+                    "stats": stats,
+                }
+        except Exception as e:
+            logger.warning(f"Failed to handle a request: {e}")
+            response = {"error": str(e) or type(e).__name__}
+        writer.write(json.dumps(response, separators=(",", ":")).encode("utf-8"))
+        await writer.drain()
+        writer.close()
+        await writer.wait_closed()
+
+    server = await asyncio.start_unix_server(
+        handle, path=str(socket_path), limit=MAX_REQUEST_SIZE
+    )
+    socket_id = socket_path.stat().st_ino
+    logger.info(f"Listening on {socket_path}.")
+    async with server:
+        while not stopping.is_set():
+            remaining = last_request + idle_timeout - time.monotonic()
+            if remaining <= 0 and not lock.locked():
+                logger.info(f"No request for {idle_timeout:g} seconds, stopping.")
+                break
+            try:
+                await asyncio.wait_for(stopping.wait(), max(remaining, 1))
+            except TimeoutError:
+                pass
+    await pool.close_all()
+    # Another daemon may have replaced the socket in the meantime.
+    if socket_path.exists() and socket_path.stat().st_ino == socket_id:
+        socket_path.unlink()
+
+
+def run_daemon(confdir: Path, idle_timeout: float) -> None:
+    """
+    Run the daemon of a Sphinx project until it stops, unless one is already running.
+    """
+    socket_path = daemon_socket_path(confdir)
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(str(socket_path))
+        logger.warning(f"An MCP session daemon is already listening on {socket_path}.")
+        return
+    except OSError:
+        pass
+    asyncio.run(serve_daemon(socket_path, idle_timeout))
@@ -0,0 +1,346 @@
+from __future__ import annotations
+import asyncio
+import importlib
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from sphinx.util.logging import getLogger
+
+from sphinx_mcp.cache import dump_artefact
+from sphinx_mcp.contents import ContentOptions, read_resource_contents
+
+if TYPE_CHECKING:
+    from fastmcp import Client
+
+    from sphinx_mcp.sessions import SessionPool
+
+logger = getLogger(__name__)
+
+KEY_MCP_SERVERS = "mcpServers"
+
+# The key of the configuration entry of an MCP server run in-process, naming the server object as `module:attribute`.
+KEY_SERVER_OBJECT = "object"
+
+# The kinds of artefacts exposed by an MCP server, in the order they are fetched.
+ARTEFACT_KINDS = ("tools", "prompts", "resources", "resource_templates")
+
+# The attribute holding the artefacts in a page of results of each kind.
+PAGE_ATTRIBUTES = {
+    "tools": "tools",
+    "prompts": "prompts",
+    "resources": "resources",
+    "resource_templates": "resourceTemplates",
+}
+
+
+def load_server_object(import_path: str) -> Any:
+    """
+    Import an MCP server object from an import path such as `pymcp.server:app`.
+    """
+    module_name, _, attribute_path = import_path.partition(":")
+    if not module_name or not attribute_path:
+        raise RuntimeError(
+            f"The MCP server object {import_path!r} must be given as 'module:attribute'."
+        )
+    try:
+        server = importlib.import_module(module_name)
+    except ImportError as e:
+        raise RuntimeError(
+            f"Unable to import module {module_name} of MCP server object {import_path}: {e}"
+        ) from e
+    for attribute in attribute_path.split("."):
+        try:
+            server = getattr(server, attribute)
+        except AttributeError as e:
+            raise RuntimeError(
+                f"Module {module_name} has no MCP server object {attribute_path}."
+            ) from e
+    return server
+
+
+def create_client(
+    server_name: str,
+    server_config: dict,
+    connect_timeout: float | None = None,
+    request_timeout: float | None = None,
+    message_handler: Callable | None = None,
+) -> Client:
+    """
+    Create a client for an MCP server, without connecting to it.
+
+    A server whose configuration names a server object, e.g., `{"object": "pymcp.server:app"}`, is imported
+    and connected to in memory, in this process. Any other server is connected to through the transport
+    given by its configuration.
+    """
+    # fastmcp is slow to import, so it is only imported when a server is actually contacted.
+    from fastmcp import Client
+
+    if KEY_SERVER_OBJECT in server_config:
+        transport = load_server_object(server_config[KEY_SERVER_OBJECT])
+    else:
+        transport = {KEY_MCP_SERVERS: {server_name: server_config}}
+    try:
+        return Client(
+            transport=transport,
+            timeout=request_timeout,
+            init_timeout=connect_timeout,
+            message_handler=message_handler,
+        )
+    except ValueError as e:
+        raise RuntimeError(
+            f"Unable to create a client for MCP server {server_name}: {e}"
+        ) from e
+
+
+async def fetch_artefacts(
+    client: Client,
+    server_name: str,
+    kind: str,
+    max_items: int,
+    stats: dict | None = None,
+) -> list[dict]:
+    """
+    Fetch all the artefacts of one kind from an MCP server, following the `nextCursor` pagination.
+
+    Each page is converted to stored dictionaries as soon as it arrives, so that at most one page of
+    MCP artefacts is held at any time. At most `max_items` artefacts are kept, unless it is 0.
+    If a `stats` dictionary is given, the number of pages and artefacts and the time taken are stored in it.
+    """
+    start = time.perf_counter()
+    list_page = getattr(client.session, f"list_{kind}")
+    label = kind.replace("_", " ")
+    artefacts = []
+    seen_cursors = set()
+    cursor = None
+    page_count = 0
+    while True:
+        page = await list_page(cursor=cursor)
+        page_count += 1
+        for artefact in getattr(page, PAGE_ATTRIBUTES[kind]):
+            artefacts.append(dump_artefact(artefact))
+        cursor = page.nextCursor
+        del page
+        if cursor is not None or page_count > 1:
+            logger.info(
+                f"Fetched page {page_count} of {label} from {server_name}, {len(artefacts)} so far."
+            )
+        if max_items and len(artefacts) >= max_items:
+            if cursor is not None or len(artefacts) > max_items:
+                logger.warning(
+                    f"Only documenting the first {max_items} {label} of MCP server {server_name}."
+                )
+            del artefacts[max_items:]
+            break
+        if cursor is None:
+            break
+        if cursor in seen_cursors:
+            logger.warning(
+                f"MCP server {server_name} returned the cursor {cursor!r} for {label} more than once, stopping."
+            )
+            break
+        seen_cursors.add(cursor)
+    if stats is not None:
+        stats.update(
+            pages=page_count,
+            items=len(artefacts),
+            seconds=time.perf_counter() - start,
+        )
+    return artefacts
+
+
+async def fetch_server_metadata(
+    server_name: str,
+    server_config: dict,
+    max_items: int = 0,
+    connect_timeout: float | None = None,
+    request_timeout: float | None = None,
+    stats: dict | None = None,
+    contents: ContentOptions | None = None,
+) -> dict:
+    """
+    Connect to one MCP server and fetch its tools, prompts, resources and resource templates.
+
+    The four list calls are issued concurrently over the same client session. Connecting, including the
+    initialisation handshake, must complete within `connect_timeout` seconds and each list call within
+    `request_timeout` seconds, unless they are `None`. If a `stats` dictionary is given, the time taken to
+    connect and the statistics of each list call, see `fetch_artefacts`, are stored in it. If content
+    options are given, the contents of the selected resources are read too, see `read_resource_contents`.
+    """
+    logger.info(f"Connecting to MCP server {server_name} with config: {server_config}.")
+    client = create_client(server_name, server_config, connect_timeout, request_timeout)
+    kind_stats = {kind: {} for kind in ARTEFACT_KINDS}
+    start = time.perf_counter()
+    async with client:
+        connect_seconds = time.perf_counter() - start
+        logger.info(
+            f"Fetching tools, prompts, resources and resource templates from {server_name}."
+        )
+        tools, prompts, resources, resource_templates = await asyncio.gather(
+            *(
+                fetch_artefacts(client, server_name, kind, max_items, kind_stats[kind])
+                for kind in ARTEFACT_KINDS
+            )
+        )
+        if contents is not None:
+            await read_resource_contents(
+                client, server_name, resources, contents, stats
+            )
+    if stats is not None:
+        stats.update(connect_seconds=connect_seconds, kinds=kind_stats)
+    metadata = {
+        "tools": tools,
+        "prompts": prompts,
+        "resources": resources,
+        "resource_templates": resource_templates,
+    }
+    log_retrieved_artefacts(server_name, metadata)
+    return metadata
+
+
+def log_retrieved_artefacts(server_name: str, metadata: dict) -> None:
+    """
+    Log the number of artefacts of each kind retrieved from an MCP server.
+    """
+    tools, prompts, resources, resource_templates = (
+        metadata[kind] for kind in ARTEFACT_KINDS
+    )
+    logger.info(
+        f"Retrieved {len(tools)} tool{'s' if len(tools) > 1 else ''}, "
+        f"{len(prompts)} prompt{'s' if len(prompts) > 1 else ''}, "
+        f"{len(resources)} resource{'s' if len(resources) > 1 else ''} and "
+        f"{len(resource_templates)} resource template{'s' if len(resource_templates) > 1 else ''} "
+        f"from {server_name}."
+    )
+
+
+async def fetch_server_metadata_with_retries(
+    server_name: str,
+    server_config: dict,
+    max_items: int = 0,
+    connect_timeout: float | None = None,
+    request_timeout: float | None = None,
+    server_timeout: float | None = None,
+    retries: int = 0,
+    retry_backoff: float = 1.0,
+    stats: dict | None = None,
+    sessions: SessionPool | None = None,
+    contents: ContentOptions | None = None,
+) -> dict:
+    """
+    Fetch the metadata of one MCP server, trying again up to `retries` times if it fails.
+
+    Each attempt must complete within `server_timeout` seconds, unless it is `None`. The delay before
+    each new attempt starts at `retry_backoff` seconds and doubles every time. Raises a `RuntimeError`
+    if the last attempt fails. If a `stats` dictionary is given, the number of attempts and the total
+    time taken are stored in it, along with the statistics of the last attempt. If a session pool is
+    given, the metadata is fetched over the session it keeps open with the server.
+    """
+    fetch = (
+        fetch_server_metadata if sessions is None else sessions.fetch_server_metadata
+    )
+    if KEY_SERVER_OBJECT in server_config:
+        # Importing the server object would only fail again, so it is not retried.
+        try:
+            load_server_object(server_config[KEY_SERVER_OBJECT])
+        except RuntimeError as e:
+            raise RuntimeError(f"Unable to load MCP server {server_name}: {e}") from e
+    start = time.perf_counter()
+    for attempt in range(retries + 1):
+        if stats is not None:
+            stats.update(attempts=attempt + 1)
+        try:
+            async with asyncio.timeout(server_timeout):
+                return await fetch(
+                    server_name,
+                    server_config,
+                    max_items,
+                    connect_timeout,
+                    request_timeout,
+                    stats,
+                    contents,
+                )
+        except Exception as e:
+            if isinstance(e, TimeoutError):
+                reason = f"timed out after {server_timeout} seconds"
+            else:
+                reason = (str(e) or type(e).__name__).rstrip(".")
+            if attempt == retries:
+                raise RuntimeError(
+                    f"Unable to fetch metadata from MCP server {server_name} after "
+                    f"{attempt + 1} attempt{'s' if attempt > 0 else ''}: {reason}"
+                ) from e
+            delay = retry_backoff * 2**attempt
+            logger.warning(
+                f"Attempt {attempt + 1} to fetch metadata from MCP server {server_name} failed: {reason}. "
+                f"Trying again in {delay:g} seconds."
+            )
+            await asyncio.sleep(delay)
+        finally:
+            if stats is not None:
+                stats.update(seconds=time.perf_counter() - start)
+
+
+async def fetch_all_metadata(
+    servers: dict,
+    max_concurrent_servers: int,
+    max_items: int = 0,
+    connect_timeout: float | None = None,
+    request_timeout: float | None = None,
+    server_timeout: float | None = None,
+    retries: int = 0,
+    retry_backoff: float = 1.0,
+    errors: dict | None = None,
+    stats: dict | None = None,
+    sessions: SessionPool | None = None,
+    contents: ContentOptions | None = None,
+) -> dict:
+    """
+    Fetch the metadata of all the given MCP servers concurrently.
+
+    At most `max_concurrent_servers` servers are connected at any one time. The
+    returned dictionary preserves the order of `servers`. See
+    `fetch_server_metadata_with_retries` for the timeouts and retries.
+
+    If a server cannot be fetched, a `RuntimeError` is raised, unless an `errors`
+    dictionary is given, in which case the error is stored in it under the name of
+    the server and the server is left out of the returned dictionary. Likewise, if a
+    `stats` dictionary is given, the statistics of fetching each server are stored in it.
+    If a session pool is given, the sessions it keeps open with the servers are used. If content options
+    are given, the contents of the selected resources are read too.
+    """
+    semaphore = asyncio.Semaphore(max_concurrent_servers)
+
+    async def fetch_bounded(server_name: str, server_config: dict) -> dict | None:
+        async with semaphore:
+            try:
+                return await fetch_server_metadata_with_retries(
+                    server_name,
+                    server_config,
+                    max_items,
+                    connect_timeout,
+                    request_timeout,
+                    server_timeout,
+                    retries,
+                    retry_backoff,
+                    None if stats is None else stats.setdefault(server_name, {}),
+                    sessions,
+                    contents,
+                )
+            except RuntimeError as e:
+                if errors is None:
+                    raise
+                errors[server_name] = e
+                return None
+
+    results = await asyncio.gather(
+        *(
+            fetch_bounded(server_name, server_config)
+            for server_name, server_config in servers.items()
+        )
+    )
+    return {
+        server_name: result
+        for server_name, result in zip(servers.keys(), results)
+        if result is not None
+    }
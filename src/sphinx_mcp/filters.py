@@ -0,0 +1,152 @@
+from __future__ import annotations
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass
+from fnmatch import translate
+
+from docutils.parsers.rst import directives
+
+from sphinx_mcp.artefacts import MCPArtefact
+
+# The prefix of the patterns of the `:include:` and `:exclude:` options that are regular expressions rather than globs.
+REGEX_PREFIX = "re:"
+
+# The values of the hints of tools that are not annotated, as defined by the MCP specification.
+TOOL_HINT_DEFAULTS = {
+    "readOnlyHint": False,
+    "destructiveHint": True,
+    "idempotentHint": False,
+    "openWorldHint": True,
+}
+
+# The keys by which the `:sort:` option sorts the artefacts, given the server and the artefact.
+SORT_KEYS = {
+    "name": lambda server, artefact: (artefact.name.casefold(), server),
+    "title": lambda server, artefact: (
+        (artefact.title or artefact.name).casefold(),
+        server,
+    ),
+}
+
+
+def name_patterns(argument: str | None) -> re.Pattern:
+    """
+    Option conversion function compiling comma-separated glob patterns, or regular expressions prefixed by `re:`,
+    into one regular expression matching the names matching any of them.
+    """
+    patterns = [
+        pattern.strip() for pattern in (argument or "").split(",") if pattern.strip()
+    ]
+    if not patterns:
+        raise ValueError("At least one pattern is required.")
+    regexes = []
+    for pattern in patterns:
+        if pattern.startswith(REGEX_PREFIX):
+            regex = pattern.removeprefix(REGEX_PREFIX)
+            try:
+                re.compile(regex)
+            except re.error as e:
+                raise ValueError(f"Invalid regular expression {regex!r}: {e}") from e
+            # Like globs, regular expressions must match the whole name.
+            regexes.append(f"(?:{regex})\\Z")
+        else:
+            regexes.append(translate(pattern))
+    return re.compile("|".join(regexes))
+
+
+def annotation_hints(argument: str | None) -> tuple[tuple[str, bool], ...]:
+    """
+    Option conversion function parsing comma-separated annotations, each required to be true, or to be false if
+    prefixed by `!`.
+    """
+    hints = []
+    for hint in (argument or "").split(","):
+        hint = hint.strip()
+        expected = not hint.startswith("!")
+        hint = hint.removeprefix("!").strip()
+        if not hint:
+            raise ValueError("At least one annotation is required, e.g., readOnlyHint.")
+        hints.append((hint, expected))
+    return tuple(hints)
+
+
+def sort_key(argument: str | None) -> str:
+    """
+    Option conversion function checking the key by which to sort artefacts.
+    """
+    return directives.choice(argument, tuple(SORT_KEYS))
+
+
+# The options of the directives listing MCP artefacts that filter them, with their conversion functions.
+FILTER_OPTIONS = {
+    "include": name_patterns,
+    "exclude": name_patterns,
+    "annotation": annotation_hints,
+    "limit": directives.positive_int,
+    "sort": sort_key,
+}
+
+
+@dataclass(slots=True, frozen=True)
+class ArtefactFilter:
+    """
+    The selection of the MCP artefacts listed by a directive, from the options of the directive.
+
+    The options are converted, and the patterns compiled, once when the directive is parsed, and the
+    artefacts are selected before any of them is rendered.
+    """
+
+    kind: str
+    include: re.Pattern | None = None
+    exclude: re.Pattern | None = None
+    annotations: tuple[tuple[str, bool], ...] = ()
+    limit: int | None = None
+    sort: str | None = None
+
+    @classmethod
+    def from_options(cls, kind: str, options: dict) -> ArtefactFilter:
+        """
+        Create the filter of a directive listing MCP artefacts of the given kind from its converted options.
+        """
+        return cls(
+            kind=kind,
+            include=options.get("include"),
+            exclude=options.get("exclude"),
+            annotations=options.get("annotation", ()),
+            limit=options.get("limit"),
+            sort=options.get("sort"),
+        )
+
+    def matches(self, artefact: MCPArtefact) -> bool:
+        """
+        Check whether an artefact is selected by its name and annotations.
+        """
+        if self.include is not None and not self.include.match(artefact.name):
+            return False
+        if self.exclude is not None and self.exclude.match(artefact.name):
+            return False
+        if self.annotations:
+            annotations = artefact.load("annotations") or {}
+            defaults = TOOL_HINT_DEFAULTS if self.kind == "tools" else {}
+            for hint, expected in self.annotations:
+                if bool(annotations.get(hint, defaults.get(hint))) != expected:
+                    return False
+        return True
+
+    def select(
+        self, artefacts: Iterable[tuple[str, MCPArtefact]]
+    ) -> list[tuple[str, MCPArtefact]]:
+        """
+        Select, sort and limit the artefacts, given along with their servers.
+        """
+        selected = [
+            (server, artefact)
+            for server, artefact in artefacts
+            if self.matches(artefact)
+        ]
+        if self.sort is not None:
+            key = SORT_KEYS[self.sort]
+            selected.sort(key=lambda item: key(*item))
+        if self.limit is not None:
+            del selected[self.limit :]
+        return selected
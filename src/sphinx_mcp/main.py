@@ -0,0 +1,240 @@
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import logging
+import runpy
+import sys
+from pathlib import Path
+
+from sphinx_mcp.common import __version__
+from sphinx_mcp.fetch import ARTEFACT_KINDS, KEY_MCP_SERVERS, fetch_all_metadata
+from sphinx_mcp.snapshot import read_snapshot, write_snapshot
+
+
+def load_mcp_config(path: Path) -> dict:
+    """
+    Load an MCP configuration either from a JSON file or from the `mcp_config` variable of a Sphinx `conf.py`.
+    """
+    if path.suffix == ".py":
+        mcp_config = runpy.run_path(str(path)).get("mcp_config")
+    else:
+        with path.open("r", encoding="utf-8") as f:
+            mcp_config = json.load(f)
+    if not isinstance(mcp_config, dict) or KEY_MCP_SERVERS not in mcp_config:
+        raise RuntimeError(f"No 'mcpServers' key found in MCP configuration {path}.")
+    return mcp_config
+
+
+def summarise_snapshot(metadata: dict) -> None:
+    """
+    Print the number of artefacts of each kind per MCP server.
+    """
+    for server_name, artefacts in metadata.items():
+        counts = ", ".join(
+            f"{len(artefacts[kind])} {kind[:-1].replace('_', ' ')}{'s' if len(artefacts[kind]) > 1 else ''}"
+            for kind in ARTEFACT_KINDS
+        )
+        print(f"{server_name}: {counts}")
+
+
+def snapshot_command(args: argparse.Namespace) -> int:
+    """
+    Fetch the metadata of all the configured MCP servers and write it to a snapshot file.
+    """
+    if args.max_concurrent_servers < 1:
+        raise RuntimeError(
+            "The maximum number of concurrent servers must be at least 1."
+        )
+    if args.retries < 0:
+        raise RuntimeError("The number of retries must not be negative.")
+    if args.env_file is not None:
+        from dotenv import load_dotenv
+
+        if not args.env_file.is_file():
+            raise RuntimeError(f"The dotenv file {args.env_file} does not exist.")
+        load_dotenv(args.env_file)
+    mcp_config = load_mcp_config(args.config)
+    servers = mcp_config[KEY_MCP_SERVERS]
+    if args.server:
+        unknown_servers = [name for name in args.server if name not in servers]
+        if unknown_servers:
+            raise RuntimeError(
+                f"No MCP server specification exists by the name{'s' if len(unknown_servers) > 1 else ''} {', '.join(unknown_servers)}."
+            )
+        servers = {name: servers[name] for name in args.server}
+    metadata = asyncio.run(
+        fetch_all_metadata(
+            servers,
+            args.max_concurrent_servers,
+            args.max_items_per_server,
+            connect_timeout=args.connect_timeout or None,
+            request_timeout=args.request_timeout or None,
+            server_timeout=args.server_timeout or None,
+            retries=args.retries,
+        )
+    )
+    write_snapshot(args.output, metadata)
+    # Read the snapshot back to make sure that it can be loaded by the extension.
+    summarise_snapshot(read_snapshot(args.output))
+    print(f"Wrote MCP metadata snapshot {args.output}.")
+    return 0
+
+
+def validate_command(args: argparse.Namespace) -> int:
+    """
+    Validate a snapshot file.
+    """
+    summarise_snapshot(read_snapshot(args.snapshot))
+    print(f"{args.snapshot} is a valid MCP metadata snapshot.")
+    return 0
+
+
+def daemon_command(args: argparse.Namespace) -> int:
+    """
+    Run or stop the daemon keeping MCP sessions open for the builds of a Sphinx project.
+    """
+    from sphinx_mcp.daemon import run_daemon, stop_daemon
+
+    if args.stop:
+        if stop_daemon(args.confdir):
+            print("Stopped the MCP session daemon.")
+        else:
+            print("No MCP session daemon is running.")
+        return 0
+    if args.idle_timeout <= 0:
+        raise RuntimeError("The idle timeout must be positive.")
+    # The daemon is usually started by a build, with its output redirected to a log file.
+    logging.getLogger().setLevel(logging.INFO)
+    logging.getLogger().handlers[0].setFormatter(
+        logging.Formatter("%(asctime)s %(message)s")
+    )
+    run_daemon(args.confdir, args.idle_timeout)
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Entry point of the `sphinx-mcp` command line interface.
+    """
+    parser = argparse.ArgumentParser(
+        prog="sphinx-mcp",
+        description="Prefetch the metadata of MCP servers into snapshots for the sphinx-mcp extension.",
+    )
+    parser.add_argument(
+        "--version", action="version", version=f"%(prog)s {__version__}"
+    )
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="Log the progress of fetching."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    snapshot_parser = subparsers.add_parser(
+        "snapshot",
+        help="Fetch the metadata of the configured MCP servers and write it to a snapshot file.",
+    )
+    snapshot_parser.add_argument(
+        "config",
+        type=Path,
+        help="A JSON file with an 'mcpServers' key, or a Sphinx conf.py defining mcp_config.",
+    )
+    snapshot_parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        required=True,
+        help="The snapshot file to write. It is gzip compressed if its name ends with '.gz'.",
+    )
+    snapshot_parser.add_argument(
+        "-s",
+        "--server",
+        action="append",
+        help="Only snapshot the named server. Can be given more than once.",
+    )
+    snapshot_parser.add_argument(
+        "-j",
+        "--max-concurrent-servers",
+        type=int,
+        default=8,
+        help="Maximum number of MCP servers to connect to concurrently.",
+    )
+    snapshot_parser.add_argument(
+        "--max-items-per-server",
+        type=int,
+        default=0,
+        help="Maximum number of artefacts of each kind to fetch from a server, 0 for no limit.",
+    )
+    snapshot_parser.add_argument(
+        "--connect-timeout",
+        type=float,
+        default=30,
+        help="Seconds allowed to connect to a server, 0 for no limit.",
+    )
+    snapshot_parser.add_argument(
+        "--request-timeout",
+        type=float,
+        default=60,
+        help="Seconds allowed for each request to a server, 0 for no limit.",
+    )
+    snapshot_parser.add_argument(
+        "--server-timeout",
+        type=float,
+        default=300,
+        help="Seconds allowed for each attempt to fetch all the metadata of a server, 0 for no limit.",
+    )
+    snapshot_parser.add_argument(
+        "--retries",
+        type=int,
+        default=2,
+        help="Number of times to try fetching the metadata of a server again after a failure.",
+    )
+    snapshot_parser.add_argument(
+        "--env-file",
+        type=Path,
+        help="A dotenv file from which to load environment variables before connecting to the servers.",
+    )
+    snapshot_parser.set_defaults(func=snapshot_command)
+
+    validate_parser = subparsers.add_parser(
+        "validate", help="Validate a snapshot file and summarise its content."
+    )
+    validate_parser.add_argument("snapshot", type=Path, help="The snapshot file.")
+    validate_parser.set_defaults(func=validate_command)
+
+    daemon_parser = subparsers.add_parser(
+        "daemon",
+        help="Run the daemon keeping MCP sessions open across the builds of a Sphinx project, "
+        "see the 'mcp_server_sessions' configuration. Builds start it when needed.",
+    )
+    daemon_parser.add_argument(
+        "confdir",
+        type=Path,
+        nargs="?",
+        default=Path("."),
+        help="The configuration directory of the Sphinx project, the current directory by default.",
+    )
+    daemon_parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=600,
+        help="Seconds without any build after which the daemon stops.",
+    )
+    daemon_parser.add_argument(
+        "--stop", action="store_true", help="Stop the running daemon."
+    )
+    daemon_parser.set_defaults(func=daemon_command)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(message)s",
+    )
+    try:
+        return args.func(args)
+    except RuntimeError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,334 +1,689 @@
 from __future__ import annotations
-import json
 from docutils import nodes
 
 # This is necessary to write RST files with docutils
 # from docutils.core import publish_programmatically
 
-from mcp.types import Tool, Prompt
+from docutils.parsers.rst import directives
+from sphinx.addnodes import pending_xref
+from sphinx.builders import Builder
+from sphinx.domains import Domain, ObjType
+from sphinx.environment import BuildEnvironment
+from sphinx.roles import XRefRole
 from sphinx.util.docutils import SphinxDirective
-from sphinx.domains import Domain
 from sphinx.util.logging import getLogger
-
-from sphinx_mcp.utils import check_server_filter_for_artefacts
+from sphinx.util.nodes import make_id, make_refnode
+
+from sphinx_mcp.artefacts import MCPArtefact
+from sphinx_mcp.assets import JSON_BLOCK_CLASS, RESOURCE_CONTENT_CLASS
+from sphinx_mcp.filters import FILTER_OPTIONS, ArtefactFilter
+from sphinx_mcp.render import SchemaPart, render_json, split_schema
+from sphinx_mcp.search import SEARCH_ATTRIBUTE
+from sphinx_mcp.utils import (
+    check_server_filter_for_artefacts,
+    find_artefact,
+    note_artefact_usage,
+    format_size,
+    timed_directive,
+)
 
 logger = getLogger(__name__)
 
 
-class MCPToolsDirective(SphinxDirective):
-    """A directive to enumerate MCP tools."""
+class SchemaAppendix:
+    """
+    The unique parts of the JSON schemas of the tools documented by a directive, each of which is rendered once
+    per document, in an appendix following the first directive that uses it.
+
+    Parts are told apart by their content alone, so a definition and a schema with the same content are rendered
+    once, and only the references to them carry the names of definitions.
+    """
+
+    def __init__(self, env: BuildEnvironment) -> None:
+        # The digests of the schema parts already rendered in the current document.
+        self.rendered: set[str] = env.temp_data.setdefault("mcpdocs_schemas", set())
+        # The schema parts to render in the appendix of the directive, by digest.
+        self.parts: dict[str, SchemaPart] = {}
+        # Documents are merged into one page by the singlehtml builder, so the IDs include the document name.
+        self.id_prefix = f"mcpdocs-schema-{nodes.make_id(env.docname)}"
+
+    def target_id(self, part: SchemaPart) -> str:
+        """Get the ID of the target of a schema part in the document."""
+        return f"{self.id_prefix}-{part.digest[:12]}"
+
+    @staticmethod
+    def title(part: SchemaPart) -> str:
+        """Get the title of a schema part in the appendix."""
+        return f"Schema {part.digest[:8]}"
+
+    @classmethod
+    def reference_text(cls, part: SchemaPart) -> str:
+        """Get the text of the references to a schema part, naming the definition it is used as, if any."""
+        if part.name is None:
+            return cls.title(part)
+        return f"Definition {part.name} ({part.digest[:8]})"
+
+    def reference(self, part: SchemaPart) -> nodes.reference:
+        """Reference a schema part, adding it to the appendix if it is not rendered in the document yet."""
+        if part.digest not in self.rendered:
+            self.rendered.add(part.digest)
+            self.parts[part.digest] = part
+        return nodes.reference(
+            "", self.reference_text(part), refid=self.target_id(part), internal=True
+        )
+
+    def render(self) -> list[nodes.Node]:
+        """Render the nodes of the appendix, if any schema part was added to it."""
+        if not self.parts:
+            return []
+        appendix_nodes = [nodes.rubric(text="Schemas")]
+        for part in self.parts.values():
+            appendix_nodes.append(nodes.target("", "", ids=[self.target_id(part)]))
+            part_paragraph = nodes.paragraph()
+            part_paragraph += nodes.strong(text=self.title(part))
+            appendix_nodes.append(part_paragraph)
+            appendix_nodes.append(json_block(part.text))
+        return appendix_nodes
+
+
+def json_block(text: str) -> nodes.literal_block:
+    """Create a literal block showing a pretty-printed JSON value."""
+    return nodes.literal_block(text=text, classes=[JSON_BLOCK_CLASS])
+
+
+def render_schema(
+    server: str,
+    tool: MCPArtefact,
+    attribute: str,
+    label: str,
+    schemas: SchemaAppendix | None,
+) -> list[nodes.Node]:
+    """Render the nodes documenting the input or output schema of an MCP tool, or referencing it in the appendix."""
+    if schemas is None or getattr(tool, attribute) is None:
+        return [
+            nodes.line(),
+            nodes.Text(f"{label}:"),
+            json_block(render_json(server, "tools", tool, attribute)),
+        ]
+    body, *definitions = split_schema(server, "tools", tool, attribute)
+    # References must be inside a text element, unlike the literal blocks above.
+    schema_paragraph = nodes.paragraph()
+    schema_paragraph += nodes.Text(f"{label}: ")
+    schema_paragraph += schemas.reference(body)
+    for i, definition in enumerate(definitions):
+        schema_paragraph += nodes.Text(", using " if i == 0 else ", ")
+        schema_paragraph += schemas.reference(definition)
+    return [schema_paragraph]
+
+
+def render_tool(
+    server: str,
+    tool: MCPArtefact,
+    display_name: str,
+    schemas: SchemaAppendix | None = None,
+) -> list[nodes.Node]:
+    """Render the nodes documenting an MCP tool, referencing its schemas in an appendix if given one."""
+    tool_nodes = []
+    tool_paragraph = nodes.paragraph()
+    tool_paragraph += nodes.strong(text=display_name)
+    if tool.description:
+        tool_paragraph += nodes.Text(": ")
+        tool_paragraph += nodes.emphasis(text=tool.description)
+    tool_nodes.append(tool_paragraph)
+    tool_nodes += render_schema(server, tool, "input_schema", "Input schema", schemas)
+    tool_nodes += render_schema(server, tool, "output_schema", "Output schema", schemas)
+    if tool.annotations:
+        tool_nodes.append(nodes.line())
+        tool_nodes.append(nodes.Text("Annotations:"))
+        tool_nodes.append(json_block(render_json(server, "tools", tool, "annotations")))
+    if tool.meta:
+        tool_nodes.append(nodes.line())
+        tool_nodes.append(nodes.Text("Metadata:"))
+        tool_nodes.append(json_block(render_json(server, "tools", tool, "meta")))
+    return tool_nodes
+
+
+def render_prompt(
+    server: str, prompt: MCPArtefact, display_name: str
+) -> list[nodes.Node]:
+    """Render the nodes documenting an MCP prompt."""
+    prompt_nodes = []
+    prompt_paragraph = nodes.paragraph()
+    prompt_paragraph += nodes.strong(text=display_name)
+    if prompt.description:
+        prompt_paragraph += nodes.Text(": ")
+        prompt_paragraph += nodes.emphasis(text=prompt.description)
+    prompt_nodes.append(prompt_paragraph)
+    if prompt.arguments:
+        prompt_nodes.append(nodes.line())
+        prompt_nodes.append(nodes.Text("Input arguments:"))
+        prompt_nodes.append(
+            json_block(render_json(server, "prompts", prompt, "arguments"))
+        )
+    if prompt.meta:
+        prompt_nodes.append(nodes.line())
+        prompt_nodes.append(nodes.Text("Metadata:"))
+        prompt_nodes.append(json_block(render_json(server, "prompts", prompt, "meta")))
+    return prompt_nodes
+
+
+# The language in which resource contents of each MIME type are highlighted, plain text otherwise.
+CONTENT_LANGUAGES = {
+    "application/json": "json",
+    "text/markdown": "markdown",
+    "text/html": "html",
+    "text/x-python": "python",
+    "application/xml": "xml",
+    "text/xml": "xml",
+}
+
+
+def render_contents(resource: MCPArtefact) -> list[nodes.Node]:
+    """Render the contents read from an MCP resource."""
+    content_nodes = [nodes.line(), nodes.Text("Contents:")]
+    for content in resource.load("contents"):
+        mime_type = content.get("mimeType") or resource.mime_type
+        if "text" in content:
+            content_nodes.append(
+                nodes.literal_block(
+                    text=content["text"],
+                    language=CONTENT_LANGUAGES.get(mime_type, "text"),
+                )
+            )
+            continue
+        description = ", ".join(filter(None, [mime_type, format_size(content["size"])]))
+        content_paragraph = nodes.paragraph()
+        if "file" in content:
+            content_paragraph += nodes.reference(
+                "",
+                "",
+                nodes.literal(text=content["uri"]),
+                classes=[RESOURCE_CONTENT_CLASS],
+                mcpdocs_file=content["file"],
+            )
+            content_paragraph += nodes.Text(f" ({description})")
+        else:
+            content_paragraph += nodes.literal(text=content["uri"])
+            content_paragraph += nodes.Text(f" ({description}) ")
+            content_paragraph += nodes.emphasis(text="is too large to be included.")
+        content_nodes.append(content_paragraph)
+    return content_nodes
+
+
+def render_resource(
+    server: str, resource: MCPArtefact, display_name: str
+) -> list[nodes.Node]:
+    """Render the nodes documenting an MCP resource."""
+    resource_nodes = []
+    resource_paragraph = nodes.paragraph()
+    resource_paragraph += nodes.strong(text=display_name)
+    resource_paragraph += nodes.Text(" (" + resource.uri + ")")
+    if resource.mime_type:
+        resource_paragraph += nodes.Text(" [" + resource.mime_type + "]")
+    if resource.description:
+        resource_paragraph += nodes.Text(": ")
+        resource_paragraph += nodes.emphasis(text=resource.description)
+    resource_nodes.append(resource_paragraph)
+    if resource.annotations:
+        resource_nodes.append(nodes.line())
+        resource_nodes.append(nodes.Text("Annotations:"))
+        resource_nodes.append(
+            json_block(render_json(server, "resources", resource, "annotations"))
+        )
+    if resource.meta:
+        resource_nodes.append(nodes.line())
+        resource_nodes.append(nodes.Text("☰"))
+        resource_nodes.append(
+            json_block(render_json(server, "resources", resource, "meta"))
+        )
+    if resource.contents:
+        resource_nodes.extend(render_contents(resource))
+    return resource_nodes
+
+
+def render_resource_template(
+    server: str, resource_template: MCPArtefact, display_name: str
+) -> list[nodes.Node]:
+    """Render the nodes documenting an MCP resource template."""
+    resource_template_nodes = []
+    resource_template_paragraph = nodes.paragraph()
+    resource_template_paragraph += nodes.strong(text=display_name)
+    resource_template_paragraph += nodes.Text(" (" + resource_template.uri + ")")
+    if resource_template.mime_type:
+        resource_template_paragraph += nodes.Text(
+            " [" + resource_template.mime_type + "]"
+        )
+    if resource_template.description:
+        resource_template_paragraph += nodes.Text(": ")
+        resource_template_paragraph += nodes.emphasis(
+            text=resource_template.description
+        )
+    resource_template_nodes.append(resource_template_paragraph)
+    if resource_template.annotations:
+        resource_template_nodes.append(nodes.line())
+        resource_template_nodes.append(nodes.Text("Annotations:"))
+        resource_template_nodes.append(
+            json_block(
+                render_json(
+                    server, "resource_templates", resource_template, "annotations"
+                )
+            )
+        )
+    if resource_template.meta:
+        resource_template_nodes.append(nodes.line())
+        resource_template_nodes.append(nodes.Text("Metadata:"))
+        resource_template_nodes.append(
+            json_block(
+                render_json(server, "resource_templates", resource_template, "meta")
+            )
+        )
+    return resource_template_nodes
+
+
+# The domain object type of each kind of MCP artefact.
+OBJECT_TYPES = {
+    "tools": "tool",
+    "prompts": "prompt",
+    "resources": "resource",
+    "resource_templates": "resource_template",
+}
+
+RENDERERS = {
+    "tools": render_tool,
+    "prompts": render_prompt,
+    "resources": render_resource,
+    "resource_templates": render_resource_template,
+}
+
+
+def schema_appendix(directive: SphinxDirective, kind: str) -> SchemaAppendix | None:
+    """
+    Create the appendix of the schemas of the tools documented by a directive, if schemas are deduplicated.
+    """
+    if kind == "tools" and directive.config.mcp_deduplicate_schemas:
+        return SchemaAppendix(directive.env)
+    return None
+
+
+def render_artefact(
+    kind: str,
+    server: str,
+    artefact: MCPArtefact,
+    display_name: str,
+    schemas: SchemaAppendix | None,
+) -> list[nodes.Node]:
+    """Render the nodes documenting an MCP artefact of the given kind."""
+    if kind == "tools":
+        return render_tool(server, artefact, display_name, schemas)
+    return RENDERERS[kind](server, artefact, display_name)
+
+
+def add_artefact_target(
+    directive: SphinxDirective,
+    node: nodes.Element,
+    kind: str,
+    server: str,
+    artefact: MCPArtefact,
+) -> None:
+    """
+    Make a node the target of cross-references to an MCP artefact and register the artefact in the domain,
+    unless the 'no-index' option of the directive is set.
+    """
+    if "no-index" in directive.options:
+        return
+    objtype = OBJECT_TYPES[kind]
+    fullname = f"{server}::{artefact.name}"
+    node_id = make_id(
+        directive.env, directive.state.document, f"mcpdocs-{objtype}", fullname
+    )
+    node["ids"].append(node_id)
+    domain = directive.env.get_domain(MCPDocsDomain.name)
+    domain.note_object(objtype, fullname, node_id, location=directive.get_location())
+
+
+class MCPArtefactsDirective(SphinxDirective):
+    """Base class of the directives enumerating the MCP artefacts of one kind."""
 
     required_arguments = 0
     optional_arguments = 1
+    option_spec = {
+        "no-index": directives.flag,
+        **FILTER_OPTIONS,
+    }
+
+    # The kind of MCP artefacts enumerated by the directive.
+    kind: str
 
     def run(self) -> list[nodes.Node]:
-        check_server_filter_for_artefacts(self.arguments, self.env.mcp_tools)
-        tools_enum = nodes.enumerated_list()
-        for server, tools in self.env.mcp_tools.items():
-            if len(self.arguments) == 1 and self.arguments[0] != server:
-                continue
-            for tool in tools:
-                tool_list_item = nodes.list_item()
-                tool_paragraph = nodes.paragraph()
-                tool_paragraph += nodes.strong(
-                    text=(
-                        tool.name
-                        if len(self.arguments) == 1
-                        else f"{server}::{tool.name}"
-                    )
-                )
-                tool_description = (
-                    nodes.emphasis(text=tool.description) if tool.description else None
-                )
-                tool_input_schema = nodes.literal_block(
-                    text=json.dumps(tool.inputSchema, indent=2)
-                )
-                tool_output_schema = nodes.literal_block(
-                    text=json.dumps(tool.outputSchema, indent=2)
-                )
-                tool_annotations = (
-                    nodes.literal_block(
-                        text=json.dumps(tool.annotations.model_dump(), indent=2)
-                    )
-                    if tool.annotations
-                    else None
-                )
-                tool_meta = (
-                    nodes.literal_block(
-                        text=json.dumps(tool.meta.model_dump(), indent=2)
-                    )
-                    if tool.meta
-                    else None
-                )
-                if tool.description:
-                    tool_paragraph += nodes.Text(": ")
-                    tool_paragraph += tool_description
-                    tool_list_item += tool_paragraph
-                tool_list_item += nodes.line()
-                tool_list_item += nodes.Text("Input schema:")
-                tool_list_item += tool_input_schema
-                tool_list_item += nodes.line()
-                tool_list_item += nodes.Text("Output schema:")
-                tool_list_item += tool_output_schema
-                if tool.annotations:
-                    tool_list_item += nodes.line()
-                    tool_list_item += nodes.Text("Annotations:")
-                    tool_list_item += tool_annotations
-                if tool.meta:
-                    tool_list_item += nodes.line()
-                    tool_list_item += nodes.Text("Metadata:")
-                    tool_list_item += tool_meta
-                tools_enum += tool_list_item
+        with timed_directive(self.env, self.name):
+            return self.enumerate_artefacts()
+
+    def enumerate_artefacts(self) -> list[nodes.Node]:
+        """Create the nodes enumerating the MCP artefacts of the kind of the directive."""
+        artefacts = self.env.mcp.artefacts[self.kind]
+        check_server_filter_for_artefacts(self.arguments, artefacts)
+        server_filter = self.arguments[0] if len(self.arguments) == 1 else None
+        note_artefact_usage(self.env, self.kind, server_filter)
+        # The artefacts are selected before any of them is rendered.
+        selected = ArtefactFilter.from_options(self.kind, self.options).select(
+            (server, artefact)
+            for server, server_artefacts in artefacts.items()
+            if server_filter is None or server_filter == server
+            for artefact in server_artefacts
+        )
+        # Servers without artefacts of the kind are listed silently, unless artefacts were filtered out.
+        if not selected and FILTER_OPTIONS.keys() & self.options.keys():
+            logger.warning(
+                f"No MCP {self.kind.replace('_', ' ')} match the options of the directive.",
+                location=self.get_location(),
+            )
+        schemas = schema_appendix(self, self.kind)
+        artefacts_enum = nodes.enumerated_list()
+        for server, artefact in selected:
+            artefact_list_item = nodes.list_item()
+            add_artefact_target(self, artefact_list_item, self.kind, server, artefact)
+            artefact_list_item += render_artefact(
+                self.kind,
+                server,
+                artefact,
+                artefact.name
+                if server_filter is not None
+                else f"{server}::{artefact.name}",
+                schemas,
+            )
+            artefacts_enum += artefact_list_item
 
         return [
-            tools_enum,
+            artefacts_enum,
+            *(schemas.render() if schemas is not None else []),
         ]
 
 
-class MCPPromptsDirective(SphinxDirective):
-    """A directive to enumerate MCP prompts."""
+class MCPArtefactDirective(SphinxDirective):
+    """Base class of the directives documenting a single MCP artefact, given as `server::name`."""
 
-    required_arguments = 0
-    optional_arguments = 1
+    required_arguments = 1
+    optional_arguments = 0
+    # The names of resources may contain spaces.
+    final_argument_whitespace = True
+    option_spec = {
+        "no-index": directives.flag,
+    }
 
-    def run(self) -> list[nodes.Node]:
-        check_server_filter_for_artefacts(self.arguments, self.env.mcp_prompts)
-        prompts_node = nodes.enumerated_list()
-        for server, prompts in self.env.mcp_prompts.items():
-            if len(self.arguments) == 1 and self.arguments[0] != server:
-                continue
-            for prompt in prompts:
-                prompt_list_item = nodes.list_item()
-                prompt_paragraph = nodes.paragraph()
-                prompt_paragraph += nodes.strong(
-                    text=(
-                        prompt.name
-                        if len(self.arguments) == 1
-                        else f"{server}::{prompt.name}"
-                    )
-                )
-                prompt_description = (
-                    nodes.emphasis(text=prompt.description)
-                    if prompt.description
-                    else None
-                )
-                if prompt.arguments:
-                    prompt_arguments = nodes.literal_block(
-                        text=json.dumps(
-                            [argument.model_dump() for argument in prompt.arguments],
-                            indent=2,
-                        )
-                    )
-                prompt_meta = (
-                    nodes.literal_block(
-                        text=json.dumps(prompt.meta.model_dump(), indent=2)
-                    )
-                    if prompt.meta
-                    else None
-                )
+    # The kind of MCP artefact documented by the directive.
+    kind: str
 
-                if prompt.description:
-                    prompt_paragraph += nodes.Text(": ")
-                    prompt_paragraph += prompt_description
-                prompt_list_item += prompt_paragraph
-                if prompt.arguments:
-                    prompt_list_item += nodes.line()
-                    prompt_list_item += nodes.Text("Input arguments:")
-                    prompt_list_item += prompt_arguments
-                if prompt.meta:
-                    prompt_list_item += nodes.line()
-                    prompt_list_item += nodes.Text("Metadata:")
-                    prompt_list_item += prompt_meta
-                prompts_node += prompt_list_item
+    def run(self) -> list[nodes.Node]:
+        with timed_directive(self.env, self.name):
+            return self.document_artefact()
 
+    def document_artefact(self) -> list[nodes.Node]:
+        """Create the nodes documenting the MCP artefact given as the argument of the directive."""
+        server, artefact = find_artefact(
+            self.env.mcp.index[self.kind], self.kind, self.arguments[0]
+        )
+        note_artefact_usage(self.env, self.kind, server, artefact.name)
+        artefact_container = nodes.container(
+            classes=[f"mcpdocs-{self.kind.removesuffix('s')}"]
+        )
+        add_artefact_target(self, artefact_container, self.kind, server, artefact)
+        schemas = schema_appendix(self, self.kind)
+        artefact_container += render_artefact(
+            self.kind, server, artefact, artefact.name, schemas
+        )
         return [
-            prompts_node,
+            artefact_container,
+            *(schemas.render() if schemas is not None else []),
         ]
 
 
-class MCPResourcesDirective(SphinxDirective):
-    """A directive to enumerate MCP resources."""
+class MCPToolsDirective(MCPArtefactsDirective):
+    """A directive to enumerate MCP tools."""
 
-    required_arguments = 0
-    optional_arguments = 1
+    kind = "tools"
 
-    def run(self) -> list[nodes.Node]:
-        check_server_filter_for_artefacts(self.arguments, self.env.mcp_resources)
-        resources_node = nodes.enumerated_list()
-        for server, resources in self.env.mcp_resources.items():
-            if len(self.arguments) == 1 and self.arguments[0] != server:
-                continue
-            for resource in resources:
-                resource_list_item = nodes.list_item()
-                resource_paragraph = nodes.paragraph()
-                resource_paragraph += nodes.strong(
-                    text=(
-                        resource.name
-                        if len(self.arguments) == 1
-                        else f"{server}::{resource.name}"
-                    )
-                )
-                resource_paragraph += nodes.Text(
-                    " (" + str(resource.uri) + ") [" + resource.mimeType + "]"
-                )
-                resource_description = (
-                    nodes.emphasis(text=resource.description)
-                    if resource.description
-                    else None
-                )
-                resource_annotations = (
-                    nodes.literal_block(
-                        text=json.dumps(resource.annotations.model_dump(), indent=2)
-                    )
-                    if resource.annotations
-                    else None
-                )
-                resource_meta = (
-                    nodes.literal_block(
-                        text=json.dumps(resource.meta.model_dump(), indent=2)
-                    )
-                    if resource.meta
-                    else None
-                )
 
-                if resource.description:
-                    resource_paragraph += nodes.Text(": ")
-                    resource_paragraph += resource_description
-                resource_list_item += resource_paragraph
-                if resource.annotations:
-                    resource_list_item += nodes.line()
-                    resource_list_item += nodes.Text("Annotations:")
-                    resource_list_item += resource_annotations
-                if resource.meta:
-                    resource_list_item += nodes.line()
-                    resource_list_item += nodes.Text("☰")
-                    resource_list_item += resource_meta
-                resources_node += resource_list_item
+class MCPPromptsDirective(MCPArtefactsDirective):
+    """A directive to enumerate MCP prompts."""
 
-        return [
-            resources_node,
-        ]
+    kind = "prompts"
 
 
-class MCPResourceTemplatesDirective(SphinxDirective):
+class MCPResourcesDirective(MCPArtefactsDirective):
+    """A directive to enumerate MCP resources."""
+
+    kind = "resources"
+
+
+class MCPResourceTemplatesDirective(MCPArtefactsDirective):
     """A directive to enumerate MCP resource templates."""
 
+    kind = "resource_templates"
+
+
+class MCPToolDirective(MCPArtefactDirective):
+    """A directive to document a single MCP tool."""
+
+    kind = "tools"
+
+
+class MCPPromptDirective(MCPArtefactDirective):
+    """A directive to document a single MCP prompt."""
+
+    kind = "prompts"
+
+
+class MCPResourceDirective(MCPArtefactDirective):
+    """A directive to document a single MCP resource."""
+
+    kind = "resources"
+
+
+class MCPResourceTemplateDirective(MCPArtefactDirective):
+    """A directive to document a single MCP resource template."""
+
+    kind = "resource_templates"
+
+
+class MCPSearchDirective(SphinxDirective):
+    """
+    A directive to add a widget filtering the MCP artefacts of all servers, or of the given server, in HTML output.
+    """
+
     required_arguments = 0
     optional_arguments = 1
 
     def run(self) -> list[nodes.Node]:
         check_server_filter_for_artefacts(
-            self.arguments, self.env.mcp_resource_templates
+            self.arguments, self.env.mcp.artefacts["tools"]
         )
-        resource_templates_node = nodes.enumerated_list()
-        for server, resource_templates in self.env.mcp_resource_templates.items():
-            if len(self.arguments) == 1 and self.arguments[0] != server:
-                continue
-            for resource_template in resource_templates:
-                resource_template_list_item = nodes.list_item()
-                resource_template_paragraph = nodes.paragraph()
-                resource_template_paragraph += nodes.strong(
-                    text=(
-                        resource_template.name
-                        if len(self.arguments) == 1
-                        else f"{server}::{resource_template.name}"
-                    )
-                )
-                if "uriTemplate" in resource_template:
-                    resource_template_paragraph += nodes.Text(
-                        " ("
-                        + str(resource_template.uriTemplate)
-                        + ") ["
-                        + resource_template.mimeType
-                        + "]"
-                    )
-                resource_template_description = (
-                    nodes.emphasis(text=resource_template.description)
-                    if resource_template.description
-                    else None
-                )
-                resource_template_annotations = (
-                    nodes.literal_block(
-                        text=json.dumps(
-                            resource_template.annotations.model_dump(), indent=2
-                        )
-                    )
-                    if resource_template.annotations
-                    else None
-                )
-                resource_template_meta = (
-                    nodes.literal_block(
-                        text=json.dumps(resource_template.meta.model_dump(), indent=2)
-                    )
-                    if resource_template.meta
-                    else None
-                )
-
-                if resource_template.description:
-                    resource_template_paragraph += nodes.Text(": ")
-                    resource_template_paragraph += resource_template_description
-                resource_template_list_item += resource_template_paragraph
-                if resource_template.annotations:
-                    resource_template_list_item += nodes.line()
-                    resource_template_list_item += nodes.Text("Annotations:")
-                    resource_template_list_item += resource_template_annotations
-                if resource_template.meta:
-                    resource_template_list_item += nodes.line()
-                    resource_template_list_item += nodes.Text("Metadata:")
-                    resource_template_list_item += resource_template_meta
-                resource_templates_node += resource_template_list_item
-
-        return [
-            resource_templates_node,
-        ]
+        self.env.get_domain("mcpdocs").note_search(self.env.docname)
+        # The widget is created once the builder is known, see `SearchWidgetTransform`.
+        placeholder = nodes.container(classes=["mcpdocs-search"])
+        placeholder[SEARCH_ATTRIBUTE] = self.arguments[0] if self.arguments else ""
+        return [placeholder]
 
 
 class MCPDocsDomain(Domain):
     name = "mcpdocs"
     label = "Model Context Protocol server(s) documentation"
 
+    object_types = {
+        "tool": ObjType("tool", "tool"),
+        "prompt": ObjType("prompt", "prompt"),
+        "resource": ObjType("resource", "resource"),
+        "resource_template": ObjType("resource template", "resource_template"),
+    }
+
     directives = {
         "tools": MCPToolsDirective,
         "prompts": MCPPromptsDirective,
         "resources": MCPResourcesDirective,
         "resource_templates": MCPResourceTemplatesDirective,
+        "tool": MCPToolDirective,
+        "prompt": MCPPromptDirective,
+        "resource": MCPResourceDirective,
+        "resource_template": MCPResourceTemplateDirective,
+        "search": MCPSearchDirective,
     }
 
-    def get_full_qualified_name(self, node):
-        return f"{self.name}.{node.arguments[0]}"
+    roles = {
+        "tool": XRefRole(),
+        "prompt": XRefRole(),
+        "resource": XRefRole(),
+        "resource_template": XRefRole(),
+    }
 
-    def add_tool(self, signature, tool: Tool):
-        """Add a new tool to the domain."""
-        name = f"{self.name}.{signature}"
-        anchor = f"{self.name}-{signature}"
-
-        self.data[f"{self.name}_tool"][name] = tool
-        # name, dispname, type, docname, anchor, priority
-        self.data["tools"].append(
-            (
-                name,
-                signature,
-                "Tool",
-                self.env.current_document.docname,
-                anchor,
-                0,
+    initial_data = {
+        # (objtype, "server::name") -> (docname, node_id)
+        "objects": {},
+        # (objtype, name) -> ["server::name", ...], to resolve names without a server
+        "names": {},
+        # docname -> [(objtype, "server::name"), ...], to clear documents quickly
+        "documents": {},
+        # docname -> True, for the documents with a search widget, see `write_search_index`
+        "searches": {},
+    }
+    data_version = 3
+
+    @property
+    def objects(self) -> dict[tuple[str, str], tuple[str, str]]:
+        return self.data["objects"]
+
+    def note_object(
+        self,
+        objtype: str,
+        fullname: str,
+        node_id: str,
+        location=None,
+        docname: str | None = None,
+    ) -> None:
+        """Register an MCP artefact, given as `server::name`, documented in the current document."""
+        docname = docname or self.env.docname
+        key = (objtype, fullname)
+        if key in self.objects:
+            other_docname = self.objects[key][0]
+            logger.warning(
+                f"duplicate MCP {self.object_types[objtype].lname} description of {fullname}, "
+                f"other instance in {other_docname}, use :no-index: for one of them",
+                location=location,
             )
-        )
+            return
+        self.objects[key] = (docname, node_id)
+        # Server names never contain `::`, unlike the names of some artefacts.
+        name = fullname.partition("::")[2]
+        self.data["names"].setdefault((objtype, name), []).append(fullname)
+        self.data["documents"].setdefault(docname, []).append(key)
+
+    def note_search(self, docname: str) -> None:
+        """Register a search widget in a document, for which the search index is written."""
+        self.data["searches"][docname] = True
+
+    def add_tool(self, fullname: str, node_id: str) -> None:
+        """Add a new tool to the domain."""
+        self.note_object("tool", fullname, node_id)
 
-    def add_prompt(self, signature, prompt: Prompt):
+    def add_prompt(self, fullname: str, node_id: str) -> None:
         """Add a new prompt to the domain."""
-        name = f"{self.name}.{signature}"
-        anchor = f"{self.name}-{signature}"
-
-        self.data[f"{self.name}_prompt"][name] = prompt
-        # name, dispname, type, docname, anchor, priority
-        self.data["prompts"].append(
-            (
-                name,
-                signature,
-                "Prompt",
-                self.env.current_document.docname,
-                anchor,
-                0,
-            )
-        )
+        self.note_object("prompt", fullname, node_id)
+
+    def add_resource(self, fullname: str, node_id: str) -> None:
+        """Add a new resource to the domain."""
+        self.note_object("resource", fullname, node_id)
+
+    def add_resource_template(self, fullname: str, node_id: str) -> None:
+        """Add a new resource template to the domain."""
+        self.note_object("resource_template", fullname, node_id)
+
+    def clear_doc(self, docname: str) -> None:
+        self.data["searches"].pop(docname, None)
+        for objtype, fullname in self.data["documents"].pop(docname, []):
+            if self.objects.get((objtype, fullname), (None,))[0] != docname:
+                continue
+            del self.objects[(objtype, fullname)]
+            name = fullname.partition("::")[2]
+            fullnames = self.data["names"].get((objtype, name), [])
+            if fullname in fullnames:
+                fullnames.remove(fullname)
+            if not fullnames:
+                self.data["names"].pop((objtype, name), None)
+
+    def merge_domaindata(self, docnames: set[str], otherdata: dict) -> None:
+        for docname in docnames:
+            if docname in otherdata["searches"]:
+                self.note_search(docname)
+            for key in otherdata["documents"].get(docname, []):
+                if key not in otherdata["objects"]:
+                    continue
+                other_docname, node_id = otherdata["objects"][key]
+                if other_docname != docname:
+                    continue
+                objtype, fullname = key
+                self.note_object(
+                    objtype,
+                    fullname,
+                    node_id,
+                    location=(docname, None),
+                    docname=docname,
+                )
+
+    def find_object(self, objtype: str, target: str) -> tuple[str, str, str] | None:
+        """
+        Find an MCP artefact given as `server::name`, or as `name` if it is unique across servers.
+
+        Returns the full name, the document name and the node id of the artefact, if found.
+        """
+        if (objtype, target) in self.objects:
+            return (target, *self.objects[(objtype, target)])
+        # The name of an artefact may contain `::` too.
+        fullnames = self.data["names"].get((objtype, target), [])
+        if len(fullnames) == 1:
+            return (fullnames[0], *self.objects[(objtype, fullnames[0])])
+        return None
+
+    def resolve_xref(
+        self,
+        env: BuildEnvironment,
+        fromdocname: str,
+        builder: Builder,
+        typ: str,
+        target: str,
+        node: pending_xref,
+        contnode: nodes.Element,
+    ) -> nodes.reference | None:
+        found = self.find_object(typ, target)
+        if found is None:
+            return None
+        fullname, docname, node_id = found
+        return make_refnode(builder, fromdocname, docname, node_id, contnode, fullname)
+
+    def resolve_any_xref(
+        self,
+        env: BuildEnvironment,
+        fromdocname: str,
+        builder: Builder,
+        target: str,
+        node: pending_xref,
+        contnode: nodes.Element,
+    ) -> list[tuple[str, nodes.reference]]:
+        results = []
+        for objtype in self.object_types:
+            found = self.find_object(objtype, target)
+            if found is not None:
+                fullname, docname, node_id = found
+                results.append(
+                    (
+                        f"{self.name}:{objtype}",
+                        make_refnode(
+                            builder, fromdocname, docname, node_id, contnode, fullname
+                        ),
+                    )
+                )
+        return results
+
+    def get_objects(self):
+        for (objtype, fullname), (docname, node_id) in self.objects.items():
+            yield fullname, fullname, objtype, docname, node_id, 1
+
+    def get_full_qualified_name(self, node: nodes.Element) -> str | None:
+        return node.get("reftarget")
@@ -0,0 +1,174 @@
+from __future__ import annotations
+import hashlib
+import re
+import time
+from pathlib import Path
+
+from sphinx.application import Sphinx
+from sphinx.util.logging import getLogger
+
+from sphinx_mcp.fetch import ARTEFACT_KINDS
+
+logger = getLogger(__name__)
+
+# The first line of every generated page, so that only generated pages are ever overwritten or removed.
+GENERATED_MARKER = (
+    ".. This page is generated by sphinx_mcp, changes to it are overwritten."
+)
+
+# The suffix of the generated pages, which are written in reStructuredText.
+PAGE_SUFFIX = ".rst"
+
+# The title of the section listing the artefacts of each kind in the index page of a server.
+KIND_TITLES = {
+    "tools": "Tools",
+    "prompts": "Prompts",
+    "resources": "Resources",
+    "resource_templates": "Resource templates",
+}
+
+
+def escape_rst(text: str) -> str:
+    """
+    Escape the characters of a text that reStructuredText would take as inline markup.
+    """
+    return re.sub(r"([\\`*_|<>\[\]:])", r"\\\1", text)
+
+
+def title_rst(title: str, underline: str = "=") -> str:
+    """
+    Render a section title in reStructuredText.
+    """
+    title = escape_rst(title)
+    return f"{title}\n{underline * len(title)}\n"
+
+
+class PageNames:
+    """
+    The file names of the pages of a directory, unique even on case-insensitive file systems.
+    """
+
+    def __init__(self) -> None:
+        self.used: set[str] = set()
+
+    def name(self, text: str) -> str:
+        name = re.sub(r"[^A-Za-z0-9_.-]", "_", text).strip(".") or "_"
+        if name.lower() in self.used or name.lower() == "index":
+            name = f"{name}-{hashlib.sha256(text.encode('utf-8')).hexdigest()[:8]}"
+        self.used.add(name.lower())
+        return name
+
+
+def generated_pages(artefacts: dict) -> dict[str, str]:
+    """
+    Compose the pages documenting each MCP artefact on its own, and the index pages listing them.
+
+    Returns the text of each page by its path relative to the directory of the pages, without suffix.
+    There is an index page per server, with a section per kind of artefact, and an index page of the servers.
+    """
+    servers = list(
+        dict.fromkeys(server for kind in ARTEFACT_KINDS for server in artefacts[kind])
+    )
+    pages = {}
+    server_names = PageNames()
+    server_entries = []
+    for server in servers:
+        server_dir = server_names.name(server)
+        server_entries.append(f"{server_dir}/index")
+        server_page = [GENERATED_MARKER, "", title_rst(server)]
+        for kind in ARTEFACT_KINDS:
+            server_artefacts = artefacts[kind].get(server, ())
+            if not server_artefacts:
+                continue
+            directive = kind.removesuffix("s")
+            artefact_names = PageNames()
+            entries = []
+            for artefact in server_artefacts:
+                page = f"{server_dir}/{kind}/{artefact_names.name(artefact.name)}"
+                pages[page] = "\n".join(
+                    (
+                        GENERATED_MARKER,
+                        "",
+                        title_rst(artefact.name),
+                        f".. mcpdocs:{directive}:: {server}::{artefact.name}",
+                        "",
+                    )
+                )
+                entries.append(f"   {page.removeprefix(f'{server_dir}/')}")
+            server_page += [
+                title_rst(KIND_TITLES[kind], "-"),
+                ".. toctree::",
+                "   :maxdepth: 1",
+                "",
+                *entries,
+                "",
+            ]
+        pages[f"{server_dir}/index"] = "\n".join(server_page)
+    pages["index"] = "\n".join(
+        (
+            GENERATED_MARKER,
+            "",
+            title_rst("MCP servers"),
+            ".. toctree::",
+            "   :maxdepth: 1",
+            "",
+            *(f"   {entry}" for entry in server_entries),
+            "",
+        )
+    )
+    return pages
+
+
+def write_pages(pages_dir: Path, pages: dict[str, str]) -> int:
+    """
+    Write the generated pages whose text changed, and remove the generated pages that are no longer needed.
+
+    Unchanged pages are left alone, so that Sphinx only reads the pages of the artefacts that changed.
+    Returns the number of pages written.
+    """
+    written = 0
+    paths = set()
+    for page, text in pages.items():
+        path = pages_dir / f"{page}{PAGE_SUFFIX}"
+        paths.add(path)
+        try:
+            if path.read_text(encoding="utf-8") == text:
+                continue
+        except FileNotFoundError:
+            path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+        written += 1
+    for path in sorted(pages_dir.rglob(f"*{PAGE_SUFFIX}"), reverse=True):
+        if path in paths:
+            continue
+        with path.open(encoding="utf-8") as f:
+            if f.readline().rstrip("\n") != GENERATED_MARKER:
+                continue
+        path.unlink()
+    # Remove the directories left empty, deepest first.
+    for directory in sorted(pages_dir.rglob("*"), reverse=True):
+        if directory.is_dir() and not any(directory.iterdir()):
+            directory.rmdir()
+    return written
+
+
+def generate_pages(app: Sphinx) -> None:
+    """
+    Handler for the 'builder-inited' event to generate a page per MCP artefact, if `mcp_generate_pages` is set.
+
+    It must run once the artefacts are loaded, and before Sphinx looks for the documents to read.
+    """
+    if not app.config.mcp_generate_pages:
+        return
+    start = time.perf_counter()
+    pages_dir = Path(app.srcdir) / app.config.mcp_generate_pages
+    if not pages_dir.resolve().is_relative_to(Path(app.srcdir).resolve()):
+        raise RuntimeError(
+            f"The directory {app.config.mcp_generate_pages} of the generated MCP pages must be within the source directory."
+        )
+    pages = generated_pages(app.env.mcp.artefacts)
+    written = write_pages(pages_dir, pages)
+    logger.info(
+        f"Generated {len(pages)} MCP page{'s' if len(pages) > 1 else ''} in {pages_dir}, "
+        f"{written} of which changed, in {time.perf_counter() - start:.2f} s."
+    )
@@ -0,0 +1,126 @@
+from __future__ import annotations
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any
+
+from sphinx_mcp.artefacts import MCPArtefact
+
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library if orjson isn't installed.
+    orjson = None
+
+# Pretty-printed JSON values of MCP artefacts rendered during the current build,
+# keyed by server, artefact kind, artefact name, content hash and attribute.
+_rendered_json: dict[tuple[str, str, str, str, str], str] = {}
+
+# The keys of a JSON schema holding definitions shared by the rest of the schema.
+DEFINITIONS_KEYS = ("$defs", "definitions")
+
+
+@dataclass(slots=True, frozen=True)
+class SchemaPart:
+    """
+    The body of a JSON schema, without its definitions, or one of its definitions, pretty-printed.
+    """
+
+    # A hash of the content of the part, identical for identical parts regardless of the order of their keys.
+    digest: str
+    # The name of the definition, or `None` for the body of the schema.
+    name: str | None
+    text: str
+
+
+# The schemas of MCP artefacts split into parts during the current build, keyed like `_rendered_json`.
+_split_schemas: dict[tuple[str, str, str, str, str], tuple[SchemaPart, ...]] = {}
+
+
+def clear_render_cache() -> None:
+    """
+    Forget the JSON values rendered during the previous build.
+    """
+    _rendered_json.clear()
+    _split_schemas.clear()
+
+
+def _pretty_json(value: bytes) -> str:
+    """
+    Pretty-print a serialized JSON value like `json.dumps(..., indent=2)`.
+
+    If orjson is installed, it is used instead, in which case floating point numbers in exponent notation
+    may be formatted differently, e.g., `1e20` rather than `1e+20`.
+    """
+    if orjson is not None:
+        try:
+            return _pretty_value(orjson.loads(value))
+        except orjson.JSONDecodeError:
+            pass
+    return json.dumps(json.loads(value), indent=2)
+
+
+def _pretty_value(value: Any) -> str:
+    """
+    Pretty-print a parsed JSON value like `json.dumps(..., indent=2)`, using orjson if it is installed.
+    """
+    if orjson is not None:
+        try:
+            text = orjson.dumps(value, option=orjson.OPT_INDENT_2).decode("utf-8")
+            # Unlike json.dumps, orjson does not escape non-ASCII characters.
+            if text.isascii():
+                return text
+        except TypeError:
+            pass
+    return json.dumps(value, indent=2)
+
+
+def _schema_part(name: str | None, value: Any) -> SchemaPart:
+    """
+    Hash and pretty-print a part of a JSON schema.
+    """
+    digest = hashlib.sha256(
+        json.dumps(value, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    ).hexdigest()
+    return SchemaPart(digest, name, _pretty_value(value))
+
+
+def render_json(server: str, kind: str, artefact: MCPArtefact, attribute: str) -> str:
+    """
+    Pretty-print the JSON value kept in an attribute of an MCP artefact, at most once per build.
+
+    Missing values are rendered as `null`.
+    """
+    key = (server, kind, artefact.name, artefact.digest, attribute)
+    text = _rendered_json.get(key)
+    if text is None:
+        value = artefact.json_bytes(attribute)
+        text = "null" if value is None else _pretty_json(value)
+        _rendered_json[key] = text
+    return text
+
+
+def split_schema(
+    server: str, kind: str, artefact: MCPArtefact, attribute: str
+) -> tuple[SchemaPart, ...]:
+    """
+    Split the JSON schema kept in an attribute of an MCP artefact into its body and its definitions, at most
+    once per build.
+
+    The body comes first, followed by the definitions in the order of the schema. A schema that is not an
+    object is returned as a body alone.
+    """
+    key = (server, kind, artefact.name, artefact.digest, attribute)
+    parts = _split_schemas.get(key)
+    if parts is None:
+        schema = artefact.load(attribute)
+        definitions = {}
+        if isinstance(schema, dict):
+            schema = dict(schema)
+            for definitions_key in DEFINITIONS_KEYS:
+                if isinstance(schema.get(definitions_key), dict):
+                    definitions.update(schema.pop(definitions_key))
+        parts = (_schema_part(None, schema),) + tuple(
+            _schema_part(name, definition) for name, definition in definitions.items()
+        )
+        _split_schemas[key] = parts
+    return parts
@@ -0,0 +1,100 @@
+from __future__ import annotations
+import json
+import os
+from pathlib import Path
+
+from sphinx.util.logging import getLogger
+
+from sphinx_mcp.fetch import ARTEFACT_KINDS
+from sphinx_mcp.state import MCPState
+from sphinx_mcp.utils import format_size
+
+logger = getLogger(__name__)
+
+# Bump this whenever the layout of the report changes.
+REPORT_FORMAT_VERSION = 1
+
+# The number of slowest documents listed in the summary.
+SLOWEST_DOCUMENTS = 5
+
+
+def build_report(state: MCPState) -> dict:
+    """
+    Gather the statistics of loading the MCP artefacts and of the directives run in the current build.
+    """
+    documents = {}
+    for docname, timings in sorted(state.timings.items()):
+        documents[docname] = {
+            "seconds": sum(seconds for _, seconds in timings.values()),
+            "directives": {
+                directive: {"runs": runs, "seconds": seconds}
+                for directive, (runs, seconds) in sorted(timings.items())
+            },
+        }
+    return {
+        "version": REPORT_FORMAT_VERSION,
+        "load": state.load_stats,
+        "directives_seconds": sum(
+            document["seconds"] for document in documents.values()
+        ),
+        "documents": documents,
+    }
+
+
+def log_report_summary(report: dict) -> None:
+    """
+    Log a summary of a report, with the time taken by each server and the slowest documents.
+    """
+    load = report["load"]
+    if load:
+        logger.info(f"MCP metadata loaded in {load['seconds']:.2f} s.")
+    for server_name, server in load.get("servers", {}).items():
+        counts = ", ".join(
+            f"{server['kinds'][kind]['items']} {kind.removesuffix('s').replace('_', ' ')}"
+            f"{'' if server['kinds'][kind]['items'] == 1 else 's'}"
+            for kind in ARTEFACT_KINDS
+            if kind in server["kinds"]
+        )
+        size = sum(
+            server["kinds"][kind].get("bytes", 0)
+            for kind in ARTEFACT_KINDS
+            if kind in server["kinds"]
+        )
+        details = f"{counts}, {format_size(size)}"
+        if "contents" in server:
+            contents = server["contents"]
+            details += (
+                f", {contents['items']} resource content{'' if contents['items'] == 1 else 's'} "
+                f"of {format_size(contents['bytes'])} read in {contents['seconds']:.2f} s"
+            )
+        if server.get("warm"):
+            details += ", over an open session"
+        elif "connect_seconds" in server:
+            details += f", connected in {server['connect_seconds']:.2f} s"
+        if "attempts" in server:
+            details += f", {'fetched' if server['source'] == 'fetched' else 'failed'} in {server['seconds']:.2f} s"
+            if server["attempts"] > 1:
+                details += f" after {server['attempts']} attempts"
+        logger.info(f"  {server_name} ({server['source']}): {details}")
+    documents = report["documents"]
+    if documents:
+        logger.info(
+            f"mcpdocs directives took {report['directives_seconds']:.2f} s "
+            f"in {len(documents)} document{'s' if len(documents) > 1 else ''}."
+        )
+        slowest = sorted(
+            documents.items(), key=lambda item: item[1]["seconds"], reverse=True
+        )[:SLOWEST_DOCUMENTS]
+        for docname, document in slowest:
+            logger.info(f"  {docname}: {document['seconds']:.3f} s")
+
+
+def write_report(path: Path, report: dict) -> None:
+    """
+    Write a report to a JSON file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with temp_path.open("w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    os.replace(temp_path, path)
@@ -0,0 +1,316 @@
+from __future__ import annotations
+import hashlib
+import html
+import json
+import os
+import re
+import shutil
+import time
+from pathlib import Path
+
+from docutils import nodes
+from sphinx.application import Sphinx
+from sphinx.transforms.post_transforms import SphinxPostTransform
+from sphinx.util.logging import getLogger
+
+from sphinx_mcp.artefacts import MCPArtefact
+from sphinx_mcp.assets import HTML_BUILDERS, page_relative_path
+from sphinx_mcp.fetch import ARTEFACT_KINDS
+
+logger = getLogger(__name__)
+
+# Bump this whenever the layout of the search index changes, see `static/mcpdocs-search.js`.
+SEARCH_FORMAT_VERSION = 1
+
+# The directory, relative to the output directory, holding the manifest and the shards of the search index.
+SEARCH_DIRNAME = "_static/mcpdocs/search"
+
+# The name of the manifest listing the shards of the search index, one per server.
+SEARCH_MANIFEST = "index.json"
+
+# The attribute of the placeholders of search widgets, holding the server to search, if any.
+SEARCH_ATTRIBUTE = "mcpdocs_search"
+
+# The longest summary of an artefact, taken from its description, in characters.
+SUMMARY_LENGTH = 120
+
+# Words, camel case parts and numbers. Keep this in line with `tokenize` in `static/mcpdocs-search.js`.
+TOKEN_PATTERN = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+")
+
+# Common words left out of the index of descriptions.
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from in into is it its of on or that the this to was with".split()
+)
+
+
+def tokenize(text: str | None) -> set[str]:
+    """
+    Split a text into the lowercase tokens under which it is indexed.
+    """
+    if not text:
+        return set()
+    return {token.lower() for token in TOKEN_PATTERN.findall(text)} - STOP_WORDS
+
+
+def schema_property_names(schema: dict | None) -> set[str]:
+    """
+    Collect the names of the properties of a JSON schema, at any depth, including in its definitions.
+    """
+    names = set()
+    stack = [schema]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            properties = value.get("properties")
+            if isinstance(properties, dict):
+                names.update(properties)
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+    return names
+
+
+def artefact_tokens(kind: str, artefact: MCPArtefact) -> set[str]:
+    """
+    Collect the tokens of the name, title, description and URI of an artefact, and of the names of its
+    arguments or schema properties.
+    """
+    tokens = tokenize(artefact.name) | tokenize(artefact.title)
+    tokens |= tokenize(artefact.description) | tokenize(artefact.uri)
+    if kind == "tools":
+        for attribute in ("input_schema", "output_schema"):
+            for name in schema_property_names(artefact.load(attribute)):
+                tokens |= tokenize(name)
+    elif kind == "prompts":
+        for argument in artefact.load("arguments") or ():
+            tokens |= tokenize(argument.get("name"))
+            tokens |= tokenize(argument.get("description"))
+    return tokens
+
+
+def summarise(description: str | None) -> str:
+    """
+    Shorten a description to its first line, of at most `SUMMARY_LENGTH` characters.
+    """
+    summary = (description or "").strip().split("\n", 1)[0]
+    if len(summary) > SUMMARY_LENGTH:
+        summary = summary[: SUMMARY_LENGTH - 1].rstrip() + "…"
+    return summary
+
+
+def document_uris(app: Sphinx) -> dict:
+    """
+    Get the URIs, relative to the output directory, of the documented artefacts, by object type and `server::name`.
+    """
+    builder = app.builder
+    domain = app.env.get_domain("mcpdocs")
+    uris = {}
+    for (objtype, fullname), (docname, node_id) in domain.objects.items():
+        if builder.name == "singlehtml":
+            # All the documents are in the page of the root document.
+            page = Path(
+                os.path.relpath(
+                    builder.get_outfilename(app.config.root_doc), app.outdir
+                )
+            ).as_posix()
+        else:
+            page = builder.get_target_uri(docname)
+        uris[(objtype, fullname)] = f"{page}#{node_id}"
+    return uris
+
+
+def build_search_shard(server: str, artefacts: dict, uris: dict) -> dict:
+    """
+    Build the inverted index of the artefacts of one server.
+
+    Each entry is `[kind, name, uri, summary]`, where `kind` is an index into `ARTEFACT_KINDS` and `uri`
+    is `None` if the artefact is not documented. The tokens are sorted, so that the widget can look up
+    prefixes by bisection, and the postings of each token list the indices of the entries it occurs in.
+    """
+    entries = []
+    postings: dict[str, list[int]] = {}
+    for kind_index, kind in enumerate(ARTEFACT_KINDS):
+        for artefact in artefacts[kind].get(server, ()):
+            entry_index = len(entries)
+            entries.append(
+                [
+                    kind_index,
+                    artefact.name,
+                    uris.get((kind.removesuffix("s"), f"{server}::{artefact.name}")),
+                    summarise(artefact.description),
+                ]
+            )
+            for token in artefact_tokens(kind, artefact):
+                postings.setdefault(token, []).append(entry_index)
+    tokens = sorted(postings)
+    return {
+        "version": SEARCH_FORMAT_VERSION,
+        "server": server,
+        "kinds": list(ARTEFACT_KINDS),
+        "entries": entries,
+        "tokens": tokens,
+        "postings": [postings[token] for token in tokens],
+    }
+
+
+def _write_json(path: Path, value: dict) -> None:
+    """
+    Write a compact JSON file atomically.
+    """
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    temp_path.write_text(
+        json.dumps(value, separators=(",", ":"), ensure_ascii=False), encoding="utf-8"
+    )
+    os.replace(temp_path, path)
+
+
+def search_shard_digest(app: Sphinx, server: str, uris: list[str]) -> str:
+    """
+    Compute a hash of what the shard of a server is built from, namely its artefacts, as hashed in the MCP
+    state, and where they are documented.
+    """
+    digest = hashlib.sha256(str(SEARCH_FORMAT_VERSION).encode("ascii"))
+    for kind in ARTEFACT_KINDS:
+        digest.update(app.env.mcp.hashes.get((kind, server), "").encode("ascii"))
+    for uri in uris:
+        digest.update(uri.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _read_manifest(path: Path) -> dict:
+    """
+    Read the shards listed by the manifest of a search index written by a previous build, if any.
+    """
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("version") != SEARCH_FORMAT_VERSION:
+        return {}
+    return manifest.get("shards", {})
+
+
+def write_search_index(app: Sphinx) -> None:
+    """
+    Write the search index of the MCP artefacts, as one shard per server and a manifest listing them, if any
+    document has a search widget.
+
+    The shards whose artefacts and URIs did not change since they were last written are kept as they are.
+    """
+    search_dir = Path(app.outdir) / SEARCH_DIRNAME
+    if not app.env.get_domain("mcpdocs").data["searches"]:
+        shutil.rmtree(search_dir, ignore_errors=True)
+        return
+    start = time.perf_counter()
+    artefacts = app.env.mcp.artefacts
+    servers = list(
+        dict.fromkeys(server for kind in ARTEFACT_KINDS for server in artefacts[kind])
+    )
+    search_dir.mkdir(parents=True, exist_ok=True)
+    uris = document_uris(app)
+    server_uris = {}
+    for (objtype, fullname), uri in sorted(uris.items()):
+        server_uris.setdefault(fullname.partition("::")[0], []).append(
+            f"{objtype} {fullname} {uri}"
+        )
+    previous_shards = _read_manifest(search_dir / SEARCH_MANIFEST)
+    shards = {}
+    written = 0
+    entry_count = 0
+    for server_index, server in enumerate(servers):
+        filename = f"{server_index}-{re.sub(r'[^A-Za-z0-9_.-]', '_', server)}.json"
+        digest = search_shard_digest(app, server, server_uris.get(server, []))
+        previous = previous_shards.get(server, {})
+        if (
+            previous.get("file") == filename
+            and previous.get("digest") == digest
+            and (search_dir / filename).is_file()
+        ):
+            shards[server] = previous
+        else:
+            shard = build_search_shard(server, artefacts, uris)
+            _write_json(search_dir / filename, shard)
+            shards[server] = {
+                "file": filename,
+                "entries": len(shard["entries"]),
+                "digest": digest,
+            }
+            written += 1
+        entry_count += shards[server]["entries"]
+    if shards == previous_shards:
+        logger.info("The MCP search index is up to date.")
+        return
+    _write_json(
+        search_dir / SEARCH_MANIFEST,
+        {"version": SEARCH_FORMAT_VERSION, "shards": shards},
+    )
+    # Remove the shards of servers that are no longer configured.
+    for path in search_dir.glob("*.json"):
+        if path.name != SEARCH_MANIFEST and path.name not in {
+            shard["file"] for shard in shards.values()
+        }:
+            path.unlink()
+    logger.info(
+        f"Wrote {written} of {len(shards)} shard{'s' if len(shards) != 1 else ''} of the MCP search index of "
+        f"{entry_count} artefact{'s' if entry_count != 1 else ''} in {time.perf_counter() - start:.2f} s."
+    )
+
+
+class SearchWidgetTransform(SphinxPostTransform):
+    """
+    Replace the placeholders of the search widgets with the widgets in HTML output, and remove them otherwise.
+    """
+
+    default_priority = 400
+
+    def run(self, **kwargs) -> None:
+        for placeholder in list(self.document.findall(nodes.container)):
+            if SEARCH_ATTRIBUTE not in placeholder.attributes:
+                continue
+            if (
+                self.app.builder.name not in HTML_BUILDERS
+                or not self.config.mcp_search_index
+            ):
+                placeholder.parent.remove(placeholder)
+                continue
+            manifest = page_relative_path(
+                self.app.builder,
+                self.env.docname,
+                f"{SEARCH_DIRNAME}/{SEARCH_MANIFEST}",
+            )
+            root = page_relative_path(self.app.builder, self.env.docname, ".")
+            server = placeholder[SEARCH_ATTRIBUTE]
+            server_attribute = f' data-server="{html.escape(server)}"' if server else ""
+            placeholder.replace_self(
+                nodes.raw(
+                    "",
+                    f'<div class="mcpdocs-search-widget" data-manifest="{html.escape(manifest)}" '
+                    f'data-root="{html.escape(root)}/"{server_attribute}>'
+                    '<input type="search" placeholder="Filter MCP tools, prompts and resources" '
+                    'aria-label="Filter MCP tools, prompts and resources" autocomplete="off">'
+                    '<ul class="mcpdocs-search-results"></ul></div>',
+                    format="html",
+                )
+            )
+
+
+def add_search_script(
+    app: Sphinx,
+    pagename: str,
+    templatename: str,
+    context: dict,
+    doctree: nodes.document | None,
+) -> None:
+    """
+    Handler for the 'html-page-context' event to add the script of the search widgets to the pages that have one.
+    """
+    if app.builder.name not in HTML_BUILDERS or not app.config.mcp_search_index:
+        return
+    searches = app.env.get_domain("mcpdocs").data["searches"]
+    # All the documents are in the page of the root document of single page builds.
+    if pagename in searches or (
+        app.builder.name == "singlehtml"
+        and pagename == app.config.root_doc
+        and searches
+    ):
+        app.add_js_file("mcpdocs-search.js", defer="defer")
@@ -0,0 +1,283 @@
+from __future__ import annotations
+import asyncio
+import atexit
+import threading
+import time
+from collections.abc import Callable, Coroutine
+from typing import TYPE_CHECKING, Any
+
+from sphinx.util.logging import getLogger
+
+from sphinx_mcp.cache import server_config_digest
+from sphinx_mcp.contents import ContentOptions, read_resource_contents
+from sphinx_mcp.fetch import (
+    ARTEFACT_KINDS,
+    create_client,
+    fetch_artefacts,
+    log_retrieved_artefacts,
+)
+
+if TYPE_CHECKING:
+    from fastmcp import Client
+
+logger = getLogger(__name__)
+
+# The capability of an MCP server announcing, by notifications, changes to the list of artefacts of each kind.
+# Resource templates have no notification of their own and change along with resources.
+LIST_CHANGED_CAPABILITIES = {
+    "tools": "tools",
+    "prompts": "prompts",
+    "resources": "resources",
+    "resource_templates": "resources",
+}
+
+# The kinds of artefacts whose list changed, by the name of the notification.
+LIST_CHANGED_NOTIFICATIONS = {
+    "ToolListChangedNotification": ("tools",),
+    "PromptListChangedNotification": ("prompts",),
+    "ResourceListChangedNotification": ("resources", "resource_templates"),
+}
+
+
+class ServerSession:
+    """
+    A session with an MCP server kept open across builds, along with the artefacts last fetched over it.
+
+    The artefacts of a kind are reused as long as the server announces changes to their list, as stated by
+    its capabilities, and has not sent a `list_changed` notification for them since they were fetched.
+    """
+
+    def __init__(
+        self,
+        server_name: str,
+        server_config: dict,
+        connect_timeout: float | None,
+        request_timeout: float | None,
+    ) -> None:
+        self.server_name = server_name
+        self.client: Client = create_client(
+            server_name,
+            server_config,
+            connect_timeout,
+            request_timeout,
+            message_handler=self.handle_message,
+        )
+        self.artefacts: dict[str, list[dict]] = {}
+        # The number of changes announced for each kind, so that a change announced while the artefacts
+        # of that kind are being fetched is not missed.
+        self.changes = dict.fromkeys(ARTEFACT_KINDS, 0)
+        self.max_items: int | None = None
+        self.last_used = time.monotonic()
+
+    async def handle_message(self, message: Any) -> None:
+        """
+        Forget the artefacts whose list the server announces to have changed.
+        """
+        kinds = LIST_CHANGED_NOTIFICATIONS.get(
+            type(getattr(message, "root", None)).__name__, ()
+        )
+        for kind in kinds:
+            logger.info(
+                f"MCP server {self.server_name} announced a change to its {kind.replace('_', ' ')}."
+            )
+            self.changes[kind] += 1
+            self.artefacts.pop(kind, None)
+
+    def reusable_kinds(self) -> set[str]:
+        """
+        Find the kinds of artefacts that can be reused without fetching them again.
+        """
+        capabilities = self.client.initialize_result.capabilities
+        return {
+            kind
+            for kind in self.artefacts
+            if getattr(
+                getattr(capabilities, LIST_CHANGED_CAPABILITIES[kind]),
+                "listChanged",
+                False,
+            )
+        }
+
+    async def fetch(
+        self,
+        max_items: int,
+        stats: dict | None = None,
+        contents: ContentOptions | None = None,
+    ) -> dict:
+        """
+        Fetch the artefacts of the server over the session, reusing those that have not changed.
+
+        The contents of resources are read again every time, as they may change without notice.
+        """
+        self.last_used = time.monotonic()
+        if max_items != self.max_items:
+            self.artefacts.clear()
+            self.max_items = max_items
+        reusable = self.reusable_kinds()
+        kind_stats = {kind: {} for kind in ARTEFACT_KINDS}
+
+        async def fetch_kind(kind: str) -> list[dict]:
+            if kind in reusable:
+                artefacts = self.artefacts[kind]
+                kind_stats[kind].update(
+                    pages=0, items=len(artefacts), seconds=0.0, reused=True
+                )
+                return artefacts
+            changes = self.changes[kind]
+            artefacts = await fetch_artefacts(
+                self.client, self.server_name, kind, max_items, kind_stats[kind]
+            )
+            if self.changes[kind] == changes:
+                self.artefacts[kind] = artefacts
+            return artefacts
+
+        if reusable:
+            logger.info(
+                f"Reusing the unchanged {', '.join(kind.replace('_', ' ') for kind in ARTEFACT_KINDS if kind in reusable)} "
+                f"of MCP server {self.server_name}."
+            )
+        results = await asyncio.gather(*(fetch_kind(kind) for kind in ARTEFACT_KINDS))
+        if stats is not None:
+            stats.update(kinds=kind_stats)
+        metadata = dict(zip(ARTEFACT_KINDS, results))
+        # The contents are added to copies of the resources, so that the resources kept for the next build
+        # never hold contents read with other options.
+        metadata["resources"] = [dict(resource) for resource in metadata["resources"]]
+        if contents is not None:
+            await read_resource_contents(
+                self.client, self.server_name, metadata["resources"], contents, stats
+            )
+        log_retrieved_artefacts(self.server_name, metadata)
+        return metadata
+
+
+class SessionPool:
+    """
+    The sessions with MCP servers kept open across builds, by the digest of the configuration of each server.
+
+    All the methods must be called from the event loop on which the sessions were opened.
+    """
+
+    def __init__(self, idle_timeout: float) -> None:
+        self.idle_timeout = idle_timeout
+        self.sessions: dict[str, ServerSession] = {}
+        self.closing: set[asyncio.Task] = set()
+
+    async def fetch_server_metadata(
+        self,
+        server_name: str,
+        server_config: dict,
+        max_items: int = 0,
+        connect_timeout: float | None = None,
+        request_timeout: float | None = None,
+        stats: dict | None = None,
+        contents: ContentOptions | None = None,
+    ) -> dict:
+        """
+        Fetch the metadata of an MCP server over its open session, connecting to it first if needed.
+
+        This is a drop-in replacement for `sphinx_mcp.fetch.fetch_server_metadata`. If a session that was
+        already open fails, for instance because the server exited in the meantime, it is closed and the
+        metadata is fetched over a new session. Any other failure closes the session.
+        """
+        self.close_idle()
+        key = server_config_digest(server_config)
+        session = self.sessions.get(key)
+        if session is not None:
+            logger.info(f"Reusing the open session with MCP server {server_name}.")
+            try:
+                metadata = await session.fetch(max_items, stats, contents)
+            except asyncio.CancelledError:
+                self.close(key)
+                raise
+            except Exception as e:
+                logger.info(
+                    f"The open session with MCP server {server_name} failed, connecting again: {e}"
+                )
+                self.close(key)
+            else:
+                if stats is not None:
+                    stats.update(warm=True)
+                return metadata
+        logger.info(
+            f"Connecting to MCP server {server_name} with config: {server_config}."
+        )
+        session = ServerSession(
+            server_name, server_config, connect_timeout, request_timeout
+        )
+        self.sessions[key] = session
+        try:
+            start = time.perf_counter()
+            await session.client.__aenter__()
+            if stats is not None:
+                stats.update(connect_seconds=time.perf_counter() - start)
+            return await session.fetch(max_items, stats, contents)
+        except BaseException:
+            self.close(key)
+            raise
+
+    def close(self, key: str) -> None:
+        """
+        Close a session in the background.
+        """
+        session = self.sessions.pop(key)
+        task = asyncio.create_task(session.client.close())
+        self.closing.add(task)
+        task.add_done_callback(self.closing.discard)
+
+    def close_idle(self) -> None:
+        """
+        Close the sessions that have not been used for `idle_timeout` seconds.
+        """
+        now = time.monotonic()
+        for key, session in list(self.sessions.items()):
+            if now - session.last_used > self.idle_timeout:
+                logger.info(
+                    f"Closing the idle session with MCP server {session.server_name}."
+                )
+                self.close(key)
+
+    async def close_all(self) -> None:
+        """
+        Close all the sessions and wait for them to be closed.
+        """
+        for key in list(self.sessions):
+            self.close(key)
+        await asyncio.gather(*self.closing, return_exceptions=True)
+
+
+# The session pool of this process and the event loop it runs on, in a background thread, once created.
+_process_pool: SessionPool | None = None
+_process_loop: asyncio.AbstractEventLoop | None = None
+
+
+def run_with_process_sessions(
+    coroutine_function: Callable[[SessionPool], Coroutine], idle_timeout: float
+) -> Any:
+    """
+    Run `coroutine_function(pool)` with the session pool kept open by this process and return its result.
+
+    The sessions live on an event loop running in a background thread for as long as the process, so that
+    successive builds in the same process, for instance through the Sphinx API, reuse them.
+    """
+    global _process_pool, _process_loop
+    if _process_pool is None:
+        _process_loop = asyncio.new_event_loop()
+        threading.Thread(
+            target=_process_loop.run_forever, name="sphinx-mcp-sessions", daemon=True
+        ).start()
+        _process_pool = SessionPool(idle_timeout)
+        atexit.register(_close_process_sessions)
+    _process_pool.idle_timeout = idle_timeout
+    return asyncio.run_coroutine_threadsafe(
+        coroutine_function(_process_pool), _process_loop
+    ).result()
+
+
+def _close_process_sessions() -> None:
+    """
+    Close the sessions kept open by this process, so that the servers exit along with it.
+    """
+    asyncio.run_coroutine_threadsafe(_process_pool.close_all(), _process_loop).result(
+        timeout=30
+    )
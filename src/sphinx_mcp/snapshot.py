@@ -0,0 +1,79 @@
+from __future__ import annotations
+import gzip
+import json
+import os
+import time
+from pathlib import Path
+
+from sphinx_mcp.cache import check_artefacts, validate_artefacts
+from sphinx_mcp.fetch import ARTEFACT_KINDS
+
+# Bump this whenever the layout of the snapshot files changes.
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+def _open_snapshot(path: Path, mode: str, compressed: bool):
+    """
+    Open a snapshot file, transparently compressing it if required.
+    """
+    if compressed:
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return path.open(mode, encoding="utf-8")
+
+
+def write_snapshot(path: Path, metadata: dict) -> None:
+    """
+    Write the metadata of MCP servers, as fetched by `fetch_all_metadata`, to a snapshot file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    # Snapshots are gzip compressed if their name ends with '.gz'.
+    with _open_snapshot(temp_path, "w", path.suffix == ".gz") as f:
+        json.dump(
+            {
+                "version": SNAPSHOT_FORMAT_VERSION,
+                "created_at": time.time(),
+                "servers": metadata,
+            },
+            f,
+            separators=(",", ":"),
+        )
+    os.replace(temp_path, path)
+
+
+def read_snapshot(path: Path, validate: bool = True) -> dict:
+    """
+    Read and validate a snapshot file of MCP server metadata.
+
+    If `validate` is false, the artefacts are only checked for structure rather than validated against the
+    MCP schema, which is much faster. Raises a `RuntimeError` if the file is not a valid snapshot.
+    """
+    try:
+        with _open_snapshot(path, "r", path.suffix == ".gz") as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError) as e:
+        raise RuntimeError(f"Unable to read MCP metadata snapshot {path}: {e}") from e
+    if not isinstance(snapshot, dict) or "servers" not in snapshot:
+        raise RuntimeError(f"{path} is not an MCP metadata snapshot.")
+    if snapshot.get("version") != SNAPSHOT_FORMAT_VERSION:
+        raise RuntimeError(
+            f"Unsupported MCP metadata snapshot version {snapshot.get('version')} in {path}, expected {SNAPSHOT_FORMAT_VERSION}."
+        )
+    metadata = {}
+    for server_name, artefacts in snapshot["servers"].items():
+        unknown_kinds = artefacts.keys() - set(ARTEFACT_KINDS)
+        if unknown_kinds:
+            raise RuntimeError(
+                f"Unknown artefact kinds {', '.join(sorted(unknown_kinds))} for MCP server '{server_name}' in {path}."
+            )
+        try:
+            metadata[server_name] = (
+                validate_artefacts(artefacts)
+                if validate
+                else check_artefacts(artefacts)
+            )
+        except ValueError as e:
+            raise RuntimeError(
+                f"Invalid metadata for MCP server '{server_name}' in {path}: {e}"
+            ) from e
+    return metadata
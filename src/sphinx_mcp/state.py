@@ -0,0 +1,185 @@
+from __future__ import annotations
+import os
+
+from sphinx_mcp.artefacts import MCPArtefact, artefacts_digest
+from sphinx_mcp.fetch import ARTEFACT_KINDS
+
+
+class MCPState:
+    """
+    The state of the extension, kept in the build environment as `env.mcp`.
+
+    The artefacts are loaded again at 'builder-inited' on every build, so they are never pickled. Parallel
+    readers are forked after 'builder-inited' and inherit them without a copy. When a parallel reader sends
+    its environment back, only the usage and timings recorded by that reader are pickled. When the environment
+    is saved, the hashes needed to detect changes in the next build are pickled along with the usage of all
+    documents, while the timings and loading statistics, which only describe the current build, are not.
+    """
+
+    __slots__ = (
+        "artefacts",
+        "index",
+        "hashes",
+        "digests",
+        "changed",
+        "usage",
+        "timings",
+        "load_stats",
+        "owner_pid",
+        "noted_docs",
+    )
+
+    def __init__(self) -> None:
+        # kind -> server -> [MCPArtefact, ...], in the order listed by the server
+        self.artefacts: dict[str, dict[str, list[MCPArtefact]]] = {
+            kind: {} for kind in ARTEFACT_KINDS
+        }
+        # kind -> server -> name -> MCPArtefact
+        self.index: dict[str, dict[str, dict[str, MCPArtefact]]] = {
+            kind: {} for kind in ARTEFACT_KINDS
+        }
+        # (kind, server) -> hash of all the artefacts of that kind
+        self.hashes: dict[tuple[str, str], str] = {}
+        # (kind, server) -> name -> hash of the artefact
+        self.digests: dict[tuple[str, str], dict[str, str]] = {}
+        # (kind, server, name or None) for the artefacts changed since the last build
+        self.changed: set[tuple[str, str, str | None]] = set()
+        # docname -> {(kind, server or None, name or None), ...}
+        self.usage: dict[str, set[tuple[str, str | None, str | None]]] = {}
+        # docname -> directive name -> [number of runs, seconds], for the documents read in this build
+        self.timings: dict[str, dict[str, list]] = {}
+        # Statistics about loading the artefacts in this build, see `builder_inited_handler`.
+        self.load_stats: dict = {}
+        # The process that loaded the artefacts, and the documents read in this process.
+        self.owner_pid = os.getpid()
+        self.noted_docs: set[str] = set()
+
+    def __getstate__(self) -> dict:
+        if os.getpid() != self.owner_pid:
+            # A parallel reader sending its results back to the main process.
+            return {
+                "usage": {
+                    docname: self.usage[docname]
+                    for docname in self.noted_docs
+                    if docname in self.usage
+                },
+                "timings": {
+                    docname: self.timings[docname]
+                    for docname in self.noted_docs
+                    if docname in self.timings
+                },
+            }
+        return {"hashes": self.hashes, "digests": self.digests, "usage": self.usage}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__()
+        self.hashes = state.get("hashes", {})
+        self.digests = state.get("digests", {})
+        self.usage = state.get("usage", {})
+        self.timings = state.get("timings", {})
+
+    def clear_artefacts(self) -> None:
+        """
+        Forget the loaded artefacts, before loading them again for a new build.
+        """
+        self.artefacts = {kind: {} for kind in ARTEFACT_KINDS}
+        self.index = {kind: {} for kind in ARTEFACT_KINDS}
+        self.changed = set()
+        self.timings = {}
+        self.load_stats = {}
+        self.owner_pid = os.getpid()
+        self.noted_docs = set()
+
+    def set_artefacts(
+        self, kind: str, server: str, artefacts: list[MCPArtefact], index: dict
+    ) -> None:
+        """
+        Set the artefacts of one kind of a server and their index by name.
+        """
+        self.artefacts[kind][server] = artefacts
+        self.index[kind][server] = index
+
+    def update_hashes(self) -> None:
+        """
+        Hash the loaded MCP artefacts per server and kind, and note which of them changed since the last build.
+
+        Changes are noted as `(kind, server, None)` for a server and kind, and as `(kind, server, name)`
+        for each artefact that was added, removed or modified.
+        """
+        previous_hashes = self.hashes
+        previous_digests = self.digests
+        self.hashes = {}
+        self.digests = {}
+        for kind in ARTEFACT_KINDS:
+            for server, artefacts in self.artefacts[kind].items():
+                self.hashes[(kind, server)] = artefacts_digest(artefacts)
+                self.digests[(kind, server)] = {
+                    name: artefact.digest
+                    for name, artefact in self.index[kind][server].items()
+                }
+        self.changed = set()
+        for key in previous_hashes.keys() | self.hashes.keys():
+            if previous_hashes.get(key) == self.hashes.get(key):
+                continue
+            kind, server = key
+            self.changed.add((kind, server, None))
+            previous_names = previous_digests.get(key, {})
+            current_names = self.digests.get(key, {})
+            self.changed.update(
+                (kind, server, name)
+                for name in previous_names.keys() | current_names.keys()
+                if previous_names.get(name) != current_names.get(name)
+            )
+
+    def note_usage(
+        self, docname: str, kind: str, server: str | None, name: str | None
+    ) -> None:
+        """
+        Record that a document documents MCP artefacts of the given kind.
+        """
+        self.usage.setdefault(docname, set()).add((kind, server, name))
+        self.noted_docs.add(docname)
+
+    def note_timing(self, docname: str, directive: str, seconds: float) -> None:
+        """
+        Record the time taken by one run of a directive in a document.
+        """
+        timing = self.timings.setdefault(docname, {}).setdefault(directive, [0, 0.0])
+        timing[0] += 1
+        timing[1] += seconds
+        self.noted_docs.add(docname)
+
+    def outdated_docs(self) -> list[str]:
+        """
+        List the documents that document MCP artefacts changed since the last build.
+        """
+        if not self.changed:
+            return []
+        changed_kinds = {kind for kind, _, name in self.changed if name is None}
+        return [
+            docname
+            for docname, usages in self.usage.items()
+            if any(
+                (server is None and kind in changed_kinds)
+                or (kind, server, name) in self.changed
+                for kind, server, name in usages
+            )
+        ]
+
+    def purge_doc(self, docname: str) -> None:
+        """
+        Forget the MCP artefacts documented by a document.
+        """
+        self.usage.pop(docname, None)
+        self.timings.pop(docname, None)
+        self.noted_docs.discard(docname)
+
+    def merge_usage(self, docnames: set[str], other: MCPState) -> None:
+        """
+        Merge the usage and timings recorded by a parallel reader for the given documents.
+        """
+        for docname in docnames:
+            if docname in other.usage:
+                self.usage[docname] = other.usage[docname]
+            if docname in other.timings:
+                self.timings[docname] = other.timings[docname]
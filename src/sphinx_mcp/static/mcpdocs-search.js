@@ -0,0 +1,147 @@
+// Filter the MCP artefacts with the search index written by `sphinx_mcp.search`, as the query is typed.
+
+// Keep these in line with `TOKEN_PATTERN` and `STOP_WORDS` in `search.py`.
+const TOKEN_PATTERN = /[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+/g;
+const STOP_WORDS = new Set(
+  "a an and are as at be by for from in into is it its of on or that the this to was with".split(" "),
+);
+const SEARCH_FORMAT_VERSION = 1;
+const MAX_RESULTS = 50;
+
+function tokenize(text) {
+  const tokens = (text.match(TOKEN_PATTERN) || []).map((token) => token.toLowerCase());
+  return [...new Set(tokens)].filter((token) => !STOP_WORDS.has(token));
+}
+
+// The index of the first token of a shard that is not before a prefix.
+function lowerBound(tokens, prefix) {
+  let low = 0;
+  let high = tokens.length;
+  while (low < high) {
+    const middle = (low + high) >> 1;
+    if (tokens[middle] < prefix) {
+      low = middle + 1;
+    } else {
+      high = middle;
+    }
+  }
+  return low;
+}
+
+// The entries of a shard matching all the terms, each as a prefix of a token, the last one being typed.
+function matchShard(shard, terms) {
+  let matches = null;
+  for (const term of terms) {
+    const entries = new Set();
+    for (let i = lowerBound(shard.tokens, term); i < shard.tokens.length && shard.tokens[i].startsWith(term); i++) {
+      shard.postings[i].forEach((entry) => entries.add(entry));
+    }
+    matches = matches === null ? entries : new Set([...matches].filter((entry) => entries.has(entry)));
+    if (matches.size === 0) {
+      break;
+    }
+  }
+  return [...(matches || [])].map((entry) => shard.entries[entry]);
+}
+
+const shardCache = new Map();
+
+async function loadJSON(url) {
+  if (!shardCache.has(url)) {
+    shardCache.set(
+      url,
+      fetch(url).then((response) => {
+        if (!response.ok) {
+          throw new Error(`${response.status} ${response.statusText}`);
+        }
+        return response.json();
+      }),
+    );
+  }
+  try {
+    return await shardCache.get(url);
+  } catch (error) {
+    shardCache.delete(url);
+    throw error;
+  }
+}
+
+async function loadShards(widget) {
+  const manifestURL = new URL(widget.dataset.manifest, document.baseURI);
+  const manifest = await loadJSON(manifestURL.href);
+  if (manifest.version !== SEARCH_FORMAT_VERSION) {
+    throw new Error(`unsupported search index version ${manifest.version}`);
+  }
+  const servers = widget.dataset.server ? [widget.dataset.server] : Object.keys(manifest.shards);
+  return Promise.all(
+    servers
+      .filter((server) => server in manifest.shards)
+      .map((server) => loadJSON(new URL(manifest.shards[server].file, manifestURL).href)),
+  );
+}
+
+function renderResults(widget, list, shards, query) {
+  const terms = tokenize(query);
+  const needle = query.trim().toLowerCase();
+  list.replaceChildren();
+  if (terms.length === 0) {
+    return;
+  }
+  const results = [];
+  for (const shard of shards) {
+    for (const [kind, name, uri, summary] of matchShard(shard, terms)) {
+      results.push({ kind: shard.kinds[kind], server: shard.server, name, uri, summary });
+    }
+  }
+  // Artefacts whose name contains the query come first.
+  const rank = (result) => (result.name.toLowerCase().includes(needle) ? 0 : 1);
+  results.sort((a, b) => rank(a) - rank(b) || a.name.localeCompare(b.name));
+  for (const result of results.slice(0, MAX_RESULTS)) {
+    const item = document.createElement("li");
+    const kind = document.createElement("span");
+    kind.className = "mcpdocs-search-kind";
+    kind.textContent = result.kind.replace("_", " ").replace(/s$/, "");
+    const name = document.createElement(result.uri === null ? "span" : "a");
+    name.className = "mcpdocs-search-name";
+    name.textContent = widget.dataset.server ? result.name : `${result.server}::${result.name}`;
+    if (result.uri !== null) {
+      name.href = widget.dataset.root + result.uri;
+    }
+    item.append(kind, " ", name);
+    if (result.summary) {
+      const summary = document.createElement("span");
+      summary.className = "mcpdocs-search-summary";
+      summary.textContent = result.summary;
+      item.append(" ", summary);
+    }
+    list.append(item);
+  }
+  if (results.length > MAX_RESULTS) {
+    const more = document.createElement("li");
+    more.textContent = `${results.length - MAX_RESULTS} more, refine the query to see them.`;
+    list.append(more);
+  }
+}
+
+document.addEventListener("DOMContentLoaded", () => {
+  for (const widget of document.querySelectorAll(".mcpdocs-search-widget")) {
+    const input = widget.querySelector("input");
+    const list = widget.querySelector(".mcpdocs-search-results");
+    let shards = null;
+    input.addEventListener("input", async () => {
+      const query = input.value;
+      try {
+        // The index is only loaded once something is typed.
+        shards = shards || (await loadShards(widget));
+      } catch (error) {
+        list.replaceChildren(document.createElement("li"));
+        list.firstChild.textContent = `Unable to load the search index: ${error}`;
+        return;
+      }
+      // Results of an earlier query may arrive after those of a later one.
+      if (query === input.value) {
+        renderResults(widget, list, shards, query);
+      }
+    });
+  }
+});
@@ -0,0 +1,29 @@
+// Load and pretty-print the JSON values of MCP artefacts written to separate files, when they are expanded.
+document.addEventListener(
+  "toggle",
+  async (event) => {
+    const details = event.target;
+    if (
+      !(details instanceof HTMLDetailsElement) ||
+      !details.classList.contains("mcpdocs-external-json") ||
+      !details.open ||
+      details.dataset.loaded
+    ) {
+      return;
+    }
+    details.dataset.loaded = "true";
+    const pre = details.querySelector("pre");
+    try {
+      const response = await fetch(details.dataset.src);
+      if (!response.ok) {
+        throw new Error(`${response.status} ${response.statusText}`);
+      }
+      pre.textContent = JSON.stringify(await response.json(), null, 2);
+    } catch (error) {
+      pre.textContent = `Unable to load ${details.dataset.src}: ${error}`;
+      delete details.dataset.loaded;
+    }
+  },
+  // The toggle event does not bubble.
+  true,
+);
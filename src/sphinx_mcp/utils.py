@@ -1,3 +1,10 @@
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from sphinx.environment import BuildEnvironment
+
+
 def check_server_filter_for_artefacts(arguments: list, artefacts: dict) -> bool:
     """
     Check if the provided server name exists in the artefacts dictionary.
@@ -6,3 +13,73 @@ def check_server_filter_for_artefacts(arguments: list, artefacts: dict) -> bool:
         raise RuntimeError(
             f"No MCP server specification exists by the name '{arguments[0]}'."
         )
+
+
+def format_size(size: int) -> str:
+    """
+    Format a number of bytes for humans.
+    """
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024 or unit == "MiB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def note_artefact_usage(
+    env: BuildEnvironment, kind: str, server: str | None, name: str | None = None
+) -> None:
+    """
+    Record that the current document documents MCP artefacts of the given kind.
+
+    The server is `None` if the artefacts of all the servers are listed, and the name is
+    `None` unless a single artefact is documented.
+    """
+    env.mcp.note_usage(env.docname, kind, server, name)
+
+
+@contextmanager
+def timed_directive(env: BuildEnvironment, directive_name: str) -> Iterator[None]:
+    """
+    Record the time taken by the run of a directive in the current document.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        env.mcp.note_timing(env.docname, directive_name, time.perf_counter() - start)
+
+
+def find_artefact(index: dict, kind: str, target: str) -> tuple:
+    """
+    Look up a single MCP artefact given as `server::name`, or as `name` if it is unique across servers.
+
+    Names may contain `::` themselves, e.g., the tools of gateway servers, so the server is found by matching the
+    start of the target against the names of the servers rather than by splitting the target.
+    Returns the name of the server and the artefact.
+    """
+    label = kind.removesuffix("s").replace("_", " ")
+    prefixed = [
+        (server, target.removeprefix(f"{server}::"))
+        for server in index
+        if target.startswith(f"{server}::")
+    ]
+    for server, name in prefixed:
+        if name in index[server]:
+            return server, index[server][name]
+    servers = [server for server, artefacts in index.items() if target in artefacts]
+    if len(servers) == 1:
+        return servers[0], index[servers[0]][target]
+    elif len(servers) > 1:
+        raise RuntimeError(
+            f"The MCP {label} name '{target}' is ambiguous, it exists in the servers {', '.join(servers)}. Use 'server::{target}' instead."
+        )
+    if prefixed:
+        server, name = prefixed[0]
+        raise RuntimeError(
+            f"No MCP {label} named '{name}' exists in the server '{server}'."
+        )
+    if "::" in target:
+        raise RuntimeError(
+            f"No MCP server specification exists by the name '{target.partition('::')[0]}'."
+        )
+    raise RuntimeError(f"No MCP {label} named '{target}' exists.")
@@ -0,0 +1,199 @@
+"""
+Benchmark full Sphinx builds of a generated project documenting a synthetic MCP server at several scales.
+
+The synthetic server, see `tests.benchmarks.synthetic_server`, runs locally over stdio, so that neither the network
+nor npx is needed. For each scale, the total number of artefacts, a fresh HTML build is run and the following are
+reported: the wall-clock time of the build, the time taken to fetch the metadata and to run the `mcpdocs` directives,
+as recorded in the build report of the extension, the size of the pickled environment, the peak resident set size
+of the build process and the size of the output. Run it from the root of the repository as
+
+    python -m tests.benchmarks.bench_build --scales 10 1000 20000
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPOSITORY_ROOT = Path(__file__).resolve().parents[2]
+
+REPORT_NAME = "mcp-report.json"
+
+# The directive enumerating the artefacts of each kind, one page per kind.
+DIRECTIVES = {
+    "tools": "mcpdocs:tools",
+    "prompts": "mcpdocs:prompts",
+    "resources": "mcpdocs:resources",
+    "resource_templates": "mcpdocs:resource_templates",
+}
+
+
+def split_artefacts(total: int) -> dict:
+    """
+    Split a total number of artefacts between the kinds, half of them being tools.
+    """
+    others = total // 2 // 3
+    return {
+        "tools": total - 3 * others,
+        "prompts": others,
+        "resources": others,
+        "resource_templates": others,
+    }
+
+
+def write_project(
+    source_dir: Path, counts: dict, schema_depth: int, page_size: int
+) -> None:
+    """
+    Write a Sphinx project documenting all the artefacts of a synthetic MCP server, with one page per kind.
+    """
+    server_config = {
+        "command": sys.executable,
+        "args": [
+            "-m",
+            "tests.benchmarks.synthetic_server",
+            "--tools",
+            str(counts["tools"]),
+            "--prompts",
+            str(counts["prompts"]),
+            "--resources",
+            str(counts["resources"]),
+            "--resource-templates",
+            str(counts["resource_templates"]),
+            "--schema-depth",
+            str(schema_depth),
+            "--page-size",
+            str(page_size),
+        ],
+        "cwd": str(REPOSITORY_ROOT),
+    }
+    (source_dir / "conf.py").write_text(
+        "\n".join(
+            [
+                'extensions = ["sphinx_mcp"]',
+                f"mcp_config = {{'mcpServers': {{'synthetic': {server_config!r}}}}}",
+                # Fetch the metadata in every build.
+                "mcp_cache_ttl = 0",
+                f"mcp_report = {REPORT_NAME!r}",
+                "",
+            ]
+        ),
+        encoding="utf-8",
+    )
+    for kind, directive in DIRECTIVES.items():
+        title = kind.replace("_", " ").capitalize()
+        (source_dir / f"{kind}.rst").write_text(
+            f"{title}\n{'=' * len(title)}\n\n.. {directive}::\n", encoding="utf-8"
+        )
+    (source_dir / "index.rst").write_text(
+        "\n".join(
+            ["Synthetic MCP server", "=" * 20, "", ".. toctree::", ""]
+            + [f"   {kind}" for kind in DIRECTIVES]
+        ),
+        encoding="utf-8",
+    )
+
+
+def directory_size(path: Path) -> int:
+    """
+    Compute the total size of the files in a directory tree.
+    """
+    return sum(file.stat().st_size for file in path.rglob("*") if file.is_file())
+
+
+def run_build(source_dir: Path, output_dir: Path, doctree_dir: Path) -> dict:
+    """
+    Run a fresh HTML build of the project and measure it.
+    """
+    with tempfile.TemporaryFile() as stderr:
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "sphinx",
+                "-b",
+                "html",
+                "-E",
+                "-q",
+                "-d",
+                str(doctree_dir),
+                str(source_dir),
+                str(output_dir),
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=stderr,
+        )
+        # Unlike Popen.wait, os.wait4 also returns the resource usage of the build process alone.
+        _, status, rusage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+        elapsed = time.perf_counter() - start
+        if process.returncode != 0:
+            stderr.seek(0)
+            raise RuntimeError(
+                f"The build failed:\n{stderr.read().decode('utf-8', 'replace')}"
+            )
+    report = json.loads((output_dir / REPORT_NAME).read_text(encoding="utf-8"))
+    return {
+        "build_seconds": elapsed,
+        "fetch_seconds": report["load"]["servers"]["synthetic"]["seconds"],
+        "render_seconds": report["directives_seconds"],
+        "env_pickle_bytes": (doctree_dir / "environment.pickle").stat().st_size,
+        # ru_maxrss is in kibibytes on Linux but in bytes on macOS.
+        "peak_rss_bytes": rusage.ru_maxrss * (1 if sys.platform == "darwin" else 1024),
+        "output_bytes": directory_size(output_dir),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--scales",
+        type=int,
+        nargs="+",
+        default=[10, 1000, 20000],
+        help="Total numbers of artefacts of the synthetic server.",
+    )
+    parser.add_argument("--schema-depth", type=int, default=3)
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=100,
+        help="Artefacts per page, 0 for no paging.",
+    )
+    parser.add_argument(
+        "--json", type=Path, help="Also write the results to this JSON file."
+    )
+    args = parser.parse_args()
+
+    results = []
+    print(
+        f"{'artefacts':>10} {'build s':>9} {'fetch s':>9} {'render s':>9} "
+        f"{'env MiB':>9} {'RSS MiB':>9} {'out MiB':>9}"
+    )
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source_dir = Path(temp_dir) / "source"
+            source_dir.mkdir()
+            counts = split_artefacts(scale)
+            write_project(source_dir, counts, args.schema_depth, args.page_size)
+            result = run_build(
+                source_dir, Path(temp_dir) / "html", Path(temp_dir) / "doctrees"
+            )
+        results.append({"artefacts": scale, **counts, **result})
+        print(
+            f"{scale:>10} {result['build_seconds']:>9.2f} {result['fetch_seconds']:>9.2f} "
+            f"{result['render_seconds']:>9.2f} {result['env_pickle_bytes'] / 2**20:>9.2f} "
+            f"{result['peak_rss_bytes'] / 2**20:>9.1f} {result['output_bytes'] / 2**20:>9.2f}"
+        )
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmark the wall-clock scaling of parallel builds, i.e., `sphinx-build -j N`, of a synthetic site with many
+`mcpdocs` directives.
+
+The metadata of the synthetic MCP servers is loaded from a generated snapshot, so that no MCP server is needed
+and only reading and writing the documents is measured. Run it from the root of the repository as
+
+    python -m tests.benchmarks.bench_parallel --servers 4 --tools 500 --pages 400 --jobs 1 2 4 8
+"""
+
+from __future__ import annotations
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sphinx_mcp.snapshot import write_snapshot
+from tests.benchmarks.synthetic import synthetic_artefacts
+
+
+def synthetic_metadata(servers: int, tools: int, schema_depth: int) -> dict:
+    """
+    Generate the stored metadata of synthetic MCP servers with `tools` tools each.
+    """
+    return {
+        f"server{s}": synthetic_artefacts(tools, 0, 0, 0, schema_depth)
+        for s in range(servers)
+    }
+
+
+def write_site(source_dir: Path, metadata: dict, pages: int) -> None:
+    """
+    Write a Sphinx project documenting each synthetic tool on its own, spread over `pages` documents.
+    """
+    write_snapshot(source_dir / "snapshot.json", metadata)
+    (source_dir / "conf.py").write_text(
+        'extensions = ["sphinx_mcp"]\nmcp_snapshot = "snapshot.json"\n',
+        encoding="utf-8",
+    )
+    targets = [
+        f"{server}::{tool['name']}"
+        for server, artefacts in metadata.items()
+        for tool in artefacts["tools"]
+    ]
+    docnames = [f"page{p}" for p in range(pages)]
+    for p, docname in enumerate(docnames):
+        lines = [f"Page {p}", "=" * 20, ""]
+        for target in targets[p::pages]:
+            lines += [target, "-" * 40, "", f".. mcpdocs:tool:: {target}", ""]
+            # Cross-reference a tool documented on another page.
+            other = targets[(targets.index(target) + 1) % len(targets)]
+            lines += [f"See also :mcpdocs:tool:`{other}`.", ""]
+        (source_dir / f"{docname}.rst").write_text("\n".join(lines), encoding="utf-8")
+    (source_dir / "index.rst").write_text(
+        "\n".join(
+            ["Synthetic MCP servers", "=" * 30, "", ".. toctree::", ""]
+            + [f"   {docname}" for docname in docnames]
+        ),
+        encoding="utf-8",
+    )
+
+
+def time_build(source_dir: Path, output_dir: Path, jobs: int) -> float:
+    """
+    Time a fresh HTML build of the project with the given number of processes.
+    """
+    start = time.perf_counter()
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "sphinx",
+            "-b",
+            "html",
+            "-E",
+            "-q",
+            "-j",
+            str(jobs),
+            str(source_dir),
+            str(output_dir),
+        ],
+        check=True,
+    )
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--servers", type=int, default=4)
+    parser.add_argument("--tools", type=int, default=500, help="Tools per server.")
+    parser.add_argument("--schema-depth", type=int, default=3)
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument(
+        "--jobs", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1]
+    )
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        source_dir = Path(temp_dir) / "source"
+        source_dir.mkdir()
+        write_site(
+            source_dir,
+            synthetic_metadata(args.servers, args.tools, args.schema_depth),
+            args.pages,
+        )
+        print(
+            f"{args.servers} servers x {args.tools} tools on {args.pages} pages, "
+            f"{os.cpu_count()} CPUs"
+        )
+        print(f"{'jobs':>6} {'seconds':>10} {'speedup':>10}")
+        baseline = None
+        for jobs in sorted(set(args.jobs)):
+            elapsed = min(
+                time_build(source_dir, Path(temp_dir) / f"build-{jobs}-{i}", jobs)
+                for i in range(args.repeat)
+            )
+            baseline = baseline or elapsed
+            print(f"{jobs:>6} {elapsed:>10.2f} {baseline / elapsed:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
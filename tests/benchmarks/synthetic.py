@@ -0,0 +1,80 @@
+"""
+Generators of synthetic MCP artefacts, stored as JSON-serializable dictionaries, shared by the benchmarks.
+"""
+
+from __future__ import annotations
+
+
+def synthetic_schema(seed: int, depth: int, width: int) -> dict:
+    """
+    Generate a JSON schema of the given depth, with `width` properties per object.
+    """
+    if depth == 0:
+        return {"type": "string", "description": f"Leaf property {seed}."}
+    return {
+        "type": "object",
+        "properties": {
+            f"property_{seed}_{i}": synthetic_schema(seed * width + i, depth - 1, width)
+            for i in range(width)
+        },
+        "required": [f"property_{seed}_0"],
+    }
+
+
+def synthetic_artefacts(
+    tools: int,
+    prompts: int,
+    resources: int,
+    resource_templates: int,
+    schema_depth: int,
+) -> dict:
+    """
+    Generate the given numbers of tools, prompts, resources and resource templates of a synthetic MCP server.
+
+    The input schemas of the tools are `schema_depth` levels deep, with 4 properties per object.
+    """
+    return {
+        "tools": [
+            {
+                "name": f"tool_{t}",
+                "description": f"Synthetic tool {t}.",
+                "inputSchema": synthetic_schema(t, schema_depth, 4),
+                "outputSchema": synthetic_schema(t + 1, 1, 4),
+                "annotations": {"readOnlyHint": t % 2 == 0},
+            }
+            for t in range(tools)
+        ],
+        "prompts": [
+            {
+                "name": f"prompt_{p}",
+                "description": f"Synthetic prompt {p}.",
+                "arguments": [
+                    {
+                        "name": f"argument_{a}",
+                        "description": f"Argument {a} of prompt {p}.",
+                        "required": a == 0,
+                    }
+                    for a in range(3)
+                ],
+            }
+            for p in range(prompts)
+        ],
+        "resources": [
+            {
+                "uri": f"synthetic://resources/{r}",
+                "name": f"resource_{r}",
+                "description": f"Synthetic resource {r}.",
+                "mimeType": "text/plain",
+            }
+            for r in range(resources)
+        ],
+        "resource_templates": [
+            {
+                "uriTemplate": f"synthetic://templates/{t}/{{item}}",
+                "name": f"resource_template_{t}",
+                "description": f"Synthetic resource template {t}.",
+                "mimeType": "application/json",
+            }
+            for t in range(resource_templates)
+        ],
+    }
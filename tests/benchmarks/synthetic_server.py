@@ -0,0 +1,101 @@
+"""
+A synthetic MCP server exposing a configurable number of tools, prompts, resources and resource templates over stdio.
+
+It is built on the low-level server of the MCP SDK, so that the artefacts are listed with exactly the generated
+schemas and page by page, like large real servers do. Run it from the root of the repository as
+
+    python -m tests.benchmarks.synthetic_server --tools 1000 --schema-depth 3 --page-size 100
+"""
+
+from __future__ import annotations
+import argparse
+import asyncio
+
+import mcp.types as types
+from mcp.server.lowlevel import Server
+from mcp.server.stdio import stdio_server
+
+from tests.benchmarks.synthetic import synthetic_artefacts
+
+# The request, result and model of each kind of artefacts, and the attribute holding them in a result.
+LIST_REQUESTS = {
+    "tools": (types.ListToolsRequest, types.ListToolsResult, types.Tool, "tools"),
+    "prompts": (
+        types.ListPromptsRequest,
+        types.ListPromptsResult,
+        types.Prompt,
+        "prompts",
+    ),
+    "resources": (
+        types.ListResourcesRequest,
+        types.ListResourcesResult,
+        types.Resource,
+        "resources",
+    ),
+    "resource_templates": (
+        types.ListResourceTemplatesRequest,
+        types.ListResourceTemplatesResult,
+        types.ResourceTemplate,
+        "resourceTemplates",
+    ),
+}
+
+
+def create_server(artefacts: dict, page_size: int) -> Server:
+    """
+    Create a server listing the given artefacts, `page_size` at a time, or all at once if it is 0.
+    """
+    server = Server("synthetic")
+    for kind, (request_type, result_type, model, attribute) in LIST_REQUESTS.items():
+        items = [model.model_validate(artefact) for artefact in artefacts[kind]]
+
+        async def list_page(
+            request, items=items, result_type=result_type, attribute=attribute
+        ):
+            cursor = request.params.cursor if request.params else None
+            start = int(cursor or 0)
+            end = len(items) if page_size == 0 else start + page_size
+            return types.ServerResult(
+                result_type(
+                    **{attribute: items[start:end]},
+                    nextCursor=str(end) if end < len(items) else None,
+                )
+            )
+
+        server.request_handlers[request_type] = list_page
+    return server
+
+
+async def serve(server: Server) -> None:
+    """
+    Serve over stdio until the client disconnects.
+    """
+    async with stdio_server() as (read_stream, write_stream):
+        await server.run(
+            read_stream, write_stream, server.create_initialization_options()
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tools", type=int, default=10)
+    parser.add_argument("--prompts", type=int, default=0)
+    parser.add_argument("--resources", type=int, default=0)
+    parser.add_argument("--resource-templates", type=int, default=0)
+    parser.add_argument("--schema-depth", type=int, default=2)
+    parser.add_argument(
+        "--page-size", type=int, default=0, help="Artefacts per page, 0 for no paging."
+    )
+    args = parser.parse_args()
+    artefacts = synthetic_artefacts(
+        args.tools,
+        args.prompts,
+        args.resources,
+        args.resource_templates,
+        args.schema_depth,
+    )
+    asyncio.run(serve(create_server(artefacts, args.page_size)))
+
+
+if __name__ == "__main__":
+    main()
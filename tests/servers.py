@@ -0,0 +1,27 @@
+"""
+Small MCP servers run in-process by the tests, through configurations such as `{"object": "tests.servers:demo"}`.
+"""
+
+from __future__ import annotations
+
+from fastmcp import FastMCP
+
+demo = FastMCP("demo")
+
+
+@demo.tool()
+def greet(name: str) -> str:
+    """Greet someone by name."""
+    return f"Hello, {name}!"
+
+
+@demo.tool()
+def add(a: int, b: int) -> int:
+    """Add two numbers."""
+    return a + b
+
+
+@demo.prompt()
+def code(language: str) -> str:
+    """Ask for code in a programming language."""
+    return f"Write the code in {language}."
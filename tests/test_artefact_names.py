@@ -0,0 +1,100 @@
+"""
+Tests for looking up MCP artefacts whose names contain `::`, such as the tools of gateway servers.
+"""
+
+from __future__ import annotations
+import io
+from pathlib import Path
+
+import pytest
+from sphinx.application import Sphinx
+
+from sphinx_mcp.snapshot import write_snapshot
+from sphinx_mcp.utils import find_artefact
+
+# Stand-ins for the records of the artefacts, which the lookup returns as they are.
+INDEX = {
+    "demo": {"github::create_issue": "demo gateway tool", "greet": "demo greet"},
+    "other": {"greet": "other greet"},
+    "gateway": {"demo::greet": "gateway tool named after a server"},
+}
+
+
+@pytest.mark.parametrize(
+    "target, expected",
+    [
+        ("demo::github::create_issue", ("demo", "demo gateway tool")),
+        ("github::create_issue", ("demo", "demo gateway tool")),
+        ("other::greet", ("other", "other greet")),
+        # A server prefix takes precedence over a name that contains `::`.
+        ("demo::greet", ("demo", "demo greet")),
+        ("gateway::demo::greet", ("gateway", "gateway tool named after a server")),
+    ],
+)
+def test_find_artefact(target: str, expected: tuple) -> None:
+    assert find_artefact(INDEX, "tools", target) == expected
+
+
+@pytest.mark.parametrize(
+    "target, message",
+    [
+        ("greet", "ambiguous"),
+        ("demo::github::delete_repo", "No MCP tool named 'github::delete_repo'"),
+        ("nowhere::greet", "No MCP server specification exists by the name 'nowhere'"),
+        ("missing", "No MCP tool named 'missing' exists"),
+    ],
+)
+def test_find_artefact_errors(target: str, message: str) -> None:
+    with pytest.raises(RuntimeError, match=message):
+        find_artefact(INDEX, "tools", target)
+
+
+def test_build_with_names_containing_separator(tmp_path: Path) -> None:
+    """
+    Generated pages, single-artefact directives and cross-references handle names containing `::`.
+    """
+    srcdir = tmp_path / "src"
+    write_snapshot(
+        srcdir / "snapshot.json",
+        {
+            "demo": {
+                "tools": [
+                    {
+                        "name": "github::create_issue",
+                        "description": "Create an issue.",
+                        "inputSchema": {"type": "object"},
+                    }
+                ],
+                "prompts": [],
+                "resources": [],
+                "resource_templates": [],
+            }
+        },
+    )
+    (srcdir / "conf.py").write_text(
+        'extensions = ["sphinx_mcp"]\n'
+        'mcp_snapshot = "snapshot.json"\n'
+        'mcp_generate_pages = "mcp"\n',
+        encoding="utf-8",
+    )
+    (srcdir / "index.rst").write_text(
+        "Index\n=====\n\n"
+        "See :mcpdocs:tool:`github::create_issue` and :mcpdocs:tool:`demo::github::create_issue`.\n\n"
+        ".. toctree::\n\n   mcp/index\n",
+        encoding="utf-8",
+    )
+    warnings = io.StringIO()
+    app = Sphinx(
+        srcdir,
+        srcdir,
+        tmp_path / "html",
+        tmp_path / "doctrees",
+        "html",
+        status=None,
+        warning=warnings,
+    )
+    app.build()
+
+    assert "create_issue" not in warnings.getvalue()
+    index = (tmp_path / "html" / "index.html").read_text(encoding="utf-8")
+    assert index.count('href="mcp/demo/tools/github__create_issue.html#') == 2
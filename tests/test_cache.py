@@ -0,0 +1,112 @@
+"""
+Tests for caching the metadata of MCP servers between builds.
+"""
+
+from __future__ import annotations
+import io
+import json
+import time
+from pathlib import Path
+
+import pytest
+from sphinx.application import Sphinx
+
+from sphinx_mcp import common
+from sphinx_mcp.cache import CACHE_DIRNAME, REFRESH_ENV_VAR
+
+DEMO_CONFIG = {"object": "tests.servers:demo"}
+
+
+@pytest.fixture
+def fetched(monkeypatch: pytest.MonkeyPatch) -> list[list[str]]:
+    """
+    Record the servers fetched by each build, rather than loaded from the cache.
+    """
+    monkeypatch.delenv(REFRESH_ENV_VAR, raising=False)
+    calls = []
+    fetch_all_metadata = common.fetch_all_metadata
+
+    def record(servers: dict, **options):
+        calls.append(list(servers))
+        return fetch_all_metadata(servers, **options)
+
+    monkeypatch.setattr(common, "fetch_all_metadata", record)
+    return calls
+
+
+def build(tmp_path: Path, server_config: dict = DEMO_CONFIG, **config) -> Sphinx:
+    """
+    Build a site documenting the demo server with the given configuration.
+    """
+    srcdir = tmp_path / "src"
+    srcdir.mkdir(exist_ok=True)
+    (srcdir / "conf.py").write_text(
+        'extensions = ["sphinx_mcp"]\n'
+        f"mcp_config = {{'mcpServers': {{'demo': {server_config!r}}}}}\n"
+        + "".join(f"{name} = {value!r}\n" for name, value in config.items()),
+        encoding="utf-8",
+    )
+    (srcdir / "index.rst").write_text(
+        "Index\n=====\n\n.. mcpdocs:tools::\n", encoding="utf-8"
+    )
+    app = Sphinx(
+        srcdir,
+        srcdir,
+        tmp_path / "html",
+        tmp_path / "doctrees",
+        "html",
+        status=None,
+        warning=io.StringIO(),
+    )
+    app.build()
+    return app
+
+
+def tool_count(app: Sphinx) -> int:
+    return len(app.env.mcp.artefacts["tools"]["demo"])
+
+
+def test_cache_hit(tmp_path: Path, fetched: list) -> None:
+    build(tmp_path)
+    app = build(tmp_path)
+
+    assert fetched == [["demo"]]
+    assert app.env.mcp.load_stats["servers"]["demo"]["source"] == "cache"
+    assert tool_count(app) == 2
+
+
+def test_cache_expires_after_ttl(tmp_path: Path, fetched: list) -> None:
+    build(tmp_path, mcp_cache_ttl=60)
+    # Age the cached metadata past the TTL.
+    (cache_file,) = (tmp_path / "doctrees" / CACHE_DIRNAME).glob("*.json")
+    cached = json.loads(cache_file.read_text(encoding="utf-8"))
+    cached["fetched_at"] = time.time() - 61
+    cache_file.write_text(json.dumps(cached), encoding="utf-8")
+    build(tmp_path, mcp_cache_ttl=60)
+
+    assert fetched == [["demo"], ["demo"]]
+
+
+def test_cache_disabled(tmp_path: Path, fetched: list) -> None:
+    build(tmp_path, mcp_cache_ttl=0)
+    build(tmp_path, mcp_cache_ttl=0)
+
+    assert fetched == [["demo"], ["demo"]]
+
+
+def test_cache_miss_on_server_config_change(tmp_path: Path, fetched: list) -> None:
+    build(tmp_path)
+    build(tmp_path, {**DEMO_CONFIG, "env": {"GREETING": "Hi"}})
+
+    assert fetched == [["demo"], ["demo"]]
+
+
+def test_cache_miss_on_item_cap_change(tmp_path: Path, fetched: list) -> None:
+    build(tmp_path)
+    capped = build(tmp_path, mcp_max_items_per_server=1)
+    # The metadata fetched without a cap is still cached under its own key.
+    uncapped = build(tmp_path)
+
+    assert fetched == [["demo"], ["demo"]]
+    assert tool_count(capped) == 1
+    assert tool_count(uncapped) == 2
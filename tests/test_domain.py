@@ -0,0 +1,96 @@
+"""
+Tests for merging the data of the mcpdocs domain from parallel readers, and clearing the documents read again.
+"""
+
+from __future__ import annotations
+from types import SimpleNamespace
+
+from sphinx_mcp.mcpdocs import MCPDocsDomain
+
+
+def domain(notes: dict[str, list[tuple[str, str, str]]]) -> MCPDocsDomain:
+    """
+    Create a domain on a new environment, in which each document documents the given objects, as
+    `(objtype, "server::name", node_id)`.
+    """
+    mcpdocs = MCPDocsDomain(SimpleNamespace(domaindata={}, docname=None))
+    for docname, objects in notes.items():
+        for objtype, fullname, node_id in objects:
+            mcpdocs.note_object(objtype, fullname, node_id, docname=docname)
+    return mcpdocs
+
+
+def test_merge_and_clear() -> None:
+    main = domain({"index": [("tool", "pymcp::greet", "greet")]})
+    # A parallel reader starts from the data of the main process, and reads two documents.
+    reader = domain(
+        {
+            "index": [("tool", "pymcp::greet", "greet")],
+            "tools": [
+                ("tool", "everything::greet", "everything-greet"),
+                ("tool", "gateway::github::create_issue", "create-issue"),
+            ],
+            "prompts": [("prompt", "pymcp::code", "code")],
+        }
+    )
+    reader.note_search("tools")
+
+    main.merge_domaindata({"tools", "prompts"}, reader.data)
+
+    assert main.objects == {
+        ("tool", "pymcp::greet"): ("index", "greet"),
+        ("tool", "everything::greet"): ("tools", "everything-greet"),
+        ("tool", "gateway::github::create_issue"): ("tools", "create-issue"),
+        ("prompt", "pymcp::code"): ("prompts", "code"),
+    }
+    assert main.data["names"] == {
+        ("tool", "greet"): ["pymcp::greet", "everything::greet"],
+        ("tool", "github::create_issue"): ["gateway::github::create_issue"],
+        ("prompt", "code"): ["pymcp::code"],
+    }
+    assert main.data["documents"] == {
+        "index": [("tool", "pymcp::greet")],
+        "tools": [
+            ("tool", "everything::greet"),
+            ("tool", "gateway::github::create_issue"),
+        ],
+        "prompts": [("prompt", "pymcp::code")],
+    }
+    assert main.data["searches"] == {"tools": True}
+    # A name documented on two servers is ambiguous without the server.
+    assert main.find_object("tool", "greet") is None
+    assert main.find_object("tool", "github::create_issue") == (
+        "gateway::github::create_issue",
+        "tools",
+        "create-issue",
+    )
+
+    main.clear_doc("tools")
+
+    assert main.objects == {
+        ("tool", "pymcp::greet"): ("index", "greet"),
+        ("prompt", "pymcp::code"): ("prompts", "code"),
+    }
+    assert main.data["names"] == {
+        ("tool", "greet"): ["pymcp::greet"],
+        ("prompt", "code"): ["pymcp::code"],
+    }
+    assert main.data["documents"] == {
+        "index": [("tool", "pymcp::greet")],
+        "prompts": [("prompt", "pymcp::code")],
+    }
+    assert main.data["searches"] == {}
+    assert main.find_object("tool", "greet") == ("pymcp::greet", "index", "greet")
+
+
+def test_merge_keeps_first_of_duplicates() -> None:
+    main = domain({"index": [("tool", "pymcp::greet", "greet")]})
+    reader = domain({"other": [("tool", "pymcp::greet", "other-greet")]})
+
+    main.merge_domaindata({"other"}, reader.data)
+
+    # The duplicate is reported, and clearing its document leaves the first description in place.
+    assert main.objects == {("tool", "pymcp::greet"): ("index", "greet")}
+    main.clear_doc("other")
+    assert main.objects == {("tool", "pymcp::greet"): ("index", "greet")}
+    assert main.data["names"] == {("tool", "greet"): ["pymcp::greet"]}
@@ -0,0 +1,124 @@
+"""
+Tests for fetching the metadata of MCP servers.
+"""
+
+from __future__ import annotations
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from mcp.types import ListToolsResult, Tool
+
+from sphinx_mcp import fetch
+from sphinx_mcp.fetch import create_client, fetch_artefacts
+
+DEMO_CONFIG = {"object": "tests.servers:demo"}
+
+
+def test_create_client_with_timeouts() -> None:
+    # Both timeouts are passed to the client, which only accepts them from fastmcp 2.5.2 on.
+    client = create_client("demo", DEMO_CONFIG, connect_timeout=5, request_timeout=5)
+
+    async def list_tool_names() -> list[str]:
+        async with client:
+            return [tool.name for tool in await client.list_tools()]
+
+    assert asyncio.run(list_tool_names()) == ["greet", "add"]
+
+
+class PagedSession:
+    """
+    A stand-in for the session of a client, listing tools in the given pages, by cursor.
+    """
+
+    def __init__(self, pages: dict) -> None:
+        self.pages = pages
+        self.cursors = []
+
+    async def list_tools(self, cursor: str | None = None) -> ListToolsResult:
+        self.cursors.append(cursor)
+        names, next_cursor = self.pages[cursor]
+        return ListToolsResult(
+            tools=[Tool(name=name, inputSchema={"type": "object"}) for name in names],
+            nextCursor=next_cursor,
+        )
+
+
+def fetch_tools(
+    monkeypatch: pytest.MonkeyPatch, pages: dict, max_items: int = 0
+) -> tuple[list[str], list, dict, list[str]]:
+    """
+    Fetch the tools of a fake session with the given pages, and return their names, the cursors requested,
+    the statistics and the warnings logged.
+    """
+    session = PagedSession(pages)
+    warnings = []
+    monkeypatch.setattr(fetch.logger, "warning", warnings.append)
+    stats = {}
+    artefacts = asyncio.run(
+        fetch_artefacts(
+            SimpleNamespace(session=session), "demo", "tools", max_items, stats
+        )
+    )
+    return (
+        [artefact["name"] for artefact in artefacts],
+        session.cursors,
+        stats,
+        warnings,
+    )
+
+
+PAGES = {
+    None: (["a", "b"], "2"),
+    "2": (["c", "d"], "4"),
+    "4": (["e"], None),
+}
+
+
+def test_fetch_all_pages(monkeypatch: pytest.MonkeyPatch) -> None:
+    names, cursors, stats, warnings = fetch_tools(monkeypatch, PAGES)
+
+    assert names == ["a", "b", "c", "d", "e"]
+    assert cursors == [None, "2", "4"]
+    assert stats["pages"] == 3
+    assert stats["items"] == 5
+    assert warnings == []
+
+
+def test_fetch_stops_at_repeated_cursor(monkeypatch: pytest.MonkeyPatch) -> None:
+    pages = {**PAGES, "4": (["e"], "2")}
+    names, cursors, _, warnings = fetch_tools(monkeypatch, pages)
+
+    assert names == ["a", "b", "c", "d", "e"]
+    assert cursors == [None, "2", "4"]
+    assert len(warnings) == 1
+    assert "returned the cursor '2' for tools more than once" in warnings[0]
+
+
+@pytest.mark.parametrize(
+    "max_items, expected_names, expected_cursors, truncated",
+    [
+        # The pages beyond the cap are not requested.
+        (3, ["a", "b", "c"], [None, "2"], True),
+        (4, ["a", "b", "c", "d"], [None, "2"], True),
+        # Nothing is left out when the cap is reached on the last page.
+        (5, ["a", "b", "c", "d", "e"], [None, "2", "4"], False),
+        (10, ["a", "b", "c", "d", "e"], [None, "2", "4"], False),
+    ],
+)
+def test_fetch_max_items(
+    monkeypatch: pytest.MonkeyPatch,
+    max_items: int,
+    expected_names: list,
+    expected_cursors: list,
+    truncated: bool,
+) -> None:
+    names, cursors, _, warnings = fetch_tools(monkeypatch, PAGES, max_items)
+
+    assert names == expected_names
+    assert cursors == expected_cursors
+    assert warnings == (
+        [f"Only documenting the first {max_items} tools of MCP server demo."]
+        if truncated
+        else []
+    )
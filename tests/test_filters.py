@@ -0,0 +1,161 @@
+"""
+Tests for the options of the directives listing MCP artefacts that select which of them are listed.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from sphinx_mcp.artefacts import MCPArtefact
+from sphinx_mcp.filters import (
+    ArtefactFilter,
+    annotation_hints,
+    name_patterns,
+    sort_key,
+)
+
+
+def tool(name: str, title: str | None = None, **annotations) -> MCPArtefact:
+    """
+    Create the record of a tool with the given annotations.
+    """
+    stored = {"name": name, "inputSchema": {"type": "object"}}
+    if title is not None:
+        stored["title"] = title
+    if annotations:
+        stored["annotations"] = annotations
+    return MCPArtefact.from_stored(stored)
+
+
+def names(selected: list[tuple[str, MCPArtefact]]) -> list[str]:
+    return [f"{server}::{artefact.name}" for server, artefact in selected]
+
+
+TOOLS = [
+    ("a", tool("db_query", readOnlyHint=True)),
+    ("a", tool("db_insert", destructiveHint=False)),
+    ("a", tool("db_drop")),
+    ("b", tool("Cache_get", title="Read the cache", readOnlyHint=True)),
+    ("b", tool("db_query_internal", readOnlyHint=True)),
+]
+
+
+@pytest.mark.parametrize(
+    "argument, matched, unmatched",
+    [
+        ("db_*", ["db_query", "db_query_internal"], ["Cache_get", "my_db_query"]),
+        # Globs match case-sensitively.
+        ("cache_*", ["cache_get"], ["Cache_get"]),
+        ("db_query, cache_*", ["db_query", "cache_x"], ["db_query_internal"]),
+        # Regular expressions must match the whole name, as globs do.
+        ("re:db_(query|insert)", ["db_query", "db_insert"], ["db_query_internal"]),
+        ("re:.*query", ["db_query", "query"], ["db_query_internal"]),
+    ],
+)
+def test_name_patterns(argument: str, matched: list, unmatched: list) -> None:
+    pattern = name_patterns(argument)
+    for name in matched:
+        assert pattern.match(name), name
+    for name in unmatched:
+        assert not pattern.match(name), name
+
+
+@pytest.mark.parametrize("argument", [None, "", " , ", "re:("])
+def test_name_patterns_invalid(argument: str | None) -> None:
+    with pytest.raises(ValueError):
+        name_patterns(argument)
+
+
+def test_annotation_hints() -> None:
+    assert annotation_hints("readOnlyHint, !destructiveHint") == (
+        ("readOnlyHint", True),
+        ("destructiveHint", False),
+    )
+    with pytest.raises(ValueError):
+        annotation_hints("readOnlyHint, !")
+
+
+def test_include_and_exclude() -> None:
+    artefact_filter = ArtefactFilter.from_options(
+        "tools",
+        {"include": name_patterns("db_*"), "exclude": name_patterns("re:.*_internal")},
+    )
+    assert names(artefact_filter.select(TOOLS)) == [
+        "a::db_query",
+        "a::db_insert",
+        "a::db_drop",
+    ]
+
+
+@pytest.mark.parametrize(
+    "argument, expected",
+    [
+        ("readOnlyHint", ["a::db_query", "b::Cache_get", "b::db_query_internal"]),
+        ("!readOnlyHint", ["a::db_insert", "a::db_drop"]),
+        # Tools are destructive unless stated otherwise.
+        (
+            "destructiveHint",
+            ["a::db_query", "a::db_drop", "b::Cache_get", "b::db_query_internal"],
+        ),
+        ("!destructiveHint", ["a::db_insert"]),
+        ("!readOnlyHint, !destructiveHint", ["a::db_insert"]),
+        ("openWorldHint", names(TOOLS)),
+        ("idempotentHint", []),
+    ],
+)
+def test_annotations_with_tool_defaults(argument: str, expected: list) -> None:
+    artefact_filter = ArtefactFilter.from_options(
+        "tools", {"annotation": annotation_hints(argument)}
+    )
+    assert names(artefact_filter.select(TOOLS)) == expected
+
+
+def test_annotations_without_defaults_for_other_kinds() -> None:
+    # The defaults of the hints of tools do not apply to other kinds of artefacts.
+    artefact_filter = ArtefactFilter.from_options(
+        "prompts", {"annotation": annotation_hints("destructiveHint")}
+    )
+    assert names(artefact_filter.select(TOOLS)) == []
+
+
+@pytest.mark.parametrize(
+    "options, expected",
+    [
+        # The artefacts are listed server by server by default.
+        ({}, names(TOOLS)),
+        ({"limit": 2}, ["a::db_query", "a::db_insert"]),
+        (
+            {"sort": sort_key("name")},
+            [
+                "b::Cache_get",
+                "a::db_drop",
+                "a::db_insert",
+                "a::db_query",
+                "b::db_query_internal",
+            ],
+        ),
+        # The artefacts are limited after they are sorted.
+        ({"sort": sort_key("name"), "limit": 2}, ["b::Cache_get", "a::db_drop"]),
+        # Artefacts without a title are sorted by name.
+        (
+            {"sort": sort_key("title"), "limit": 3},
+            ["a::db_drop", "a::db_insert", "a::db_query"],
+        ),
+        (
+            {
+                "sort": sort_key("title"),
+                "include": name_patterns("Cache_*, db_query_*"),
+            },
+            ["b::db_query_internal", "b::Cache_get"],
+        ),
+    ],
+)
+def test_sort_and_limit(options: dict, expected: list) -> None:
+    assert (
+        names(ArtefactFilter.from_options("tools", options).select(TOOLS)) == expected
+    )
+
+
+def test_sort_key_invalid() -> None:
+    with pytest.raises(ValueError):
+        sort_key("size")
@@ -0,0 +1,62 @@
+"""
+Regression tests for the time it takes to load the extension.
+
+Loading the extension must not import fastmcp, mcp or python-dotenv, which are only needed to fetch metadata
+from live MCP servers or when dotenv loading is enabled.
+"""
+
+from __future__ import annotations
+import subprocess
+import sys
+
+# The modules that every Sphinx build imports anyway, and which are imported before the extension so
+# that only the cost of the extension itself is measured.
+SPHINX_MODULES = (
+    "sphinx.application, sphinx.domains, sphinx.roles, sphinx.util.docutils"
+)
+
+# The budget, in microseconds, for the cumulative import time of the extension on top of Sphinx. Loading
+# the extension used to take about 850 ms, most of it spent importing fastmcp.
+IMPORT_TIME_BUDGET_US = 150_000
+
+# Modules that must only be imported when metadata is fetched from live MCP servers.
+DEFERRED_MODULES = ("fastmcp", "mcp", "dotenv", "pydantic")
+
+
+def import_times(statement: str) -> dict[str, int]:
+    """
+    Run a statement in a fresh interpreter with `-X importtime` and return the cumulative import time,
+    in microseconds, of each imported module.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+def test_import_does_not_load_deferred_modules():
+    times = import_times("import sphinx_mcp")
+    loaded = sorted(
+        module for module in times if module.split(".")[0] in DEFERRED_MODULES
+    )
+    assert loaded == []
+
+
+def test_import_time_budget():
+    # Take the best of a few runs to make the test robust against noise.
+    best = min(
+        import_times(f"import {SPHINX_MODULES}; import sphinx_mcp")["sphinx_mcp"]
+        for _ in range(3)
+    )
+    assert best < IMPORT_TIME_BUDGET_US, (
+        f"Importing sphinx_mcp took {best / 1000:.1f} ms, over the budget of {IMPORT_TIME_BUDGET_US / 1000:.0f} ms."
+    )
@@ -0,0 +1,139 @@
+"""
+Tests for trying again to fetch the metadata of MCP servers that fail, and falling back on a snapshot.
+"""
+
+from __future__ import annotations
+import asyncio
+import io
+from pathlib import Path
+
+import pytest
+from sphinx.application import Sphinx
+
+from sphinx_mcp import fetch
+from sphinx_mcp.cache import REFRESH_ENV_VAR
+from sphinx_mcp.fetch import fetch_server_metadata_with_retries
+from sphinx_mcp.snapshot import write_snapshot
+
+METADATA = {
+    "tools": [{"name": "greet", "inputSchema": {"type": "object"}}],
+    "prompts": [],
+    "resources": [],
+    "resource_templates": [],
+}
+
+
+@pytest.fixture
+def delays(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    """
+    Record the delays before each new attempt instead of waiting.
+    """
+    recorded = []
+
+    async def sleep(delay: float) -> None:
+        recorded.append(delay)
+
+    monkeypatch.setattr(fetch.asyncio, "sleep", sleep)
+    return recorded
+
+
+def failing_fetch(
+    monkeypatch: pytest.MonkeyPatch, failures: int, hang: bool = False
+) -> list[str]:
+    """
+    Make fetching the metadata of a server fail `failures` times, by raising or by never completing if `hang`
+    is true, before it succeeds, and return the list of the servers fetched.
+    """
+    attempts = []
+
+    async def fetch_server_metadata(server_name: str, *args) -> dict:
+        attempts.append(server_name)
+        if len(attempts) <= failures:
+            if hang:
+                await asyncio.Event().wait()
+            raise ConnectionError("Connection refused.")
+        return METADATA
+
+    monkeypatch.setattr(fetch, "fetch_server_metadata", fetch_server_metadata)
+    return attempts
+
+
+def test_retries_with_backoff(monkeypatch: pytest.MonkeyPatch, delays: list) -> None:
+    attempts = failing_fetch(monkeypatch, failures=2)
+    stats = {}
+    metadata = asyncio.run(
+        fetch_server_metadata_with_retries(
+            "demo", {}, retries=3, retry_backoff=0.5, stats=stats
+        )
+    )
+
+    assert metadata == METADATA
+    assert len(attempts) == 3
+    assert delays == [0.5, 1.0]
+    assert stats["attempts"] == 3
+
+
+def test_error_after_last_attempt(
+    monkeypatch: pytest.MonkeyPatch, delays: list
+) -> None:
+    attempts = failing_fetch(monkeypatch, failures=3)
+    with pytest.raises(
+        RuntimeError,
+        match=r"^Unable to fetch metadata from MCP server demo after 3 attempts: Connection refused$",
+    ):
+        asyncio.run(
+            fetch_server_metadata_with_retries("demo", {}, retries=2, retry_backoff=1.0)
+        )
+
+    assert len(attempts) == 3
+    assert delays == [1.0, 2.0]
+
+
+def test_server_timeout(monkeypatch: pytest.MonkeyPatch, delays: list) -> None:
+    attempts = failing_fetch(monkeypatch, failures=1, hang=True)
+    with pytest.raises(RuntimeError, match=r"after 1 attempt: timed out after 0.01"):
+        asyncio.run(fetch_server_metadata_with_retries("demo", {}, server_timeout=0.01))
+
+    assert len(attempts) == 1
+    assert delays == []
+
+
+def test_fallback_snapshot(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, delays: list
+) -> None:
+    monkeypatch.delenv(REFRESH_ENV_VAR, raising=False)
+    attempts = failing_fetch(monkeypatch, failures=10)
+    srcdir = tmp_path / "src"
+    write_snapshot(srcdir / "fallback.json", {"demo": METADATA})
+    (srcdir / "conf.py").write_text(
+        'extensions = ["sphinx_mcp"]\n'
+        "mcp_config = {'mcpServers': {'demo': {'command': 'demo-server'}}}\n"
+        "mcp_fetch_retries = 1\n"
+        'mcp_on_server_error = "fallback"\n'
+        'mcp_fallback_snapshot = "fallback.json"\n',
+        encoding="utf-8",
+    )
+    (srcdir / "index.rst").write_text(
+        "Index\n=====\n\n.. mcpdocs:tools::\n", encoding="utf-8"
+    )
+    warnings = io.StringIO()
+    app = Sphinx(
+        srcdir,
+        srcdir,
+        tmp_path / "html",
+        tmp_path / "doctrees",
+        "html",
+        status=None,
+        warning=warnings,
+    )
+    app.build()
+
+    assert len(attempts) == 2
+    assert (
+        "Unable to fetch metadata from MCP server demo after 2 attempts: Connection refused. "
+        f"Using the metadata from snapshot {srcdir / 'fallback.json'} instead."
+    ) in warnings.getvalue()
+    server_stats = app.env.mcp.load_stats["servers"]["demo"]
+    assert server_stats["source"] == "snapshot fallback"
+    assert server_stats["attempts"] == 2
+    assert [tool.name for tool in app.env.mcp.artefacts["tools"]["demo"]] == ["greet"]
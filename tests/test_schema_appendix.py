@@ -0,0 +1,87 @@
+"""
+Tests for rendering the schemas shared by MCP tools once per document, with `mcp_deduplicate_schemas`.
+"""
+
+from __future__ import annotations
+import io
+import re
+from pathlib import Path
+
+from sphinx.application import Sphinx
+
+from sphinx_mcp.snapshot import write_snapshot
+
+INNER = {"type": "object", "properties": {"value": {"type": "string"}}}
+
+
+def build(tmp_path: Path, builder: str) -> Path:
+    """
+    Build two documents listing the same tool, whose output schema is identical to a definition of its input schema.
+    """
+    srcdir = tmp_path / "src"
+    write_snapshot(
+        srcdir / "snapshot.json",
+        {
+            "demo": {
+                "tools": [
+                    {
+                        "name": "wrap",
+                        "inputSchema": {
+                            "type": "object",
+                            "properties": {"inner": {"$ref": "#/$defs/Inner"}},
+                            "$defs": {"Inner": INNER},
+                        },
+                        "outputSchema": INNER,
+                    }
+                ],
+                "prompts": [],
+                "resources": [],
+                "resource_templates": [],
+            }
+        },
+    )
+    (srcdir / "conf.py").write_text(
+        'extensions = ["sphinx_mcp"]\n'
+        'mcp_snapshot = "snapshot.json"\n'
+        "mcp_deduplicate_schemas = True\n",
+        encoding="utf-8",
+    )
+    (srcdir / "index.rst").write_text(
+        "Index\n=====\n\n.. mcpdocs:tools::\n\n.. toctree::\n\n   other\n",
+        encoding="utf-8",
+    )
+    (srcdir / "other.rst").write_text(
+        "Other\n=====\n\n.. mcpdocs:tools::\n   :no-index:\n", encoding="utf-8"
+    )
+    outdir = tmp_path / builder
+    app = Sphinx(
+        srcdir,
+        srcdir,
+        outdir,
+        tmp_path / "doctrees",
+        builder,
+        status=None,
+        warning=io.StringIO(),
+    )
+    app.build()
+    return outdir
+
+
+def test_identical_parts_rendered_once(tmp_path: Path) -> None:
+    page = (build(tmp_path, "html") / "index.html").read_text(encoding="utf-8")
+
+    # The definition and the output schema are one part, referenced under both names.
+    targets = re.findall(r'id="(mcpdocs-schema-[^"]+)"', page)
+    assert len(targets) == 2
+    inner_target = next(
+        target for target in targets if f'href="#{target}">Definition Inner' in page
+    )
+    assert page.count(f'href="#{inner_target}"') == 2
+
+
+def test_ids_unique_in_single_page(tmp_path: Path) -> None:
+    page = (build(tmp_path, "singlehtml") / "index.html").read_text(encoding="utf-8")
+
+    targets = re.findall(r'id="(mcpdocs-schema-[^"]+)"', page)
+    assert len(targets) == 4
+    assert len(set(targets)) == 4
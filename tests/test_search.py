@@ -0,0 +1,119 @@
+"""
+Tests for writing the search index of MCP artefacts only when it is used, and only for the servers that changed.
+"""
+
+from __future__ import annotations
+import io
+from pathlib import Path
+
+from sphinx.application import Sphinx
+
+from sphinx_mcp.search import SEARCH_DIRNAME, SEARCH_MANIFEST
+from sphinx_mcp.snapshot import write_snapshot
+
+
+def metadata(description: str) -> dict:
+    """
+    The metadata of a server with a single tool, with the given description.
+    """
+    return {
+        "tools": [
+            {
+                "name": "greet",
+                "description": description,
+                "inputSchema": {"type": "object"},
+            }
+        ],
+        "prompts": [],
+        "resources": [],
+        "resource_templates": [],
+    }
+
+
+def build(tmp_path: Path, search: bool, echo_description: str = "Echo.") -> str:
+    """
+    Build a site documenting the tools of two servers, with a search box in one document if `search` is true,
+    and return the messages logged.
+    """
+    srcdir = tmp_path / "src"
+    write_snapshot(
+        srcdir / "snapshot.json",
+        {"pymcp": metadata("Greet."), "everything": metadata(echo_description)},
+    )
+    (srcdir / "conf.py").write_text(
+        'extensions = ["sphinx_mcp"]\nmcp_snapshot = "snapshot.json"\n',
+        encoding="utf-8",
+    )
+    (srcdir / "index.rst").write_text(
+        "Index\n=====\n\n.. mcpdocs:tools::\n\n.. toctree::\n\n   search\n",
+        encoding="utf-8",
+    )
+    (srcdir / "search.rst").write_text(
+        "Search\n======\n\n" + (".. mcpdocs:search::\n" if search else ""),
+        encoding="utf-8",
+    )
+    status = io.StringIO()
+    app = Sphinx(
+        srcdir,
+        srcdir,
+        tmp_path / "html",
+        tmp_path / "doctrees",
+        "html",
+        status=status,
+        warning=io.StringIO(),
+    )
+    app.build()
+    return status.getvalue()
+
+
+def shard_files(tmp_path: Path) -> dict[str, int]:
+    """
+    Get the inode of each file of the search index, which changes whenever the file is written again.
+    """
+    search_dir = tmp_path / "html" / SEARCH_DIRNAME
+    return {path.name: path.stat().st_ino for path in search_dir.glob("*.json")}
+
+
+def test_no_index_without_search_widget(tmp_path: Path) -> None:
+    build(tmp_path, search=False)
+
+    assert not (tmp_path / "html" / SEARCH_DIRNAME).exists()
+    for page in ("index.html", "search.html"):
+        html = (tmp_path / "html" / page).read_text(encoding="utf-8")
+        assert "mcpdocs-search.js" not in html
+
+
+def test_index_and_script_only_where_used(tmp_path: Path) -> None:
+    build(tmp_path, search=True)
+
+    assert sorted(shard_files(tmp_path)) == [
+        "0-pymcp.json",
+        "1-everything.json",
+        SEARCH_MANIFEST,
+    ]
+    html = tmp_path / "html"
+    assert "mcpdocs-search.js" in (html / "search.html").read_text(encoding="utf-8")
+    assert "mcpdocs-search.js" not in (html / "index.html").read_text(encoding="utf-8")
+
+
+def test_unchanged_shards_not_rewritten(tmp_path: Path) -> None:
+    build(tmp_path, search=True)
+    first = shard_files(tmp_path)
+
+    assert "The MCP search index is up to date." in build(tmp_path, search=True)
+    assert shard_files(tmp_path) == first
+
+    # Only the shard of the changed server, and the manifest, are written again.
+    build(tmp_path, search=True, echo_description="Echo a message.")
+    second = shard_files(tmp_path)
+    assert [name for name in first if first[name] != second[name]] == [
+        "1-everything.json",
+        SEARCH_MANIFEST,
+    ]
+
+
+def test_index_removed_with_last_search_widget(tmp_path: Path) -> None:
+    build(tmp_path, search=True)
+    build(tmp_path, search=False)
+
+    assert not (tmp_path / "html" / SEARCH_DIRNAME).exists()
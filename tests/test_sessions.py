@@ -0,0 +1,110 @@
+"""
+Tests for keeping the sessions with MCP servers open across builds in the same process.
+"""
+
+from __future__ import annotations
+import io
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from sphinx.application import Sphinx
+from sphinx.errors import ExtensionError
+
+from sphinx_mcp import sessions
+
+
+@pytest.fixture
+def process_sessions() -> Iterator[None]:
+    """
+    Close the sessions kept open by this process after the test.
+    """
+    yield
+    if sessions._process_pool is not None:
+        sessions._close_process_sessions()
+
+
+def build(tmp_path: Path) -> tuple[Sphinx, str]:
+    """
+    Build a site documenting the demo server over a session kept open by this process, and return the
+    application and the messages logged.
+    """
+    srcdir = tmp_path / "src"
+    srcdir.mkdir(exist_ok=True)
+    (srcdir / "conf.py").write_text(
+        'extensions = ["sphinx_mcp"]\n'
+        "mcp_config = {'mcpServers': {'demo': {'object': 'tests.servers:demo'}}}\n"
+        'mcp_server_sessions = "process"\n'
+        "mcp_session_idle_timeout = 60\n",
+        encoding="utf-8",
+    )
+    (srcdir / "index.rst").write_text(
+        "Index\n=====\n\n.. mcpdocs:tools::\n", encoding="utf-8"
+    )
+    status = io.StringIO()
+    app = Sphinx(
+        srcdir,
+        srcdir,
+        tmp_path / "html",
+        tmp_path / "doctrees",
+        "html",
+        status=status,
+        warning=io.StringIO(),
+    )
+    app.build()
+    return app, status.getvalue()
+
+
+def test_session_reused_then_reopened_when_idle(
+    tmp_path: Path, process_sessions: None
+) -> None:
+    app, _ = build(tmp_path)
+    assert "warm" not in app.env.mcp.load_stats["servers"]["demo"]
+    (session,) = sessions._process_pool.sessions.values()
+
+    app, status = build(tmp_path)
+    assert app.env.mcp.load_stats["servers"]["demo"]["warm"] is True
+    assert "Reusing the open session with MCP server demo." in status
+    assert list(sessions._process_pool.sessions.values()) == [session]
+
+    # The session has not been used for longer than the idle timeout.
+    session.last_used -= 61
+    app, status = build(tmp_path)
+    assert "warm" not in app.env.mcp.load_stats["servers"]["demo"]
+    assert "Reusing the open session" not in status
+    assert status.index(
+        "Closing the idle session with MCP server demo."
+    ) < status.index("Connecting to MCP server demo")
+    (reopened,) = sessions._process_pool.sessions.values()
+    assert reopened is not session
+    assert [tool.name for tool in app.env.mcp.artefacts["tools"]["demo"]] == [
+        "greet",
+        "add",
+    ]
+
+
+def test_idle_timeout_checked_before_connecting(tmp_path: Path) -> None:
+    srcdir = tmp_path / "src"
+    srcdir.mkdir()
+    (srcdir / "conf.py").write_text(
+        'extensions = ["sphinx_mcp"]\n'
+        "mcp_config = {'mcpServers': {'demo': {'object': 'tests.servers:demo'}}}\n"
+        'mcp_server_sessions = "process"\n'
+        "mcp_session_idle_timeout = 0\n",
+        encoding="utf-8",
+    )
+    (srcdir / "index.rst").write_text("Index\n=====\n", encoding="utf-8")
+    status = io.StringIO()
+    with pytest.raises(
+        ExtensionError, match="'mcp_session_idle_timeout' configuration"
+    ):
+        Sphinx(
+            srcdir,
+            srcdir,
+            tmp_path / "html",
+            tmp_path / "doctrees",
+            "html",
+            status=status,
+            warning=io.StringIO(),
+        )
+    assert "Initialising MCP client" not in status.getvalue()
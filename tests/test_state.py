@@ -0,0 +1,185 @@
+"""
+Tests for finding the documents to read again when the metadata of MCP servers changes between builds.
+"""
+
+from __future__ import annotations
+import pickle
+from types import SimpleNamespace
+
+from sphinx_mcp.artefacts import MCPArtefact
+from sphinx_mcp.common import (
+    env_get_outdated_handler,
+    env_merge_info_handler,
+    env_purge_doc_handler,
+    index_artefacts,
+)
+from sphinx_mcp.state import MCPState
+
+# The metadata of the servers in the first build, by server and kind, as names and descriptions.
+METADATA = {
+    "pymcp": {
+        "tools": {"greet": "Greet someone.", "add": "Add two numbers."},
+        "prompts": {"code": "Write code."},
+    },
+    "everything": {
+        "tools": {"echo": "Echo a message."},
+    },
+}
+
+# The usage of the documents, as (kind, server or None for all servers, name or None for all artefacts).
+USAGE = {
+    "all_tools": [("tools", None, None)],
+    "pymcp_tools": [("tools", "pymcp", None)],
+    "everything_tools": [("tools", "everything", None)],
+    "pymcp_prompts": [("prompts", "pymcp", None)],
+    "greet": [("tools", "pymcp", "greet")],
+    "add": [("tools", "pymcp", "add")],
+    "echo": [("tools", "everything", "echo")],
+    "prose": [],
+}
+
+
+def load(state: MCPState, metadata: dict) -> MCPState:
+    """
+    Load the artefacts of a build into the state, as `builder_inited_handler` does, and note what changed.
+    """
+    state.clear_artefacts()
+    for server, kinds in metadata.items():
+        for kind, artefacts in kinds.items():
+            records = [
+                MCPArtefact.from_stored({"name": name, "description": description})
+                for name, description in artefacts.items()
+            ]
+            state.set_artefacts(
+                kind, server, records, index_artefacts(server, kind, records)
+            )
+    state.update_hashes()
+    return state
+
+
+def first_build() -> MCPState:
+    """
+    Load the first build and read all the documents, then save the environment and load it for the next build.
+    """
+    state = load(MCPState(), METADATA)
+    for docname, usages in USAGE.items():
+        for usage in usages:
+            state.note_usage(docname, *usage)
+    return pickle.loads(pickle.dumps(state))
+
+
+def next_build(changes) -> list[str]:
+    """
+    Apply changes to a copy of the metadata and list the documents outdated in the next build.
+    """
+    metadata = {
+        server: {kind: dict(artefacts) for kind, artefacts in kinds.items()}
+        for server, kinds in METADATA.items()
+    }
+    changes(metadata)
+    return sorted(load(first_build(), metadata).outdated_docs())
+
+
+def test_unchanged() -> None:
+    assert next_build(lambda metadata: None) == []
+
+
+def test_changed_artefact() -> None:
+    def change(metadata):
+        metadata["pymcp"]["tools"]["greet"] = "Greet someone politely."
+
+    assert next_build(change) == ["all_tools", "greet", "pymcp_tools"]
+
+
+def test_added_and_removed_artefacts() -> None:
+    def change(metadata):
+        metadata["pymcp"]["tools"]["subtract"] = "Subtract two numbers."
+        del metadata["pymcp"]["tools"]["add"]
+
+    assert next_build(change) == ["add", "all_tools", "pymcp_tools"]
+
+
+def test_changed_kind() -> None:
+    def change(metadata):
+        metadata["pymcp"]["prompts"]["review"] = "Review code."
+
+    # Only the documents of the changed kind are outdated.
+    assert next_build(change) == ["pymcp_prompts"]
+
+
+def test_reordered_artefacts() -> None:
+    def change(metadata):
+        metadata["pymcp"]["tools"] = dict(reversed(metadata["pymcp"]["tools"].items()))
+
+    # Listings follow the order of the server, unlike the documents of single artefacts.
+    assert next_build(change) == ["all_tools", "pymcp_tools"]
+
+
+def test_added_server() -> None:
+    def change(metadata):
+        metadata["fetch"] = {"tools": {"fetch": "Fetch a URL."}}
+
+    assert next_build(change) == ["all_tools"]
+
+
+def test_removed_server() -> None:
+    def change(metadata):
+        del metadata["everything"]
+
+    assert next_build(change) == ["all_tools", "echo", "everything_tools"]
+
+
+def test_outdated_handler_skips_documents_read_anyway() -> None:
+    state = first_build()
+    metadata = {**METADATA, "pymcp": {**METADATA["pymcp"], "tools": {}}}
+    env = SimpleNamespace(mcp=load(state, metadata))
+
+    assert sorted(
+        env_get_outdated_handler(None, env, {"greet"}, {"add"}, {"pymcp_tools"})
+    ) == ["all_tools"]
+
+
+def test_purge_doc() -> None:
+    state = first_build()
+    env = SimpleNamespace(mcp=state)
+    env_purge_doc_handler(None, env, "greet")
+
+    assert "greet" not in state.usage
+    load(state, {**METADATA, "pymcp": {**METADATA["pymcp"], "tools": {}}})
+    assert "greet" not in state.outdated_docs()
+
+
+def test_merge_parallel_readers() -> None:
+    main = first_build()
+    load(main, METADATA)
+    # The documents are read again by a reader forked from the main process.
+    reader = pickle.loads(pickle.dumps(main))
+    load(reader, METADATA)
+    for docname in ("greet", "echo"):
+        main.purge_doc(docname)
+        reader.purge_doc(docname)
+    reader.note_usage("greet", "tools", "pymcp", "greet")
+    reader.note_usage("greet", "prompts", "pymcp", "code")
+    reader.note_usage("echo", "tools", "everything", "echo")
+    reader.note_timing("greet", "mcpdocs:tool", 0.5)
+    reader.owner_pid = -1
+
+    # Only the usage recorded by the reader is sent back to the main process.
+    sent = pickle.loads(pickle.dumps(reader))
+    assert sorted(sent.usage) == ["echo", "greet"]
+
+    env_merge_info_handler(
+        None, SimpleNamespace(mcp=main), {"greet", "echo"}, SimpleNamespace(mcp=sent)
+    )
+    assert main.usage["greet"] == {
+        ("tools", "pymcp", "greet"),
+        ("prompts", "pymcp", "code"),
+    }
+    assert main.usage["echo"] == {("tools", "everything", "echo")}
+    assert main.usage["all_tools"] == {("tools", None, None)}
+    assert main.timings["greet"]["mcpdocs:tool"] == [1, 0.5]
+
+    # The merged usage outdates the documents in the next build.
+    saved = pickle.loads(pickle.dumps(main))
+    metadata = {**METADATA, "pymcp": {**METADATA["pymcp"], "prompts": {}}}
+    assert sorted(load(saved, metadata).outdated_docs()) == ["greet", "pymcp_prompts"]